@@ -17,17 +17,31 @@ def create_app(config_name='development'):
     """
     app = Flask(__name__)
     
+    # Encode raw datetimes and Decimals, through orjson when installed
+    from app.utils.json_provider import FastJSONProvider
+    app.json = FastJSONProvider(app)
+    
     # Load configuration
     app.config.from_object(config_by_name[config_name])
     
+    # Time pool checkouts on server databases (before the engines exist)
+    from app.utils.metrics import use_metered_pool
+    use_metered_pool(app.config)
+    
     # Initialize extensions
-    from app.extensions import db, migrate, cors, jwt
+    from app.extensions import db, async_db, migrate, cors, jwt
     
     db.init_app(app)
+    async_db.init_app(app)
     migrate.init_app(app, db)
     cors.init_app(app)
     jwt.init_app(app)
     
+    # Plug the shared tier of the payload cache
+    from app.utils.payload_cache import LocalSharedCache, payload_cache
+    if app.config.get('PAYLOAD_CACHE_SHARED') == 'local':
+        payload_cache.shared = LocalSharedCache()
+    
     # Register blueprints
     from app.routes.api.v1 import api_v1_bp
     app.register_blueprint(api_v1_bp, url_prefix='/api/v1')
@@ -35,6 +49,26 @@ def create_app(config_name='development'):
     # Register error handlers
     register_error_handlers(app)
     
+    # Keep clients that just wrote on the primary, whichever worker they reach
+    from app.repositories.routing import register_replica_routing
+    register_replica_routing(app)
+    
+    # Request and pool metrics, served at /metrics
+    from app.utils.metrics import register_metrics
+    register_metrics(app)
+    
+    # Count and time each request's SQL statements
+    from app.utils.query_profiler import register_query_profiler
+    register_query_profiler(app)
+    
+    # gzip responses for clients that accept it
+    from app.utils.compression import register_compression
+    register_compression(app)
+    
+    # Register CLI commands
+    from app.cli import register_commands
+    register_commands(app)
+    
     # Register shell context
     @app.shell_context_processor
     def make_shell_context():
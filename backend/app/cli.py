@@ -0,0 +1,163 @@
+"""
+CLI Commands
+Maintenance commands registered on the Flask CLI
+"""
+import click
+from sqlalchemy import event
+from app.extensions import db
+
+
+def register_commands(app):
+    """Register custom CLI commands for the application"""
+    
+    @app.cli.command('explain-queries')
+    @click.option('--strict', is_flag=True, help='Exit with status 1 if any query is flagged')
+    def explain_queries(strict):
+        """
+        Run EXPLAIN on each repository query and flag sequential scans
+        
+        Run against a seeded database; on tiny tables the planner may
+        legitimately prefer sequential scans.
+        """
+        flagged = 0
+        
+        for name, statements in capture_repository_queries():
+            for statement, parameters in statements:
+                plan = explain(statement, parameters)
+                problems = plan_problems(plan)
+                flagged += bool(problems)
+                
+                status = 'FLAG' if problems else 'ok'
+                click.echo(f'[{status:4}] {name}: {" ".join(statement.split())[:120]}')
+                for problem in problems:
+                    click.echo(f'         {problem}')
+        
+        click.echo(f'{flagged} flagged statement(s)')
+        if strict and flagged:
+            raise SystemExit(1)
+    
+    @app.cli.command('backfill-estimate-totals')
+    @click.option('--batch-size', default=1000, show_default=True, help='Estimates per transaction')
+    def backfill_estimate_totals(batch_size):
+        """
+        Materialize subtotal, tax_total and total for estimates without them
+        
+        Works through estimates in ID order, one committed batch at a time,
+        so it can be interrupted and re-run safely.
+        """
+        from app.repositories.estimate_repository import EstimateRepository
+        
+        repository = EstimateRepository()
+        last_id, batches = 0, 0
+        while True:
+            last_id = repository.backfill_totals(batch_size, after_id=last_id)
+            if last_id is None:
+                break
+            batches += 1
+            click.echo(f'Backfilled batch {batches} (up to estimate {last_id})')
+        
+        click.echo(f'{batches} batch(es) backfilled')
+
+
+def capture_repository_queries():
+    """
+    Execute the read queries of each repository and capture their SQL
+    
+    Returns:
+        list: (repository method name, [(statement, parameters), ...]) pairs
+    """
+    from app.models.estimate import Estimate
+    from app.repositories.customer_repository import CustomerRepository
+    from app.repositories.estimate_repository import EstimateRepository
+    from app.repositories.item_repository import ItemRepository
+    from app.repositories.tax_catalog import tax_catalog
+    
+    estimates = EstimateRepository()
+    items = ItemRepository()
+    customers = CustomerRepository()
+    
+    sample = Estimate.query.first()
+    user_id = sample.user_id if sample else 1
+    customer_id = sample.customer_id if sample else 1
+    estimate_number = sample.estimate_number if sample else 'EST-0000-0000'
+    estimate_id = sample.id if sample else 1
+    
+    calls = [
+        ('EstimateRepository.get_by_user', lambda: estimates.get_by_user(user_id)),
+        ('EstimateRepository.get_by_user_cursor', lambda: estimates.get_by_user_cursor(user_id)),
+        ('EstimateRepository.get_by_customer', lambda: estimates.get_by_customer(customer_id)),
+        ('EstimateRepository.get_by_estimate_number',
+         lambda: estimates.get_by_estimate_number(estimate_number)),
+        ('EstimateRepository.calculate_totals', lambda: estimates.calculate_totals([estimate_id])),
+        ('EstimateRepository.hydrate',
+         lambda: estimates.hydrate(estimates.get_by_user(user_id)[0])),
+        ('ItemRepository.get_active_items', lambda: items.get_active_items()),
+        ('ItemRepository.search_by_name', lambda: items.search_by_name('a')),
+        ('CustomerRepository.get_paginated',
+         lambda: customers.get_paginated(order_by='name', desc=False)),
+        ('CustomerRepository.get_by_email', lambda: customers.get_by_email('nobody@example.com')),
+        ('CustomerRepository.search_by_name', lambda: customers.search_by_name('a')),
+    ]
+    
+    # The tax catalog loads the whole (small) tax table by design; load it
+    # up front so only per-request queries are captured
+    tax_catalog.all_taxes()
+    
+    captured = []
+    for name, call in calls:
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+        
+        event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            call()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+            db.session.rollback()
+        
+        captured.append((name, statements))
+    
+    return captured
+
+
+def explain(statement, parameters):
+    """
+    Get the query plan of a captured statement
+    
+    Returns:
+        list: Plan lines
+    """
+    prefix = 'EXPLAIN QUERY PLAN ' if db.engine.dialect.name == 'sqlite' else 'EXPLAIN '
+    
+    with db.engine.connect() as connection:
+        rows = connection.exec_driver_sql(prefix + statement, parameters).fetchall()
+    
+    # SQLite returns (id, parent, notused, detail); PostgreSQL one text column
+    return [row[-1] for row in rows]
+
+
+def plan_problems(plan):
+    """
+    Find sequential scans (and sorts that could come from an index) in a plan
+    
+    Args:
+        plan (list): Plan lines from explain()
+    
+    Returns:
+        list: Human-readable problems, empty if the plan looks fine
+    """
+    problems = []
+    
+    for line in plan:
+        text = line.strip()
+        if 'Seq Scan on' in text:
+            problems.append(f'sequential scan: {text}')
+        elif text.startswith('SCAN ') and 'USING' not in text and 'CONSTANT ROW' not in text:
+            problems.append(f'sequential scan: {text}')
+        elif text.startswith('USE TEMP B-TREE FOR ORDER BY'):
+            problems.append(f'sort without index: {text}')
+    
+    return problems
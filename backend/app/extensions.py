@@ -6,9 +6,12 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_jwt_extended import JWTManager
+from app.repositories.routing import RoutingSession
+from app.utils.async_database import AsyncDatabase
 
 # Initialize extensions
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
+async_db = AsyncDatabase()
 migrate = Migrate()
 cors = CORS()
 jwt = JWTManager()
@@ -20,13 +20,15 @@ class Customer(BaseModel):
     def __repr__(self):
         return f'<Customer {self.name}>'
     
-    def to_dict(self):
-        """Convert customer to dictionary"""
+    def to_dict(self, fields=None):
+        """
+        Convert customer to dictionary
+        
+        Args:
+            fields: Only include (and read) these fields; all if None
+        """
         return {
-            'id': self.id,
-            'name': self.name,
-            'email': self.email,
-            'phone': self.phone,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            name: getattr(self, name)
+            for name in ('id', 'name', 'email', 'phone', 'created_at', 'updated_at')
+            if fields is None or name in fields
         }
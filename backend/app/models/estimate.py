@@ -12,9 +12,16 @@ estimate_items = db.Table('estimate_items',
     db.Column('item_id', db.Integer, db.ForeignKey('items.id'), primary_key=True),
     db.Column('quantity', db.Integer, nullable=False, default=1),
     db.Column('unit_price', db.Numeric(10, 2), nullable=False),  # Price at time of estimate
+    db.Column('tax_rate', db.Numeric(7, 2), nullable=True),  # Summed tax % at time of estimate
     db.Column('created_at', db.DateTime, default=db.func.now())
 )
 
+# Last allocated estimate number per year (EST-YYYY-NNNN)
+estimate_number_counters = db.Table('estimate_number_counters',
+    db.Column('year', db.Integer, primary_key=True, autoincrement=False),
+    db.Column('last_value', db.Integer, nullable=False, default=0)
+)
+
 
 class Estimate(BaseModel):
     """Estimate model for managing customer estimates/quotes"""
@@ -29,10 +36,15 @@ class Estimate(BaseModel):
     footer_note = db.Column(db.Text, nullable=True)
     status = db.Column(db.String(20), default='draft', nullable=False)  # draft, sent, accepted, rejected
     
+    # Materialized from the lines; NULL until written or backfilled
+    subtotal = db.Column(db.Numeric(12, 2), nullable=True)
+    tax_total = db.Column(db.Numeric(12, 2), nullable=True)
+    total = db.Column(db.Numeric(12, 2), nullable=True)
+    
     # Relationships
     customer = db.relationship('Customer', back_populates='estimates')
     user = db.relationship('User', back_populates='estimates')
-    items = db.relationship('Item', secondary=estimate_items, lazy='subquery',
+    items = db.relationship('Item', secondary=estimate_items, lazy='select',
                            backref=db.backref('estimates', lazy=True))
     
     def __repr__(self):
@@ -50,62 +62,75 @@ class Estimate(BaseModel):
     
     def calculate_total(self):
         """Calculate total estimate amount including taxes"""
-        from app.models.item import Item
-        
-        total = 0
-        estimate_item_data = self.get_estimate_items()
+        if self.total is not None:
+            return float(self.total)
         
-        for item_data in estimate_item_data:
-            item = Item.query.get(item_data.item_id)
-            quantity = item_data.quantity
-            unit_price = float(item_data.unit_price)
-            
-            # Calculate item subtotal
-            item_subtotal = quantity * unit_price
-            
-            # Calculate taxes for this item
-            tax_amount = 0
-            if item and item.taxes:
-                for tax in item.taxes:
-                    tax_amount += item_subtotal * (float(tax.amount) / 100)
-            
-            total += item_subtotal + tax_amount
+        from app.repositories.estimate_repository import EstimateRepository
         
-        return round(total, 2)
+        totals = EstimateRepository().calculate_totals([self.id])
+        return float(totals[self.id])
     
-    def to_dict(self, include_items=True, include_customer=True):
-        """Convert estimate to dictionary"""
+    def to_dict(self, include_items=True, include_customer=True, preloaded=None, fields=None):
+        """
+        Convert estimate to dictionary
+        
+        Args:
+            include_items: Include lines and total
+            include_customer: Include the customer
+            preloaded: Optional state from EstimateRepository.hydrate; when
+                given, no further queries are issued
+            fields: Only include these fields (all if None); 'total' may be
+                requested without the lines. Other attributes are not read,
+                so they may be left unloaded.
+        """
         data = {
-            'id': self.id,
-            'estimate_number': self.estimate_number,
-            'customer_id': self.customer_id,
-            'user_id': self.user_id,
-            'date': self.date.isoformat() if self.date else None,
-            'valid_until': self.valid_until.isoformat() if self.valid_until else None,
-            'footer_note': self.footer_note,
-            'status': self.status,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            name: getattr(self, name)
+            for name in ('id', 'estimate_number', 'customer_id', 'user_id', 'date', 'valid_until',
+                         'footer_note', 'status', 'created_at', 'updated_at')
+            if fields is None or name in fields
         }
         
-        if include_customer and self.customer:
-            data['customer'] = self.customer.to_dict()
+        if include_customer:
+            customer = preloaded['customer'] if preloaded is not None else self.customer
+            if customer:
+                data['customer'] = customer.to_dict()
         
         if include_items:
-            from app.models.item import Item
-            items_list = []
-            estimate_item_data = self.get_estimate_items()
+            if preloaded is None:
+                from app.repositories.estimate_repository import EstimateRepository
+                preloaded = EstimateRepository().hydrate(
+                    [self], include_items=True, include_customer=False
+                )[self.id]
             
-            for item_data in estimate_item_data:
-                item = Item.query.get(item_data.item_id)
-                if item:
-                    item_dict = item.to_dict()
-                    item_dict['quantity'] = item_data.quantity
-                    item_dict['unit_price'] = float(item_data.unit_price)
-                    item_dict['subtotal'] = item_data.quantity * float(item_data.unit_price)
-                    items_list.append(item_dict)
+            items_list = []
+            for item, quantity, unit_price in preloaded['lines']:
+                item_dict = item.to_dict()
+                item_dict['quantity'] = quantity
+                item_dict['unit_price'] = unit_price
+                item_dict['subtotal'] = quantity * unit_price
+                items_list.append(item_dict)
             
             data['items'] = items_list
-            data['total'] = self.calculate_total()
+            data['total'] = preloaded['total']
+        elif fields is not None and 'total' in fields:
+            if preloaded is not None and 'total' in preloaded:
+                data['total'] = preloaded['total']
+            else:
+                from app.repositories.estimate_repository import EstimateRepository
+                data['total'] = EstimateRepository().calculate_totals([self.id])[self.id]
         
         return data
+
+
+# Listing hot paths filter on user/customer and order by (date DESC, id DESC)
+db.Index('ix_estimates_user_id_date_id', Estimate.user_id, Estimate.date.desc(), Estimate.id.desc())
+db.Index('ix_estimates_customer_id_date_id', Estimate.customer_id, Estimate.date.desc(), Estimate.id.desc())
+
+# Date-range reports read every grouped column from the index (index-only on PostgreSQL)
+db.Index(
+    'ix_estimates_date_report', Estimate.date,
+    postgresql_include=['status', 'total', 'customer_id', 'user_id']
+)
+
+# Reverse lookups from an item to the estimates using it
+db.Index('ix_estimate_items_item_id', estimate_items.c.item_id)
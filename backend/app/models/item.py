@@ -12,6 +12,9 @@ item_taxes = db.Table('item_taxes',
     db.Column('created_at', db.DateTime, default=db.func.now())
 )
 
+# Reverse lookups from a tax to the items using it
+db.Index('ix_item_taxes_tax_id', item_taxes.c.tax_id)
+
 
 class Item(BaseModel):
     """Item model for managing products/services"""
@@ -22,25 +25,30 @@ class Item(BaseModel):
     description = db.Column(db.Text, nullable=True)
     price = db.Column(db.Numeric(10, 2), nullable=False)  # Base price without tax
     
-    # Many-to-many relationship with taxes
-    taxes = db.relationship('Tax', secondary=item_taxes, lazy='subquery',
+    # Many-to-many relationship with taxes; reads go through the tax catalog
+    # cache, so the collection is only loaded when it is modified
+    taxes = db.relationship('Tax', secondary=item_taxes, lazy='select',
                            backref=db.backref('items', lazy=True))
     
     def __repr__(self):
         return f'<Item {self.name}>'
     
-    def to_dict(self, include_taxes=True):
-        """Convert item to dictionary"""
+    def to_dict(self, include_taxes=True, fields=None):
+        """
+        Convert item to dictionary
+        
+        Args:
+            include_taxes: Include the item's taxes
+            fields: Only include (and read) these fields; all if None
+        """
         data = {
-            'id': self.id,
-            'name': self.name,
-            'description': self.description,
-            'price': float(self.price),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            name: getattr(self, name)
+            for name in ('id', 'name', 'description', 'price', 'created_at', 'updated_at')
+            if fields is None or name in fields
         }
         
         if include_taxes:
-            data['taxes'] = [tax.to_dict() for tax in self.taxes]
+            from app.repositories.tax_catalog import tax_catalog
+            data['taxes'] = tax_catalog.taxes_for_item(self.id)
         
         return data
@@ -21,7 +21,7 @@ class Tax(BaseModel):
         return {
             'id': self.id,
             'name': self.name,
-            'amount': float(self.amount),
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'amount': self.amount,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
@@ -31,8 +31,8 @@ class User(BaseModel):
         data = {
             'id': self.id,
             'email': self.email,
-            'created_at': self.created_at.isoformat() if self.created_at else None,
-            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'created_at': self.created_at,
+            'updated_at': self.updated_at,
         }
         if include_email:
             data['email'] = self.email
@@ -0,0 +1,141 @@
+"""
+Async Base Repository
+Read-only repository operations on SQLAlchemy's AsyncSession
+"""
+from typing import TypeVar, Generic, List, Optional, Type, Dict, Any
+from sqlalchemy import select
+from sqlalchemy.orm import load_only, noload
+from app.extensions import async_db
+from app.repositories.counting import count_statement
+from app.repositories.routing import bind_key, read_only_async
+from app.utils.columnar import Table, select_names
+
+T = TypeVar('T')
+
+
+class AsyncBaseRepository(Generic[T]):
+    """
+    Generic repository providing BaseRepository's reads as coroutines
+    
+    Used by async views, whose queries then wait on the event loop
+    instead of a thread. Reads are routed to the replica like
+    BaseRepository's. Each call runs in its own AsyncSession, so the
+    returned instances are detached: only their loaded attributes can be
+    read, and relationships are never loaded.
+    """
+    
+    def __init__(self, model: Type[T]):
+        """
+        Initialize repository with a model class
+        
+        Args:
+            model: SQLAlchemy model class
+        """
+        self.model = model
+    
+    @read_only_async
+    async def get_by_id(self, id: int, columns: Optional[List[str]] = None) -> Optional[T]:
+        """
+        Get a single record by ID
+        
+        Args:
+            id: Record ID
+            columns: Only load these columns (see BaseRepository._load_only);
+                all columns if omitted
+        
+        Returns:
+            Model instance or None if not found
+        """
+        statement = self._load_only(select(self.model), columns).where(self.model.id == id)
+        async with async_db.session(bind_key()) as session:
+            return await session.scalar(statement)
+    
+    @read_only_async
+    async def get_all(self, filters: Optional[Dict[str, Any]] = None) -> List[T]:
+        """
+        Get all records, optionally filtered
+        
+        Args:
+            filters: Dictionary of field:value pairs to filter by
+        
+        Returns:
+            List of model instances
+        """
+        async with async_db.session(bind_key()) as session:
+            return list(await session.scalars(self._filtered_statement(filters)))
+    
+    @read_only_async
+    async def get_paginated(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        desc: bool = True,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[T], int]:
+        """
+        Get paginated records
+        
+        Same arguments and result as BaseRepository.get_paginated.
+        
+        Raises:
+            ValueError: If the count strategy is unknown
+        """
+        statement = self._filtered_statement(filters)
+        
+        async with async_db.session(bind_key()) as session:
+            total = await count_statement(session, self.model, statement, filters, count_strategy)
+            
+            if order_by and hasattr(self.model, order_by):
+                order_column = getattr(self.model, order_by)
+                statement = statement.order_by(order_column.desc() if desc else order_column.asc())
+            
+            if as_rows:
+                names = select_names(self.model.__table__.columns, columns)
+                statement = statement.with_only_columns(*(getattr(self.model, name) for name in names))
+            else:
+                statement = self._load_only(statement, columns)
+            result = await session.execute(statement.offset((page - 1) * per_page).limit(per_page))
+            
+            if as_rows:
+                return Table(names, result.all()), total
+            return list(result.scalars()), total
+    
+    @read_only_async
+    async def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
+        """
+        Count records, optionally filtered
+        
+        Args:
+            filters: Dictionary of field:value pairs to filter by
+        
+        Returns:
+            Count of records
+        """
+        async with async_db.session(bind_key()) as session:
+            return await count_statement(session, self.model, self._filtered_statement(filters), filters)
+    
+    def _load_only(self, statement, columns: Optional[List[str]]):
+        """Restrict a select() to some columns and no relationship loading (see BaseRepository._load_only)"""
+        if columns is None:
+            return statement
+        
+        names = select_names(self.model.__table__.columns, columns)
+        return statement.options(
+            load_only(*(getattr(self.model, name) for name in names)),
+            noload('*')
+        )
+    
+    def _filtered_statement(self, filters: Optional[Dict[str, Any]] = None):
+        """Build a select() with field:value equality filters applied"""
+        statement = select(self.model)
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key):
+                    statement = statement.where(getattr(self.model, key) == value)
+        
+        return statement
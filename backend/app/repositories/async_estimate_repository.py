@@ -0,0 +1,130 @@
+"""
+Async Estimate Repository
+Estimate reads on SQLAlchemy's AsyncSession
+"""
+from typing import Optional, List, Dict, Any
+from sqlalchemy import select
+from app.extensions import async_db
+from app.models.customer import Customer
+from app.models.estimate import Estimate, estimate_items
+from app.models.item import Item
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.routing import bind_key, read_only_async
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.asgi import run_sync
+from app.utils.money import estimate_totals
+
+
+class AsyncEstimateRepository(AsyncBaseRepository[Estimate]):
+    """Async repository for the Estimate list reads"""
+    
+    def __init__(self):
+        """Initialize AsyncEstimateRepository with Estimate model"""
+        super().__init__(Estimate)
+    
+    async def get_by_user(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Estimate], int]:
+        """Get estimates for a specific user (see EstimateRepository.get_by_user)"""
+        return await self.get_paginated(
+            page=page,
+            per_page=per_page,
+            filters={'user_id': user_id},
+            order_by='date',
+            desc=True,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
+        )
+    
+    @read_only_async
+    async def hydrate(
+        self,
+        estimates: List[Estimate],
+        include_items: bool = True,
+        include_customer: bool = True,
+        include_total: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Preload everything Estimate.to_dict needs for a page of estimates
+        
+        Same queries and result as EstimateRepository.hydrate; tax rates
+        still come from the (sync) tax catalog, called in a worker thread.
+        """
+        hydrated = {estimate.id: {} for estimate in estimates}
+        if not estimates:
+            return hydrated
+        
+        async with async_db.session(bind_key()) as session:
+            if include_customer:
+                customer_ids = {estimate.customer_id for estimate in estimates}
+                customers = {
+                    customer.id: customer
+                    for customer in await session.scalars(select(Customer).where(Customer.id.in_(customer_ids)))
+                }
+                for estimate in estimates:
+                    hydrated[estimate.id]['customer'] = customers.get(estimate.customer_id)
+            
+            if include_items:
+                rows = await self._line_rows(session, hydrated.keys())
+                
+                item_ids = {row.item_id for row in rows}
+                items = {
+                    item.id: item
+                    for item in await session.scalars(select(Item).where(Item.id.in_(item_ids)))
+                } if item_ids else {}
+                # Also warms the cache that Item.to_dict reads taxes from
+                tax_rates = await run_sync(tax_catalog.tax_rates, item_ids)
+                
+                line_values = {estimate_id: [] for estimate_id in hydrated}
+                lines = {estimate_id: [] for estimate_id in hydrated}
+                for row in rows:
+                    item = items.get(row.item_id)
+                    tax_rate = row.tax_rate if row.tax_rate is not None else tax_rates[row.item_id]
+                    line_values[row.estimate_id].append((row.quantity, row.unit_price, tax_rate))
+                    if item:
+                        lines[row.estimate_id].append((item, row.quantity, row.unit_price))
+                
+                for estimate in estimates:
+                    state = hydrated[estimate.id]
+                    state['lines'] = lines[estimate.id]
+                    state['total'] = (
+                        estimate.total if estimate.total is not None
+                        else estimate_totals(line_values[estimate.id])[2]
+                    )
+            elif include_total:
+                missing = [estimate.id for estimate in estimates if estimate.total is None]
+                rows = await self._line_rows(session, missing) if missing else []
+                tax_rates = await run_sync(
+                    tax_catalog.tax_rates, {row.item_id for row in rows if row.tax_rate is None}
+                )
+                
+                line_values = {estimate_id: [] for estimate_id in missing}
+                for row in rows:
+                    tax_rate = row.tax_rate if row.tax_rate is not None else tax_rates[row.item_id]
+                    line_values[row.estimate_id].append((row.quantity, row.unit_price, tax_rate))
+                for estimate in estimates:
+                    hydrated[estimate.id]['total'] = (
+                        estimate_totals(line_values[estimate.id])[2] if estimate.id in line_values
+                        else estimate.total
+                    )
+        
+        return hydrated
+    
+    @staticmethod
+    async def _line_rows(session, estimate_ids):
+        """Fetch the lines of many estimates in one query"""
+        result = await session.execute(select(
+            estimate_items.c.estimate_id,
+            estimate_items.c.item_id,
+            estimate_items.c.quantity,
+            estimate_items.c.unit_price,
+            estimate_items.c.tax_rate
+        ).where(estimate_items.c.estimate_id.in_(estimate_ids)))
+        return result.all()
@@ -3,7 +3,14 @@ Base Repository
 Generic repository pattern implementation for database operations
 """
 from typing import TypeVar, Generic, List, Optional, Type, Dict, Any
+from sqlalchemy.orm import load_only, noload
 from app.extensions import db
+from app.utils.columnar import Table, select_names
+from app.utils.cursors import encode_cursor, decode_cursor
+from app.repositories.counting import count_query
+from app.repositories.bulk_load import bulk_load
+from app.repositories.routing import read_only
+from app.utils.payload_cache import payload_cache
 
 T = TypeVar('T')
 
@@ -25,18 +32,56 @@ class BaseRepository(Generic[T]):
         """
         self.model = model
     
-    def get_by_id(self, id: int) -> Optional[T]:
+    @read_only
+    def get_by_id(self, id: int, columns: Optional[List[str]] = None) -> Optional[T]:
         """
         Get a single record by ID
         
         Args:
             id: Record ID
+            columns: Only load these columns and no relationships (see
+                _load_only); all columns if omitted
         
         Returns:
             Model instance or None if not found
         """
+        if columns is not None:
+            return self._load_only(self.model.query, columns).filter(self.model.id == id).first()
         return self.model.query.get(id)
     
+    def get_by_ids(self, ids) -> List[T]:
+        """
+        Get all records whose ID is in a collection, in one query
+        
+        Args:
+            ids: Record IDs (duplicates are ignored)
+        
+        Returns:
+            List of model instances found (missing IDs are skipped)
+        """
+        ids = set(ids)
+        if not ids:
+            return []
+        
+        return self.model.query.filter(self.model.id.in_(ids)).all()
+    
+    @read_only
+    def get_version(self, id: int) -> Optional[tuple]:
+        """
+        Get the values that change whenever a record's representation does
+        
+        Used for ETags; subclasses add the versions of related rows.
+        
+        Args:
+            id: Record ID
+        
+        Returns:
+            Tuple of version values, or None if the record does not exist
+        """
+        row = db.session.query(self.model.id, self.model.updated_at).filter(self.model.id == id).first()
+        return tuple(row) if row else None
+    
+    @read_only
     def get_all(self, filters: Optional[Dict[str, Any]] = None) -> List[T]:
         """
         Get all records, optionally filtered
@@ -56,13 +101,17 @@ class BaseRepository(Generic[T]):
         
         return query.all()
     
+    @read_only
     def get_paginated(
         self,
         page: int = 1,
         per_page: int = 20,
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[str] = None,
-        desc: bool = True
+        desc: bool = True,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
     ) -> tuple[List[T], int]:
         """
         Get paginated records
@@ -73,30 +122,166 @@ class BaseRepository(Generic[T]):
             filters: Dictionary of field:value pairs to filter by
             order_by: Field name to order by
             desc: Whether to order descending
+            count_strategy: exact, estimate or cached (defaults to
+                PAGINATION_COUNT_STRATEGY)
+            columns: Only load these columns and no relationships (see
+                _load_only); all columns if omitted
+            as_rows: Select plain column values and return them as a
+                Table instead of model instances
         
         Returns:
-            Tuple of (list of records, total count)
+            Tuple of (list of records or Table, total count); the total is a
+            TotalCount whose exact attribute tells whether it is estimated
+        
+        Raises:
+            ValueError: If the count strategy is unknown
         """
-        query = self.model.query
+        query = self._filtered_query(filters)
         
-        # Apply filters
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.filter(getattr(self.model, key) == value)
+        # Count before ordering so the count does not sort
+        total = count_query(self.model, query, filters, count_strategy)
         
         # Apply ordering
         if order_by and hasattr(self.model, order_by):
             order_column = getattr(self.model, order_by)
             query = query.order_by(order_column.desc() if desc else order_column.asc())
         
-        total = query.count()
-        
         # Apply pagination
+        if as_rows:
+            query = self._select_rows(query, columns)
+        else:
+            query = self._load_only(query, columns)
         records = query.offset((page - 1) * per_page).limit(per_page).all()
         
+        if as_rows:
+            return Table(self._row_names(query), records), total
         return records, total
     
+    @read_only
+    def get_cursor_paginated(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        filters: Optional[Dict[str, Any]] = None,
+        order_by: Optional[str] = None,
+        desc: bool = True,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[T], Optional[str], Optional[int]]:
+        """
+        Get a page of records using keyset (cursor) pagination
+        
+        Rows are ordered by (order_by, id) and the page starts right after
+        the (value, id) pair encoded in the cursor, so deep pages cost the
+        same as the first one.
+        
+        Args:
+            cursor: Token returned as next_cursor by the previous page, or
+                None for the first page
+            per_page: Items per page
+            filters: Dictionary of field:value pairs to filter by
+            order_by: Field name to order by (ID only if omitted)
+            desc: Whether to order descending
+            with_total: Whether to also count all matching records
+            count_strategy: Count strategy used when with_total is set
+            columns: Only load these columns and no relationships (see
+                _load_only); all columns if omitted
+            as_rows: Select plain column values (plus the order column)
+                and return them as a Table instead of model instances
+        
+        Returns:
+            Tuple of (list of records or Table, next cursor or None, total
+            count or None)
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = self._filtered_query(filters)
+        total = count_query(self.model, query, filters, count_strategy) if with_total else None
+        
+        id_column = self.model.id
+        order_column = getattr(self.model, order_by) if order_by and hasattr(self.model, order_by) else None
+        
+        if cursor:
+            python_type = order_column.type.python_type if order_column is not None else None
+            value, last_id = decode_cursor(cursor, python_type)
+            
+            if order_column is not None:
+                key = db.tuple_(order_column, id_column)
+                bound = db.tuple_(db.literal(value, order_column.type), db.literal(last_id))
+            else:
+                key, bound = id_column, last_id
+            query = query.filter(key < bound if desc else key > bound)
+        
+        ordering = [column.desc() if desc else column.asc()
+                    for column in (order_column, id_column) if column is not None]
+        
+        # Fetch one extra row to know whether another page exists
+        if as_rows:
+            query = self._select_rows(query, columns, order_by)
+        else:
+            query = self._load_only(query, columns, order_by)
+        records = query.order_by(*ordering).limit(per_page + 1).all()
+        
+        next_cursor = None
+        if len(records) > per_page:
+            records = records[:per_page]
+            last = records[-1]
+            next_cursor = encode_cursor(
+                getattr(last, order_by) if order_column is not None else None,
+                last.id
+            )
+        
+        if as_rows:
+            records = Table(self._row_names(query), records)
+        return records, next_cursor, total
+    
+    def _load_only(self, query, columns: Optional[List[str]], *required: Optional[str]):
+        """
+        Restrict a query to some columns and no relationship loading
+        
+        The ID and updated_at (plus any required attributes, such as the
+        cursor's order column) are always loaded; names that are not
+        columns are ignored. Unloaded relationships read as empty rather
+        than issuing a query.
+        """
+        if columns is None:
+            return query
+        
+        names = select_names(self.model.__table__.columns, columns, *required)
+        return query.options(
+            load_only(*(getattr(self.model, name) for name in names)),
+            noload('*')
+        )
+    
+    def _select_rows(self, query, columns: Optional[List[str]], *required: Optional[str]):
+        """
+        Turn a model query into one selecting plain column values
+        
+        Same selection rules as _load_only, except that omitted columns
+        select every column of the table.
+        """
+        names = select_names(self.model.__table__.columns, columns, *required)
+        return query.with_entities(*(getattr(self.model, name) for name in names))
+    
+    @staticmethod
+    def _row_names(query) -> List[str]:
+        """Names of the columns selected by _select_rows"""
+        return [description['name'] for description in query.column_descriptions]
+    
+    def _filtered_query(self, filters: Optional[Dict[str, Any]] = None):
+        """Build a query with field:value equality filters applied"""
+        query = self.model.query
+        
+        if filters:
+            for key, value in filters.items():
+                if hasattr(self.model, key):
+                    query = query.filter(getattr(self.model, key) == value)
+        
+        return query
+    
     def get_by_field(self, field: str, value: Any) -> Optional[T]:
         """
         Get a single record by a specific field value
@@ -144,6 +329,27 @@ class BaseRepository(Generic[T]):
         db.session.commit()
         return instance
     
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """
+        Create many records in one transaction
+        
+        Rows are loaded with COPY on PostgreSQL and multi-row INSERTs
+        elsewhere (see bulk_load); nothing is committed if any row fails.
+        
+        Args:
+            rows: Field values for each new record (same keys in every row)
+        
+        Returns:
+            IDs of the created records in input order
+        """
+        try:
+            ids = bulk_load(self.model.__table__, rows)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return ids
+    
     def update(self, id: int, **kwargs) -> Optional[T]:
         """
         Update a record by ID
@@ -165,6 +371,7 @@ class BaseRepository(Generic[T]):
                 setattr(instance, key, value)
         
         db.session.commit()
+        payload_cache.invalidate(self.model.__tablename__, id)
         return instance
     
     def delete(self, id: int) -> bool:
@@ -184,6 +391,7 @@ class BaseRepository(Generic[T]):
         
         db.session.delete(instance)
         db.session.commit()
+        payload_cache.invalidate(self.model.__tablename__, id)
         return True
     
     def soft_delete(self, id: int) -> bool:
@@ -206,6 +414,7 @@ class BaseRepository(Generic[T]):
         
         instance.is_active = False
         db.session.commit()
+        payload_cache.invalidate(self.model.__tablename__, id)
         return True
     
     def exists(self, **kwargs) -> bool:
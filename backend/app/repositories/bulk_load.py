@@ -0,0 +1,129 @@
+"""
+Bulk Loading
+Fast multi-row inserts: COPY on PostgreSQL, multi-row INSERT elsewhere
+"""
+import io
+from typing import List, Optional
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.compiler import InsertmanyvaluesSentinelOpts
+from app.extensions import db
+from app.utils.cache import mark_changed
+
+# Rows per multi-row INSERT statement
+INSERT_BATCH_SIZE = 1000
+
+
+def bulk_load(table, rows: List[dict], session: Optional[Session] = None) -> Optional[List[int]]:
+    """
+    Insert many rows into a table without committing
+    
+    Python-side column defaults are applied first, since COPY bypasses
+    them. On PostgreSQL, IDs are preallocated from the table's sequence
+    and the rows are streamed with COPY ... FROM STDIN. Elsewhere they are
+    inserted INSERT_BATCH_SIZE rows per statement.
+    
+    Args:
+        table: Table to load into
+        rows: Column values for each row (same keys in every row)
+        session: Session to load in (defaults to db.session)
+    
+    Returns:
+        IDs of the new rows in input order, or None if the table has no id column
+    """
+    if not rows:
+        return [] if 'id' in table.c else None
+    
+    session = session or db.session
+    rows = _with_defaults(table, rows)
+    mark_changed(session, table.name)
+    
+    if session.get_bind().dialect.name == 'postgresql':
+        return _copy_rows(session, table, rows)
+    return _insert_rows(session, table, rows)
+
+
+def _with_defaults(table, rows: List[dict]) -> List[dict]:
+    """Fill in scalar and Python callable column defaults missing from rows"""
+    defaults = {}
+    for column in table.columns:
+        default = column.default
+        if default is None or column.key in rows[0]:
+            continue
+        if default.is_scalar:
+            defaults[column.key] = default.arg
+        elif default.is_callable:
+            defaults[column.key] = default.arg(None)
+    
+    return [dict(defaults, **row) for row in rows] if defaults else rows
+
+
+def _copy_rows(session: Session, table, rows: List[dict]) -> Optional[List[int]]:
+    """Load rows with COPY, preallocating IDs from the table's sequence"""
+    if 'id' in table.c and 'id' not in rows[0]:
+        ids = session.execute(
+            db.select(db.func.nextval(db.func.pg_get_serial_sequence(table.name, 'id')))
+            .select_from(db.func.generate_series(1, len(rows)))
+        ).scalars()
+        rows = [dict(row, id=row_id) for row, row_id in zip(rows, ids)]
+    
+    columns = list(rows[0])
+    quoted_columns = ', '.join(f'"{column}"' for column in columns)
+    statement = f'COPY "{table.name}" ({quoted_columns}) FROM STDIN WITH (FORMAT csv)'
+    
+    # COPY needs the raw psycopg2 cursor, so wrap its errors the way
+    # SQLAlchemy does (e.g. a unique violation becomes an IntegrityError)
+    dialect = session.get_bind().dialect
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(statement, _copy_csv(columns, rows))
+    except dialect.dbapi.Error as e:
+        raise DBAPIError.instance(statement, None, e, dialect.dbapi.Error, dialect=dialect) from e
+    finally:
+        cursor.close()
+    
+    return [row['id'] for row in rows] if 'id' in table.c else None
+
+
+def _copy_csv(columns: List[str], rows: List[dict]) -> io.StringIO:
+    """
+    COPY ... WITH (FORMAT csv) input for rows
+    
+    None is written as an unquoted empty field, which COPY reads as NULL;
+    every other value is quoted, so empty strings stay empty strings.
+    """
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(','.join(_csv_field(row[column]) for column in columns))
+        buffer.write('\n')
+    buffer.seek(0)
+    return buffer
+
+
+def _csv_field(value) -> str:
+    """Quote one value for COPY's CSV format"""
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _insert_rows(session: Session, table, rows: List[dict]) -> Optional[List[int]]:
+    """
+    Load rows with multi-row INSERTs (SQLAlchemy's insertmanyvalues batching)
+    
+    IDs are returned in row order. Backends that cannot match RETURNING
+    rows to parameters (SQLite) assign autoincrement IDs in VALUES order,
+    and the transaction holds their write lock, so the returned IDs are
+    sorted instead.
+    """
+    if 'id' not in table.c or 'id' in rows[0]:
+        session.execute(table.insert(), rows)
+        return [row['id'] for row in rows] if 'id' in table.c else None
+    
+    dialect = session.get_bind().dialect
+    ordered = dialect.insertmanyvalues_implicit_sentinel != InsertmanyvaluesSentinelOpts.NOT_SUPPORTED
+    ids = session.execute(
+        table.insert().returning(table.c.id, sort_by_parameter_order=ordered), rows,
+        execution_options={'insertmanyvalues_page_size': INSERT_BATCH_SIZE}
+    ).scalars()
+    return list(ids) if ordered else sorted(ids)
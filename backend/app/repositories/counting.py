@@ -0,0 +1,139 @@
+"""
+Count Strategies
+Exact, planner-estimated and cached total counts for paginated queries
+"""
+from flask import current_app
+from app.extensions import db
+from app.utils.cache import TTLCache, model_versions
+
+EXACT = 'exact'
+ESTIMATE = 'estimate'
+CACHED = 'cached'
+
+COUNT_STRATEGIES = (EXACT, ESTIMATE, CACHED)
+
+# Per-filter counts, keyed by model version so committed writes invalidate them
+count_cache = TTLCache(ttl=60)
+
+# Planner row estimate of a table (PostgreSQL)
+PLANNER_ESTIMATE = db.text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table)')
+
+
+class TotalCount(int):
+    """Integer total that also records whether it is exact or estimated"""
+    
+    def __new__(cls, value, exact=True):
+        instance = super().__new__(cls, value)
+        instance.exact = exact
+        return instance
+
+
+def resolve_strategy(strategy=None) -> str:
+    """
+    Resolve a requested count strategy, falling back to configuration
+    
+    Raises:
+        ValueError: If the strategy is unknown
+    """
+    strategy = strategy or current_app.config.get('PAGINATION_COUNT_STRATEGY', EXACT)
+    if strategy not in COUNT_STRATEGIES:
+        raise ValueError(f'Invalid count strategy. Use one of: {", ".join(COUNT_STRATEGIES)}')
+    return strategy
+
+
+def count_query(model, query, filters=None, strategy=None) -> TotalCount:
+    """
+    Count the rows of a query using the given strategy
+    
+    - exact: SELECT count(*) over the filtered query
+    - estimate: planner row estimate (pg_class.reltuples) for unfiltered
+      tables on PostgreSQL; filtered queries fall back to cached counts
+    - cached: exact count cached per filter set for COUNT_CACHE_TTL seconds
+      and invalidated by any committed create/update/delete on the model
+    
+    Args:
+        model: Model class being counted
+        query: Filtered query to count
+        filters: Filters applied to the query (part of the cache key)
+        strategy: Count strategy name (defaults to configuration)
+    
+    Returns:
+        TotalCount with an exact flag
+    """
+    strategy = resolve_strategy(strategy)
+    
+    if strategy == ESTIMATE and not filters:
+        estimate = _planner_estimate(model)
+        if estimate is not None:
+            return TotalCount(estimate, exact=False)
+    
+    if strategy in (ESTIMATE, CACHED):
+        key = _cache_key(model, filters)
+        cached = count_cache.get(key)
+        if cached is not None:
+            return TotalCount(cached, exact=False)
+        
+        total = query.count()
+        count_cache.set(key, total, ttl=current_app.config.get('COUNT_CACHE_TTL', 60))
+        return TotalCount(total)
+    
+    return TotalCount(query.count())
+
+
+async def count_statement(session, model, statement, filters=None, strategy=None) -> TotalCount:
+    """
+    Count the rows of a select() on an AsyncSession using the given strategy
+    
+    Same strategies and cache entries as count_query.
+    
+    Args:
+        session: AsyncSession to count with
+        model: Model class being counted
+        statement: Filtered select() to count
+        filters: Filters applied to the statement (part of the cache key)
+        strategy: Count strategy name (defaults to configuration)
+    
+    Returns:
+        TotalCount with an exact flag
+    """
+    strategy = resolve_strategy(strategy)
+    
+    if strategy == ESTIMATE and not filters and session.bind.dialect.name == 'postgresql':
+        estimate = _positive(await session.scalar(PLANNER_ESTIMATE, {'table': model.__tablename__}))
+        if estimate is not None:
+            return TotalCount(estimate, exact=False)
+    
+    key = _cache_key(model, filters)
+    if strategy in (ESTIMATE, CACHED):
+        cached = count_cache.get(key)
+        if cached is not None:
+            return TotalCount(cached, exact=False)
+    
+    total = await session.scalar(db.select(db.func.count()).select_from(statement.order_by(None).subquery()))
+    if strategy in (ESTIMATE, CACHED):
+        count_cache.set(key, total, ttl=current_app.config.get('COUNT_CACHE_TTL', 60))
+    return TotalCount(total)
+
+
+def _cache_key(model, filters) -> tuple:
+    """Count cache key of a filter set, tied to the model's version"""
+    return (
+        model.__tablename__,
+        tuple(sorted((filters or {}).items())),
+        model_versions.get(model)
+    )
+
+
+def _planner_estimate(model):
+    """Get the planner's row estimate for a table, or None if unavailable"""
+    if db.engine.dialect.name != 'postgresql':
+        return None
+    
+    return _positive(db.session.execute(PLANNER_ESTIMATE, {'table': model.__tablename__}).scalar())
+
+
+def _positive(estimate):
+    """A planner estimate, or None if the table was never analyzed (reltuples is -1)"""
+    if estimate is None or estimate < 0:
+        return None
+    return estimate
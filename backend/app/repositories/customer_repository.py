@@ -4,7 +4,13 @@ Data access layer for Customer model
 """
 from typing import Optional, List
 from app.models.customer import Customer
+from app.extensions import db
 from app.repositories.base_repository import BaseRepository
+from app.repositories.routing import read_only
+from app.repositories.search import TrigramIndex, search_by_similarity
+
+# In-process fallback index used when pg_trgm is not available
+_name_index = TrigramIndex(Customer, 'name')
 
 
 class CustomerRepository(BaseRepository[Customer]):
@@ -22,6 +28,27 @@ class CustomerRepository(BaseRepository[Customer]):
         """Check if email already exists"""
         return self.exists(email=email)
     
-    def search_by_name(self, name_pattern: str) -> List[Customer]:
-        """Search customers by name pattern"""
-        return Customer.query.filter(Customer.name.ilike(f'%{name_pattern}%')).all()
+    def existing_emails(self, emails) -> set:
+        """Get which of the given emails already belong to a customer, in one query"""
+        emails = set(emails)
+        if not emails:
+            return set()
+        
+        return set(db.session.scalars(
+            db.select(Customer.email).where(Customer.email.in_(emails))
+        ))
+    
+    @read_only
+    def search_by_name(
+        self,
+        name_pattern: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[List[Customer], Optional[str]]:
+        """
+        Search customers by name, ranked by trigram similarity
+        
+        Returns:
+            Tuple of (matching customers, next cursor or None)
+        """
+        return search_by_similarity(Customer, 'name', name_pattern, limit, cursor, index=_name_index)
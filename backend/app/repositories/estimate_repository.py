@@ -2,11 +2,34 @@
 Estimate Repository
 Data access layer for Estimate model
 """
-from typing import Optional, List
+import re
+import threading
+from typing import Optional, List, Dict, Any, Iterator, Tuple
 from datetime import datetime
-from app.models.estimate import Estimate, estimate_items
+from decimal import Decimal
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from flask import current_app
+from sqlalchemy.orm import Session, lazyload
+from app.models.estimate import Estimate, estimate_items, estimate_number_counters
+from app.models.customer import Customer
+from app.models.item import Item, item_taxes
+from app.models.tax import Tax
+from app.models.user import User
 from app.repositories.base_repository import BaseRepository
+from app.repositories.routing import read_only
+from app.repositories.tax_catalog import tax_catalog
 from app.extensions import db
+from app.utils.money import estimate_totals
+from app.utils.payload_cache import payload_cache
+
+ESTIMATE_NUMBER_PATTERN = re.compile(r'^EST-(\d{4})-(\d+)$')
+REPORT_GROUPS = ('status', 'month', 'customer', 'user')
+
+
+def format_estimate_number(year: int, value: int) -> str:
+    """Format an estimate number as EST-YYYY-NNNN"""
+    return f'EST-{year}-{value:04d}'
 
 
 class EstimateRepository(BaseRepository[Estimate]):
@@ -20,34 +43,360 @@ class EstimateRepository(BaseRepository[Estimate]):
         """Get estimate by estimate number"""
         return self.get_by_field('estimate_number', estimate_number)
     
+    def get_id_by_number(self, estimate_number: str) -> Optional[int]:
+        """Get the ID of the estimate with an estimate number, without loading it"""
+        return db.session.scalar(
+            db.select(Estimate.id).where(Estimate.estimate_number == estimate_number)
+        )
+    
     def estimate_number_exists(self, estimate_number: str) -> bool:
         """Check if estimate number already exists"""
         return self.exists(estimate_number=estimate_number)
     
-    def get_by_customer(self, customer_id: int, page: int = 1, per_page: int = 20) -> tuple[List[Estimate], int]:
+    @read_only
+    def get_version(self, id: int) -> Optional[tuple]:
+        """
+        Get an estimate's version, including everything its to_dict shows
+        
+        Covers the estimate row, its customer, its lines and their items,
+        and the tax links and rates of those items, in one query.
+        
+        Returns:
+            Tuple of version values, or None if the estimate does not exist
+        """
+        taxes = db.select(
+            db.func.count().label('links'),
+            db.func.max(item_taxes.c.created_at).label('linked_at'),
+            db.func.max(Tax.updated_at).label('tax_updated_at')
+        ).select_from(
+            item_taxes.join(Tax, Tax.id == item_taxes.c.tax_id)
+        ).where(item_taxes.c.item_id.in_(
+            db.select(estimate_items.c.item_id).where(estimate_items.c.estimate_id == id)
+        )).subquery()
+        
+        row = db.session.query(
+            Estimate.id,
+            Estimate.updated_at,
+            Customer.updated_at,
+            db.func.count(estimate_items.c.item_id),
+            db.func.max(estimate_items.c.created_at),
+            db.func.max(Item.updated_at),
+            taxes.c.links,
+            taxes.c.linked_at,
+            taxes.c.tax_updated_at
+        ).join(
+            Customer, Customer.id == Estimate.customer_id
+        ).outerjoin(
+            estimate_items, estimate_items.c.estimate_id == Estimate.id
+        ).outerjoin(
+            Item, Item.id == estimate_items.c.item_id
+        ).join(
+            taxes, db.true()
+        ).filter(Estimate.id == id).group_by(
+            Estimate.id, Estimate.updated_at, Customer.updated_at,
+            taxes.c.links, taxes.c.linked_at, taxes.c.tax_updated_at
+        ).first()
+        return tuple(row) if row else None
+    
+    def get_by_customer(
+        self,
+        customer_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Estimate], int]:
         """Get estimates for a specific customer"""
         return self.get_paginated(
             page=page,
             per_page=per_page,
             filters={'customer_id': customer_id},
             order_by='date',
-            desc=True
+            desc=True,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
         )
     
-    def get_by_user(self, user_id: int, page: int = 1, per_page: int = 20) -> tuple[List[Estimate], int]:
+    def get_by_user(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Estimate], int]:
         """Get estimates for a specific user"""
         return self.get_paginated(
             page=page,
             per_page=per_page,
             filters={'user_id': user_id},
             order_by='date',
-            desc=True
+            desc=True,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
+        )
+    
+    def get_by_user_cursor(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Estimate], Optional[str], Optional[int]]:
+        """Get estimates for a specific user using cursor pagination"""
+        return self.get_cursor_paginated(
+            cursor=cursor,
+            per_page=per_page,
+            filters={'user_id': user_id},
+            order_by='date',
+            desc=True,
+            with_total=with_total,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
+        )
+    
+    def iter_by_user(self, user_id: int, chunk_size: int = 1000) -> Iterator[List[Estimate]]:
+        """
+        Stream all estimates of a user in chunks through a server-side cursor
+        
+        Rows are fetched chunk_size at a time (yield_per) in (date DESC,
+        id DESC) order. Relationships are never loaded and each chunk is
+        expunged before the next one is fetched; the session only holds
+        weak references to anything loaded while hydrating a chunk, so
+        memory stays flat however many estimates the user has. Hydrate
+        each chunk before moving on.
+        
+        Args:
+            user_id: ID of the user
+            chunk_size: Rows per chunk
+        
+        Yields:
+            Lists of at most chunk_size Estimate instances
+        """
+        statement = (
+            db.select(Estimate)
+            .where(Estimate.user_id == user_id)
+            .order_by(Estimate.date.desc(), Estimate.id.desc())
+            .options(lazyload('*'))
+            .execution_options(yield_per=chunk_size)
         )
+        
+        for partition in db.session.scalars(statement).partitions():
+            yield partition
+            for estimate in partition:
+                db.session.expunge(estimate)
+    
+    def calculate_totals(self, estimate_ids: List[int]) -> Dict[int, Decimal]:
+        """
+        Get totals (including taxes) for many estimates at once
+        
+        Materialized totals are read straight from the estimates table.
+        Estimates not yet materialized (see backfill_totals) are computed
+        from their lines in one more query, in Decimal, rounded to cents.
+        
+        Args:
+            estimate_ids: IDs of the estimates to total
+        
+        Returns:
+            Dict mapping estimate ID to its rounded total
+        """
+        estimate_ids = list(set(estimate_ids))
+        if not estimate_ids:
+            return {}
+        
+        totals = dict(db.session.query(Estimate.id, Estimate.total).filter(
+            Estimate.id.in_(estimate_ids)
+        ).all())
+        
+        missing = [estimate_id for estimate_id in estimate_ids if totals.get(estimate_id) is None]
+        if missing:
+            computed = self._totals_from_lines(missing)
+            totals.update({estimate_id: computed[estimate_id][2] for estimate_id in missing})
+        
+        return totals
+    
+    def report(
+        self,
+        group_by: str,
+        date_from=None,
+        date_to=None,
+        user_id: Optional[int] = None
+    ) -> List[Any]:
+        """
+        Aggregate estimate value per group in a single statement
+        
+        Counts, sums and averages are computed with GROUP BY, and the
+        grand totals, each group's share and the running total (in key
+        order) with window functions over the grouped rows. Totals come
+        from the materialized column, falling back to the lines and the
+        items' current taxes for estimates not backfilled yet.
+        
+        Args:
+            group_by: One of REPORT_GROUPS
+            date_from: Earliest estimate date included (optional)
+            date_to: Latest estimate date included (optional)
+            user_id: Only include this user's estimates (optional)
+        
+        Returns:
+            Rows with key, label, count, total, average, accepted, offered,
+            share, running_total and the grand_* window columns, ordered by key
+        """
+        total = db.func.coalesce(Estimate.total, self._lines_total(), 0)
+        
+        if group_by == 'month':
+            key = label = self._month(Estimate.date)
+        elif group_by == 'customer':
+            key, label = Estimate.customer_id, Customer.name
+        elif group_by == 'user':
+            key, label = Estimate.user_id, User.email
+        else:
+            key = label = Estimate.status
+        
+        count = db.func.count(Estimate.id)
+        amount = db.func.coalesce(db.func.sum(total), 0)
+        accepted = db.func.sum(db.case((Estimate.status == 'accepted', 1), else_=0))
+        offered = db.func.sum(db.case((Estimate.status != 'draft', 1), else_=0))
+        grand_total = db.func.sum(amount).over()
+        
+        query = db.session.query(
+            key.label('key'),
+            label.label('label'),
+            count.label('count'),
+            amount.label('total'),
+            db.func.avg(total).label('average'),
+            accepted.label('accepted'),
+            offered.label('offered'),
+            db.type_coerce(amount / db.func.nullif(grand_total, 0), db.Float).label('share'),
+            db.func.sum(amount).over(order_by=key).label('running_total'),
+            db.func.sum(count).over().label('grand_count'),
+            grand_total.label('grand_total'),
+            db.func.sum(accepted).over().label('grand_accepted'),
+            db.func.sum(offered).over().label('grand_offered')
+        )
+        if group_by == 'customer':
+            query = query.outerjoin(Customer, Customer.id == Estimate.customer_id)
+        elif group_by == 'user':
+            query = query.outerjoin(User, User.id == Estimate.user_id)
+        
+        if date_from is not None:
+            query = query.filter(Estimate.date >= date_from)
+        if date_to is not None:
+            query = query.filter(Estimate.date <= date_to)
+        if user_id is not None:
+            query = query.filter(Estimate.user_id == user_id)
+        
+        group = [key] if label is key else [key, label]
+        return query.group_by(*group).order_by(key).all()
+    
+    @staticmethod
+    def _lines_total():
+        """Correlated subquery totalling an estimate from its lines, for unmaterialized rows"""
+        current_rate = db.select(db.func.coalesce(db.func.sum(Tax.amount), 0)).select_from(
+            item_taxes.join(Tax, Tax.id == item_taxes.c.tax_id)
+        ).where(item_taxes.c.item_id == estimate_items.c.item_id).scalar_subquery()
+        rate = db.func.coalesce(estimate_items.c.tax_rate, current_rate)
+        
+        return db.select(db.func.round(db.func.sum(
+            estimate_items.c.quantity * estimate_items.c.unit_price * (100 + rate) / 100
+        ), 2)).where(estimate_items.c.estimate_id == Estimate.id).scalar_subquery()
+    
+    @staticmethod
+    def _month(column):
+        """YYYY-MM of a date column in the bound database's dialect"""
+        if db.session.get_bind().dialect.name == 'postgresql':
+            return db.func.to_char(column, 'YYYY-MM')
+        return db.func.strftime('%Y-%m', column)
+    
+    def hydrate(
+        self,
+        estimates: List[Estimate],
+        include_items: bool = True,
+        include_customer: bool = True,
+        include_total: bool = False
+    ) -> Dict[int, Dict[str, Any]]:
+        """
+        Preload everything Estimate.to_dict needs for a page of estimates
+        
+        Line rows, items and customers for the whole page are fetched with
+        a constant number of queries, independent of how many estimates or
+        lines the page holds; item taxes come from the tax catalog cache
+        and totals from the materialized column.
+        
+        Args:
+            estimates: Estimate instances to hydrate
+            include_items: Whether to load lines, items and totals
+            include_customer: Whether to load customers
+            include_total: Whether to load totals without the lines
+        
+        Returns:
+            Dict mapping estimate ID to preloaded state accepted by
+            Estimate.to_dict(preloaded=...)
+        """
+        hydrated = {estimate.id: {} for estimate in estimates}
+        if not estimates:
+            return hydrated
+        
+        if include_customer:
+            customer_ids = {estimate.customer_id for estimate in estimates}
+            customers = {
+                customer.id: customer
+                for customer in Customer.query.filter(Customer.id.in_(customer_ids)).all()
+            }
+            for estimate in estimates:
+                hydrated[estimate.id]['customer'] = customers.get(estimate.customer_id)
+        
+        if include_items:
+            rows = self._line_rows(hydrated.keys())
+            
+            item_ids = {row.item_id for row in rows}
+            items = {
+                item.id: item
+                for item in Item.query.filter(Item.id.in_(item_ids)).all()
+            } if item_ids else {}
+            # Also warms the cache that Item.to_dict reads taxes from
+            tax_rates = tax_catalog.tax_rates(item_ids)
+            
+            line_values = {estimate_id: [] for estimate_id in hydrated}
+            lines = {estimate_id: [] for estimate_id in hydrated}
+            for row in rows:
+                item = items.get(row.item_id)
+                tax_rate = row.tax_rate if row.tax_rate is not None else tax_rates[row.item_id]
+                line_values[row.estimate_id].append((row.quantity, row.unit_price, tax_rate))
+                if item:
+                    lines[row.estimate_id].append((item, row.quantity, row.unit_price))
+            
+            for estimate in estimates:
+                state = hydrated[estimate.id]
+                state['lines'] = lines[estimate.id]
+                state['total'] = (
+                    estimate.total if estimate.total is not None
+                    else estimate_totals(line_values[estimate.id])[2]
+                )
+        elif include_total:
+            totals = self.calculate_totals([estimate.id for estimate in estimates if estimate.total is None])
+            for estimate in estimates:
+                hydrated[estimate.id]['total'] = totals.get(estimate.id, estimate.total)
+        
+        return hydrated
     
     def create_estimate_with_items(self, estimate_data: dict, items_data: List[dict]) -> Estimate:
         """
         Create estimate with items
         
+        If estimate_data has no estimate_number, one is allocated from the
+        per-year counter inside the same transaction as the insert. Each
+        line records its item's current tax rate, and the totals are
+        written with the estimate row, which comes back through INSERT ...
+        RETURNING; all lines are written with a single executemany.
+        
         Args:
             estimate_data: Estimate fields (estimate_number, customer_id, date, etc.)
             items_data: List of dicts with item_id, quantity, unit_price
@@ -55,42 +404,438 @@ class EstimateRepository(BaseRepository[Estimate]):
         Returns:
             Created Estimate instance
         """
-        # Create estimate
-        estimate = Estimate(**estimate_data)
-        db.session.add(estimate)
-        db.session.flush()  # Get the estimate ID
-        
-        # Add items to estimate
-        for item_data in items_data:
-            stmt = estimate_items.insert().values(
-                estimate_id=estimate.id,
-                item_id=item_data['item_id'],
-                quantity=item_data.get('quantity', 1),
-                unit_price=item_data['unit_price']
-            )
-            db.session.execute(stmt)
+        estimate_data = dict(estimate_data)
         
-        db.session.commit()
+        try:
+            if estimate_data.get('estimate_number'):
+                self.reserve_estimate_number(estimate_data['estimate_number'])
+            else:
+                estimate_data['estimate_number'] = self.allocate_estimate_numbers()[0]
+            
+            lines = self._snapshot_lines([items_data])[0]
+            estimate_data.update(self._totals_columns(lines))
+            
+            # Create estimate, getting the row back without a separate flush
+            estimate = db.session.scalars(
+                db.insert(Estimate).returning(Estimate), [estimate_data]
+            ).one()
+            
+            # Add all items to the estimate in one statement
+            if lines:
+                db.session.execute(estimate_items.insert(), [
+                    dict(line, estimate_id=estimate.id) for line in lines
+                ])
+            
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        payload_cache.invalidate(Estimate.__tablename__, estimate.id)
         return estimate
     
+    def create_estimates_with_items(self, rows: List[Tuple[dict, List[dict]]]) -> List[Tuple[int, str]]:
+        """
+        Create many estimates with their items in one transaction
+        
+        Missing estimate numbers are taken from the worker's
+        estimate_number_block, so the per-year counter row is not locked
+        for the whole transaction (numbers of a failed chunk are skipped,
+        unlike single creates). Estimates are inserted in a single multi-row
+        INSERT ... RETURNING and every line of every estimate is written
+        with one executemany. Nothing is committed if any row fails.
+        
+        Args:
+            rows: List of (estimate_data, items_data) pairs as accepted by
+                  create_estimate_with_items
+        
+        Returns:
+            List of (id, estimate_number) in the same order as rows
+        """
+        estimates_data = [dict(estimate_data) for estimate_data, _ in rows]
+        unnumbered = [data for data in estimates_data if not data.get('estimate_number')]
+        for estimate_data, estimate_number in zip(unnumbered, estimate_number_block.take(len(unnumbered))):
+            estimate_data['estimate_number'] = estimate_number
+        
+        try:
+            for estimate_number in self._highest_numbers_per_year(
+                estimate_data['estimate_number'] for estimate_data in estimates_data
+                if estimate_data.get('estimate_number')
+            ):
+                self.reserve_estimate_number(estimate_number)
+            
+            lines_per_estimate = self._snapshot_lines([items_data for _, items_data in rows])
+            for estimate_data, lines in zip(estimates_data, lines_per_estimate):
+                estimate_data.update(self._totals_columns(lines))
+            
+            # Rows come back in no particular order; numbers are unique, so
+            # map them back by number rather than by position
+            ids_by_number = dict(db.session.execute(
+                db.insert(Estimate).returning(Estimate.estimate_number, Estimate.id),
+                estimates_data
+            ).all())
+            estimate_ids = [ids_by_number[data['estimate_number']] for data in estimates_data]
+            
+            lines = [
+                dict(line, estimate_id=estimate_id)
+                for estimate_id, estimate_lines in zip(estimate_ids, lines_per_estimate)
+                for line in estimate_lines
+            ]
+            if lines:
+                db.session.execute(estimate_items.insert(), lines)
+            
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        payload_cache.invalidate(Estimate.__tablename__, *estimate_ids)
+        return [
+            (estimate_id, estimate_data['estimate_number'])
+            for estimate_id, estimate_data in zip(estimate_ids, estimates_data)
+        ]
+    
+    def existing_estimate_numbers(self, estimate_numbers) -> set:
+        """Get which of the given estimate numbers are already taken, in one query"""
+        estimate_numbers = set(estimate_numbers)
+        if not estimate_numbers:
+            return set()
+        
+        return set(db.session.scalars(
+            db.select(Estimate.estimate_number).where(Estimate.estimate_number.in_(estimate_numbers))
+        ))
+    
+    def _highest_numbers_per_year(self, estimate_numbers) -> List[str]:
+        """Pick the highest EST-YYYY-NNNN number of each year; others are ignored"""
+        highest = {}
+        for estimate_number in estimate_numbers:
+            match = ESTIMATE_NUMBER_PATTERN.match(estimate_number)
+            if match:
+                year, value = int(match.group(1)), int(match.group(2))
+                if value > highest.get(year, (0, None))[0]:
+                    highest[year] = (value, estimate_number)
+        return [estimate_number for _, estimate_number in highest.values()]
+    
+    def refresh_draft_tax_rates(self, item_ids) -> int:
+        """
+        Re-snapshot the tax rates of draft lines for items whose taxes changed
+        
+        Lines of draft estimates take the items' current summed tax rates
+        and those estimates' totals are recomputed; estimates in any other
+        status keep the rates they were created with.
+        
+        Args:
+            item_ids: IDs of the items whose taxes changed
+        
+        Returns:
+            Number of estimates whose totals were recomputed
+        """
+        item_ids = set(item_ids)
+        if not item_ids:
+            return 0
+        
+        rates = dict(db.session.query(
+            item_taxes.c.item_id, db.func.sum(Tax.amount)
+        ).join(Tax, Tax.id == item_taxes.c.tax_id).filter(
+            item_taxes.c.item_id.in_(item_ids)
+        ).group_by(item_taxes.c.item_id).all())
+        
+        drafts = db.select(Estimate.id).where(Estimate.status == 'draft')
+        estimate_ids = db.session.scalars(
+            db.select(estimate_items.c.estimate_id).distinct().where(
+                estimate_items.c.item_id.in_(item_ids),
+                estimate_items.c.estimate_id.in_(drafts)
+            )
+        ).all()
+        if not estimate_ids:
+            return 0
+        
+        try:
+            db.session.execute(
+                estimate_items.update()
+                .where(estimate_items.c.item_id == db.bindparam('line_item_id'))
+                .where(estimate_items.c.estimate_id.in_(drafts))
+                .values(tax_rate=db.bindparam('line_tax_rate')),
+                [
+                    {'line_item_id': item_id, 'line_tax_rate': rates.get(item_id, Decimal('0'))}
+                    for item_id in item_ids
+                ]
+            )
+            self._write_totals(estimate_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        payload_cache.invalidate(Estimate.__tablename__, *estimate_ids)
+        return len(estimate_ids)
+    
+    def backfill_totals(self, batch_size: int = 1000, after_id: int = 0) -> Optional[int]:
+        """
+        Materialize totals for one batch of estimates that have none
+        
+        Lines without a tax rate snapshot get their item's current rate
+        (the best record available for them), then the totals are written
+        and the batch is committed.
+        
+        Args:
+            batch_size: Estimates per batch
+            after_id: Only consider estimates with a greater ID
+        
+        Returns:
+            Highest estimate ID processed, or None when nothing was left
+        """
+        estimate_ids = db.session.scalars(
+            db.select(Estimate.id)
+            .where(Estimate.total.is_(None), Estimate.id > after_id)
+            .order_by(Estimate.id)
+            .limit(batch_size)
+        ).all()
+        if not estimate_ids:
+            return None
+        
+        try:
+            rows = self._line_rows(estimate_ids)
+            unsnapshotted = {row.item_id for row in rows if row.tax_rate is None}
+            if unsnapshotted:
+                rates = tax_catalog.tax_rates(unsnapshotted)
+                db.session.execute(
+                    estimate_items.update()
+                    .where(estimate_items.c.estimate_id.between(estimate_ids[0], estimate_ids[-1]))
+                    .where(estimate_items.c.item_id == db.bindparam('line_item_id'))
+                    .where(estimate_items.c.tax_rate.is_(None))
+                    .values(tax_rate=db.bindparam('line_tax_rate')),
+                    [
+                        {'line_item_id': item_id, 'line_tax_rate': rate}
+                        for item_id, rate in rates.items()
+                    ]
+                )
+            self._write_totals(estimate_ids)
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        
+        payload_cache.invalidate(Estimate.__tablename__, *estimate_ids)
+        return estimate_ids[-1]
+    
+    def _line_rows(self, estimate_ids):
+        """Fetch the lines of many estimates in one query"""
+        return db.session.query(
+            estimate_items.c.estimate_id,
+            estimate_items.c.item_id,
+            estimate_items.c.quantity,
+            estimate_items.c.unit_price,
+            estimate_items.c.tax_rate
+        ).filter(estimate_items.c.estimate_id.in_(estimate_ids)).all()
+    
+    def _totals_from_lines(self, estimate_ids) -> Dict[int, tuple]:
+        """
+        Compute (subtotal, tax_total, total) of estimates from their lines
+        
+        Lines without a tax rate snapshot use the item's current rate.
+        """
+        rows = self._line_rows(estimate_ids)
+        tax_rates = tax_catalog.tax_rates({row.item_id for row in rows if row.tax_rate is None})
+        
+        lines = {estimate_id: [] for estimate_id in estimate_ids}
+        for row in rows:
+            tax_rate = row.tax_rate if row.tax_rate is not None else tax_rates[row.item_id]
+            lines[row.estimate_id].append((row.quantity, row.unit_price, tax_rate))
+        
+        return {estimate_id: estimate_totals(values) for estimate_id, values in lines.items()}
+    
+    def _write_totals(self, estimate_ids):
+        """Recompute the materialized totals of estimates with one executemany"""
+        db.session.execute(db.update(Estimate), [
+            {'id': estimate_id, **self._totals_columns(totals)}
+            for estimate_id, totals in self._totals_from_lines(estimate_ids).items()
+        ])
+    
+    def _snapshot_lines(self, items_data_per_estimate) -> List[List[dict]]:
+        """Build estimate_items rows carrying each item's current tax rate"""
+        tax_rates = tax_catalog.tax_rates({
+            item_data['item_id'] for items_data in items_data_per_estimate for item_data in items_data
+        })
+        return [
+            [
+                {
+                    'item_id': item_data['item_id'],
+                    'quantity': item_data.get('quantity', 1),
+                    'unit_price': item_data['unit_price'],
+                    'tax_rate': tax_rates[item_data['item_id']]
+                }
+                for item_data in items_data
+            ]
+            for items_data in items_data_per_estimate
+        ]
+    
+    @staticmethod
+    def _totals_columns(lines_or_totals) -> Dict[str, Decimal]:
+        """Materialized total column values from line rows or a totals tuple"""
+        if isinstance(lines_or_totals, tuple):
+            subtotal, tax_total, total = lines_or_totals
+        else:
+            subtotal, tax_total, total = estimate_totals(
+                (line['quantity'], line['unit_price'], line['tax_rate']) for line in lines_or_totals
+            )
+        return {'subtotal': subtotal, 'tax_total': tax_total, 'total': total}
+    
     def generate_estimate_number(self) -> str:
         """
-        Generate next estimate number
+        Allocate the next estimate number in the current transaction
         Format: EST-YYYY-XXXX (e.g., EST-2026-0001)
+        
+        The number is only consumed if the transaction commits.
+        """
+        return self.allocate_estimate_numbers()[0]
+    
+    def allocate_estimate_numbers(
+        self,
+        count: int = 1,
+        year: Optional[int] = None,
+        session: Optional[Session] = None
+    ) -> List[str]:
         """
-        current_year = datetime.now().year
-        prefix = f"EST-{current_year}-"
+        Atomically allocate consecutive estimate numbers for a year
         
-        # Get last estimate number for current year
-        last_estimate = Estimate.query.filter(
-            Estimate.estimate_number.like(f"{prefix}%")
-        ).order_by(Estimate.estimate_number.desc()).first()
+        The per-year counter row is incremented with UPDATE ... RETURNING,
+        which locks it until the surrounding transaction ends. Numbers are
+        therefore gapless: a rolled back transaction releases its numbers
+        and concurrent allocators never see the same value.
         
-        if last_estimate:
-            # Extract number and increment
-            last_number = int(last_estimate.estimate_number.split('-')[-1])
-            next_number = last_number + 1
-        else:
-            next_number = 1
+        Args:
+            count: How many numbers to allocate
+            year: Year of the numbers (defaults to the current year)
+            session: Session to allocate in (defaults to db.session)
+        
+        Returns:
+            List of estimate numbers in ascending order
+        """
+        session = session or db.session
+        year = year or datetime.now().year
+        
+        last_value = self._increment_counter(session, year, count)
+        if last_value is None:
+            # First allocation of the year: seed the counter from existing rows
+            self._insert_counter(session, year, self._highest_existing_number(session, year))
+            last_value = self._increment_counter(session, year, count)
+        
+        return [format_estimate_number(year, n) for n in range(last_value - count + 1, last_value + 1)]
+    
+    def reserve_estimate_number(self, estimate_number: str, session: Optional[Session] = None):
+        """
+        Advance the counter past a manually chosen EST-YYYY-NNNN number
+        
+        Keeps later allocations from colliding with numbers supplied by
+        clients. Numbers in any other format are ignored.
+        """
+        match = ESTIMATE_NUMBER_PATTERN.match(estimate_number)
+        if not match:
+            return
+        
+        session = session or db.session
+        year, value = int(match.group(1)), int(match.group(2))
         
-        return f"{prefix}{next_number:04d}"
+        if self._increment_counter(session, year, 0) is None:
+            self._insert_counter(session, year, self._highest_existing_number(session, year))
+        
+        session.execute(
+            estimate_number_counters.update()
+            .where(estimate_number_counters.c.year == year)
+            .where(estimate_number_counters.c.last_value < value)
+            .values(last_value=value)
+        )
+    
+    def _increment_counter(self, session: Session, year: int, count: int) -> Optional[int]:
+        """Add count to a year's counter and return its new value (None if missing)"""
+        return session.execute(
+            estimate_number_counters.update()
+            .where(estimate_number_counters.c.year == year)
+            .values(last_value=estimate_number_counters.c.last_value + count)
+            .returning(estimate_number_counters.c.last_value)
+        ).scalar()
+    
+    def _insert_counter(self, session: Session, year: int, last_value: int):
+        """Create a year's counter row unless a concurrent transaction already did"""
+        insert = postgresql_insert if session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        session.execute(
+            insert(estimate_number_counters)
+            .values(year=year, last_value=last_value)
+            .on_conflict_do_nothing(index_elements=['year'])
+        )
+    
+    def _highest_existing_number(self, session: Session, year: int) -> int:
+        """Get the highest numeric suffix already used for a year"""
+        prefix = f'EST-{year}-'
+        number_column = Estimate.estimate_number
+        
+        # Longer zero-padded suffixes are larger, so this orders numerically
+        row = session.query(number_column).filter(
+            number_column.like(f'{prefix}%')
+        ).order_by(db.func.length(number_column).desc(), number_column.desc()).first()
+        
+        if row:
+            match = ESTIMATE_NUMBER_PATTERN.match(row[0])
+            if match:
+                return int(match.group(2))
+        return 0
+
+
+class EstimateNumberBlock:
+    """
+    Per-worker block of pre-allocated estimate numbers for high-rate imports
+    
+    Each refill reserves block_size numbers in a short transaction of its
+    own, so workers only touch the shared counter row once per block
+    instead of holding its lock for a whole import transaction. Unlike
+    per-transaction allocation, numbers of a failed import or still unused
+    when a worker stops are lost, leaving gaps in the sequence.
+    """
+    
+    def __init__(self, block_size: Optional[int] = None, year: Optional[int] = None, engine=None):
+        self.block_size = block_size
+        self.year = year
+        self.engine = engine
+        self._numbers = {}
+        self._lock = threading.Lock()
+    
+    def take(self, count: int = 1, year: Optional[int] = None) -> List[str]:
+        """
+        Take the next numbers of a year, reserving a new block when too few are left
+        
+        Call it before opening the transaction the numbers are used in:
+        the refill commits its own session, which on SQLite may share the
+        caller's connection.
+        
+        Args:
+            count: How many numbers to take
+            year: Year of the numbers (defaults to the block's year, then the current year)
+        
+        Returns:
+            List of estimate numbers in ascending order
+        """
+        year = year or self.year or datetime.now().year
+        with self._lock:
+            numbers = self._numbers.get(year, [])
+            if len(numbers) < count:
+                block_size = self.block_size or current_app.config['ESTIMATE_NUMBER_BLOCK_SIZE']
+                with Session(bind=self.engine or db.engine) as session:
+                    numbers = numbers + EstimateRepository().allocate_estimate_numbers(
+                        max(block_size, count - len(numbers)), year, session=session
+                    )
+                    session.commit()
+            taken, self._numbers[year] = numbers[:count], numbers[count:]
+            return taken
+    
+    def next(self) -> str:
+        """Take the next number, reserving a new block when exhausted"""
+        return self.take()[0]
+    
+    def clear(self):
+        """Drop every reserved number (they are not handed out again)"""
+        with self._lock:
+            self._numbers.clear()
+
+
+estimate_number_block = EstimateNumberBlock()
@@ -2,9 +2,18 @@
 Item Repository
 Data access layer for Item model
 """
-from typing import Optional, List
-from app.models.item import Item
+from datetime import datetime
+from typing import Optional, List, Tuple
+from app.models.item import Item, item_taxes
+from app.models.tax import Tax
+from app.extensions import db
 from app.repositories.base_repository import BaseRepository
+from app.repositories.routing import read_only
+from app.repositories.bulk_load import bulk_load
+from app.repositories.search import TrigramIndex, search_by_similarity
+
+# In-process fallback index used when pg_trgm is not available
+_name_index = TrigramIndex(Item, 'name')
 
 
 class ItemRepository(BaseRepository[Item]):
@@ -14,15 +23,117 @@ class ItemRepository(BaseRepository[Item]):
         """Initialize ItemRepository with Item model"""
         super().__init__(Item)
     
-    def search_by_name(self, name_pattern: str) -> List[Item]:
-        """Search items by name pattern"""
-        return Item.query.filter(Item.name.ilike(f'%{name_pattern}%')).all()
+    @read_only
+    def get_version(self, id: int) -> Optional[tuple]:
+        """
+        Get an item's version, including its tax links and their rates
+        
+        Returns:
+            (id, updated_at, tax link count, newest link, newest tax
+            update), or None if the item does not exist
+        """
+        row = db.session.query(
+            Item.id,
+            Item.updated_at,
+            db.func.count(item_taxes.c.tax_id),
+            db.func.max(item_taxes.c.created_at),
+            db.func.max(Tax.updated_at)
+        ).outerjoin(
+            item_taxes, item_taxes.c.item_id == Item.id
+        ).outerjoin(
+            Tax, Tax.id == item_taxes.c.tax_id
+        ).filter(Item.id == id).group_by(Item.id, Item.updated_at).first()
+        return tuple(row) if row else None
+    
+    @read_only
+    def search_by_name(
+        self,
+        name_pattern: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[List[Item], Optional[str]]:
+        """
+        Search items by name, ranked by trigram similarity
+        
+        Returns:
+            Tuple of (matching items, next cursor or None)
+        """
+        return search_by_similarity(Item, 'name', name_pattern, limit, cursor, index=_name_index)
     
-    def get_active_items(self, page: int = 1, per_page: int = 20) -> tuple[List[Item], int]:
+    def get_active_items(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Item], int]:
         """Get paginated list of items"""
         return self.get_paginated(
             page=page,
             per_page=per_page,
             order_by='name',
-            desc=False
+            desc=False,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
+        )
+    
+    def get_active_items_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        columns: Optional[List[str]] = None,
+        as_rows: bool = False
+    ) -> tuple[List[Item], Optional[str], Optional[int]]:
+        """Get items using cursor pagination"""
+        return self.get_cursor_paginated(
+            cursor=cursor,
+            per_page=per_page,
+            order_by='name',
+            desc=False,
+            with_total=with_total,
+            count_strategy=count_strategy,
+            columns=columns,
+            as_rows=as_rows
         )
+    
+    def existing_tax_ids(self, tax_ids) -> set:
+        """Get which of the given tax IDs exist, in one query"""
+        tax_ids = set(tax_ids)
+        if not tax_ids:
+            return set()
+        
+        return set(db.session.scalars(db.select(Tax.id).where(Tax.id.in_(tax_ids))))
+    
+    def bulk_create_items(self, rows: List[Tuple[dict, List[int]]]) -> List[int]:
+        """
+        Create many items and their tax links in one transaction
+        
+        Items and item_taxes rows are both loaded with bulk_load (COPY on
+        PostgreSQL); nothing is committed if any row fails.
+        
+        Args:
+            rows: List of (item_data, tax_ids) pairs
+        
+        Returns:
+            IDs of the created items in input order
+        """
+        try:
+            item_ids = bulk_load(Item.__table__, [item_data for item_data, _ in rows])
+            
+            # COPY skips SQL-side defaults, so set created_at here
+            now = datetime.utcnow()
+            bulk_load(item_taxes, [
+                {'item_id': item_id, 'tax_id': tax_id, 'created_at': now}
+                for item_id, (_, tax_ids) in zip(item_ids, rows)
+                for tax_id in tax_ids
+            ])
+            
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+        return item_ids
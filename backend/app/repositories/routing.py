@@ -0,0 +1,182 @@
+"""
+Read Replica Routing
+Send the SELECTs of read-only repository calls made by GET requests to a replica
+"""
+import functools
+import time
+from contextvars import ContextVar
+from flask import current_app, g, has_request_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from app.utils.cache import TTLCache
+
+# Bind key of the replica engine (SQLALCHEMY_BINDS)
+REPLICA = 'replica'
+
+READ_METHODS = ('GET', 'HEAD')
+
+# Set while a read_only call may send its SELECTs to the replica
+_use_replica = ContextVar('use_replica', default=False)
+
+# Cookie holding when the client's read-your-writes window ends (Unix
+# time); it travels with the client, so every worker keeps it on the primary
+STICKY_COOKIE = 'wave_primary_until'
+
+# Binds skipped after failing a read
+unavailable_binds = TTLCache(ttl=30)
+
+
+class RoutingSession(Session):
+    """
+    Session sending SELECTs made inside read_only calls to the replica
+    
+    Flushes, writes and every statement after the transaction wrote go
+    where Flask-SQLAlchemy sends them, which is the primary.
+    """
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if (
+            bind is None
+            and _use_replica.get()
+            and not self._flushing
+            and not self.info.get('wrote')
+            and getattr(clause, 'is_select', False)
+        ):
+            self.info['replica_used'] = True
+            return self._db.engines[REPLICA]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_flush')
+def _flushed(session, flush_context):
+    session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'do_orm_execute')
+def _executed(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info['wrote'] = True
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _committed(session):
+    if session.info.pop('wrote', False) and REPLICA in session._db.engines and has_request_context():
+        g.primary_until = time.time() + current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _rolled_back(session):
+    session.info.pop('wrote', None)
+
+
+def read_only(method):
+    """
+    Let a repository method read from the replica
+    
+    The replica is used for GET and HEAD requests only, while it is
+    configured and reachable, and not for REPLICA_STICKY_SECONDS after
+    the client's last write (see STICKY_COOKIE) so it reads its own
+    writes. When the replica
+    fails a call, it is skipped for REPLICA_RETRY_SECONDS and the call
+    runs again on the primary.
+    """
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if _use_replica.get() or not _replica_readable():
+            return method(*args, **kwargs)
+        
+        session = current_app.extensions['sqlalchemy'].session
+        session.info['replica_used'] = False
+        token = _use_replica.set(True)
+        try:
+            return method(*args, **kwargs)
+        except OperationalError:
+            if not session.info.get('replica_used'):
+                raise
+            _replica_failed()
+            session.rollback()
+        finally:
+            _use_replica.reset(token)
+        
+        return method(*args, **kwargs)
+    
+    return wrapper
+
+
+def read_only_async(method):
+    """
+    read_only for the coroutine methods of the async repositories
+    
+    Their sessions come from async_db.session(bind_key()), which is the
+    replica's within the call.
+    """
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _use_replica.get() or not _replica_readable():
+            return await method(*args, **kwargs)
+        
+        token = _use_replica.set(True)
+        try:
+            return await method(*args, **kwargs)
+        except OperationalError:
+            _replica_failed()
+        finally:
+            _use_replica.reset(token)
+        
+        return await method(*args, **kwargs)
+    
+    return wrapper
+
+
+def bind_key():
+    """Bind key for an async session: the replica's within read_only_async calls"""
+    return REPLICA if _use_replica.get() else None
+
+
+def _replica_failed():
+    """Skip the replica for REPLICA_RETRY_SECONDS after it failed a read"""
+    unavailable_binds.set(REPLICA, True, ttl=current_app.config.get('REPLICA_RETRY_SECONDS', 30))
+    current_app.logger.warning('Read replica unavailable, reading from the primary', exc_info=True)
+
+
+def _replica_readable() -> bool:
+    """Whether the current request may read from the replica"""
+    return (
+        has_request_context()
+        and request.method in READ_METHODS
+        and REPLICA in current_app.extensions['sqlalchemy'].engines
+        and unavailable_binds.get(REPLICA) is None
+        and not _wrote_recently()
+    )
+
+
+def _wrote_recently() -> bool:
+    """Whether the request's sticky cookie says the client is still in its read-your-writes window"""
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def register_replica_routing(app):
+    """
+    Set the STICKY_COOKIE on responses to requests that committed a write
+    
+    The cookie expires with the REPLICA_STICKY_SECONDS window; clients
+    that do not keep cookies read the replica right after their writes.
+    """
+    
+    @app.after_request
+    def set_sticky_cookie(response):
+        primary_until = g.pop('primary_until', None)
+        if primary_until is not None:
+            response.set_cookie(
+                STICKY_COOKIE,
+                f'{primary_until:.3f}',
+                max_age=max(1, round(primary_until - time.time())),
+                secure=app.config.get('JWT_COOKIE_SECURE', False),
+                httponly=True,
+                samesite='Lax'
+            )
+        return response
@@ -0,0 +1,169 @@
+"""
+Fuzzy Name Search
+Trigram similarity search backed by pg_trgm on PostgreSQL and by an
+in-process n-gram index elsewhere (SQLite in development and tests)
+"""
+import re
+import threading
+import time
+from collections import Counter
+from typing import List, Optional, Tuple
+from flask import current_app
+from app.extensions import db
+from app.utils.cache import model_versions
+from app.utils.cursors import encode_cursor, decode_cursor
+
+# pg_trgm's default similarity threshold
+SIMILARITY_THRESHOLD = 0.3
+
+_WORD_PATTERN = re.compile(r'[^\W_]+')
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    Extract trigrams the way pg_trgm does
+    
+    Each alphanumeric word is lowercased and padded with two spaces in
+    front and one behind before being split into 3-character grams.
+    """
+    grams = set()
+    for word in _WORD_PATTERN.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: frozenset, b: frozenset) -> float:
+    """Trigram similarity: shared grams over all distinct grams"""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TrigramIndex:
+    """
+    In-process trigram index over one text column of a model
+    
+    The index is rebuilt lazily when the model's version changes (any
+    create/update/delete through the repositories) or after ttl seconds,
+    which bounds staleness from writes made by other processes.
+    """
+    
+    def __init__(self, model, column: str, ttl: float = 60):
+        self.model = model
+        self.column = column
+        self.ttl = ttl
+        self._version = None
+        self._built_at = 0.0
+        # (rows, postings), swapped as one attribute so a search never
+        # mixes the postings of one build with the rows of another
+        self._snapshot = ({}, {})
+        self._lock = threading.Lock()
+    
+    def search(self, term: str) -> List[Tuple[int, float]]:
+        """
+        Rank rows matching a term
+        
+        Rows match if their similarity reaches the threshold or if they
+        contain the term as a substring (case-insensitive).
+        
+        Returns:
+            List of (id, score) sorted by score descending, then id
+        """
+        rows, postings = self._ensure_fresh()
+        query_grams = trigrams(term)
+        needle = term.lower()
+        
+        # Count shared grams per row from the postings lists
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(postings.get(gram, ()))
+        
+        ranked = []
+        for id, common in shared.items():
+            size, text = rows[id]
+            score = common / (len(query_grams) + size - common)
+            if score >= SIMILARITY_THRESHOLD or needle in text:
+                ranked.append((id, score))
+        
+        ranked.sort(key=lambda match: (-match[1], match[0]))
+        return ranked
+    
+    def _ensure_fresh(self):
+        """Rebuild the index if the model changed or the TTL expired, and return its (rows, postings)"""
+        version = model_versions.get(self.model)
+        if version == self._version and time.monotonic() - self._built_at < self.ttl:
+            return self._snapshot
+        
+        with self._lock:
+            if version == self._version and time.monotonic() - self._built_at < self.ttl:
+                return self._snapshot
+            
+            column = getattr(self.model, self.column)
+            rows, postings = {}, {}
+            for id, text in db.session.query(self.model.id, column).yield_per(5000):
+                text = (text or '').lower()
+                grams = trigrams(text)
+                rows[id] = (len(grams), text)
+                for gram in grams:
+                    postings.setdefault(gram, []).append(id)
+            
+            self._snapshot = (rows, postings)
+            self._version = version
+            self._built_at = time.monotonic()
+            return self._snapshot
+
+
+def search_by_similarity(
+    model,
+    column: str,
+    term: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    index: Optional[TrigramIndex] = None
+) -> tuple[list, Optional[str]]:
+    """
+    Search a model's text column ranked by trigram similarity
+    
+    On PostgreSQL the query runs against the pg_trgm GIN index; other
+    databases use the given in-process TrigramIndex.
+    
+    Args:
+        model: Model class to search
+        column: Name of the text column
+        term: Search term
+        limit: Maximum number of results (capped by SEARCH_MAX_LIMIT)
+        cursor: Token returned as next_cursor by the previous call
+        index: In-process index used when pg_trgm is not available
+    
+    Returns:
+        Tuple of (ranked records, next cursor or None)
+    
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    limit = max(1, min(limit, current_app.config.get('SEARCH_MAX_LIMIT', 100)))
+    offset = 0
+    if cursor:
+        offset, _ = decode_cursor(cursor)
+        if not isinstance(offset, int) or offset < 0:
+            raise ValueError('Invalid cursor')
+    
+    if db.engine.dialect.name == 'postgresql':
+        text_column = getattr(model, column)
+        score = db.func.similarity(text_column, term)
+        records = model.query.filter(
+            db.or_(text_column.op('%')(term), text_column.ilike(f'%{term}%'))
+        ).order_by(score.desc(), model.id).offset(offset).limit(limit + 1).all()
+    else:
+        ranked = index.search(term)[offset:offset + limit + 1]
+        ids = [id for id, _ in ranked]
+        by_id = {record.id: record for record in model.query.filter(model.id.in_(ids)).all()}
+        records = [by_id[id] for id in ids if id in by_id]
+    
+    next_cursor = None
+    if len(records) > limit:
+        records = records[:limit]
+        next_cursor = encode_cursor(offset + limit, records[-1].id)
+    
+    return records, next_cursor
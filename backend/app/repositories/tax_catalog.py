@@ -0,0 +1,148 @@
+"""
+Tax Catalog
+Process-local read-through cache of taxes and the taxes linked to each item
+"""
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, Iterable, List
+from app.extensions import db
+from app.models.item import item_taxes
+from app.models.tax import Tax
+from app.utils.cache import model_versions
+
+
+class TaxCatalog:
+    """
+    Cache of the tax table and of item-to-tax links
+    
+    The whole tax table is loaded on first use; item links are read
+    through per item, fetching every missing item of a call in one query.
+    Everything is dropped when the taxes or item_taxes version changes
+    (any committed write to either, including changes to an item's taxes
+    collection) or after ttl seconds, which bounds staleness from writes
+    made by other processes.
+    
+    Cached values are plain dicts and Decimals, never ORM instances, so
+    they can be shared across sessions and threads.
+    """
+    
+    def __init__(self, ttl: float = 300):
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._loaded_at = 0.0
+        self._table = None
+        self._item_tax_ids = {}
+        self._lock = threading.Lock()
+    
+    def all_taxes(self) -> List[dict]:
+        """Get every tax as Tax.to_dict() data, ordered by name"""
+        taxes, _ = self._tax_table()
+        return [dict(tax) for tax in sorted(taxes.values(), key=lambda tax: tax['name'])]
+    
+    def taxes_for_item(self, item_id: int) -> List[dict]:
+        """Get the Tax.to_dict() data of every tax linked to an item"""
+        return self.taxes_for_items([item_id])[item_id]
+    
+    def taxes_for_items(self, item_ids: Iterable[int]) -> Dict[int, List[dict]]:
+        """Get the Tax.to_dict() data of the taxes linked to each item, in one query at most"""
+        tax_ids_by_item = self._tax_ids(item_ids)
+        taxes, _ = self._tax_table(count=False)
+        return {
+            item_id: [dict(taxes[tax_id]) for tax_id in tax_ids if tax_id in taxes]
+            for item_id, tax_ids in tax_ids_by_item.items()
+        }
+    
+    def tax_rates(self, item_ids: Iterable[int]) -> Dict[int, Decimal]:
+        """Get the summed tax percentage of each item, in one query at most"""
+        tax_ids_by_item = self._tax_ids(item_ids)
+        _, rates = self._tax_table(count=False)
+        return {
+            item_id: sum((rates.get(tax_id, Decimal('0')) for tax_id in tax_ids), Decimal('0'))
+            for item_id, tax_ids in tax_ids_by_item.items()
+        }
+    
+    def clear(self):
+        """Drop every cached entry"""
+        with self._lock:
+            self._version = None
+            self._table = None
+            self._item_tax_ids = {}
+    
+    def stats(self) -> dict:
+        """Get hit/miss counters and the number of cached items"""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'taxes': len(self._table[0]) if self._table else 0,
+            'items': len(self._item_tax_ids)
+        }
+    
+    def _tax_table(self, count: bool = True) -> tuple:
+        """Get the cached (Tax.to_dict() data, amount) maps keyed by tax ID, loading on a miss"""
+        self._ensure_fresh()
+        table = self._table
+        if table is not None:
+            if count:
+                self.hits += 1
+            return table
+        
+        with self._lock:
+            if self._table is None:
+                if count:
+                    self.misses += 1
+                rows = Tax.query.all()
+                self._table = (
+                    {tax.id: tax.to_dict() for tax in rows},
+                    {tax.id: tax.amount for tax in rows}
+                )
+            return self._table
+    
+    def _tax_ids(self, item_ids: Iterable[int]) -> Dict[int, tuple]:
+        """Get the linked tax IDs of each item, reading missing items through"""
+        self._ensure_fresh()
+        cached = self._item_tax_ids
+        result, missing = {}, set()
+        for item_id in item_ids:
+            tax_ids = cached.get(item_id)
+            if tax_ids is None:
+                missing.add(item_id)
+            else:
+                result[item_id] = tax_ids
+        
+        self.hits += len(result)
+        if missing:
+            self.misses += len(missing)
+            loaded = {item_id: [] for item_id in missing}
+            for item_id, tax_id in db.session.query(item_taxes.c.item_id, item_taxes.c.tax_id).filter(
+                item_taxes.c.item_id.in_(missing)
+            ).order_by(item_taxes.c.item_id, item_taxes.c.tax_id):
+                loaded[item_id].append(tax_id)
+            
+            loaded = {item_id: tuple(tax_ids) for item_id, tax_ids in loaded.items()}
+            with self._lock:
+                if cached is self._item_tax_ids:
+                    cached.update(loaded)
+            result.update(loaded)
+        
+        return result
+    
+    def _ensure_fresh(self):
+        """Drop everything if taxes or item links changed or the TTL expired"""
+        version = (model_versions.get(Tax), model_versions.get(item_taxes.name))
+        if version == self._version and time.monotonic() - self._loaded_at < self.ttl:
+            return
+        
+        with self._lock:
+            if version == self._version and time.monotonic() - self._loaded_at < self.ttl:
+                return
+            self._table = None
+            self._item_tax_ids = {}
+            self._version = version
+            self._loaded_at = time.monotonic()
+
+
+# Shared catalog used by models, repositories and routes
+tax_catalog = TaxCatalog()
@@ -1,12 +1,20 @@
 """
 Customer Routes
 """
-from flask import jsonify, request
+from flask import current_app, jsonify, request
 from app.routes.api.v1 import api_v1_bp
 from app.services.customer_service import customer_service
+from app.utils.asgi import run_sync
+from app.utils.bulk import read_bulk_rows
+from app.utils.columnar import list_response, wants_columnar
+from app.utils.etags import compute_etag, etag_response, is_not_modified, not_modified
+from app.utils.fieldsets import parse_fieldset
 from flask_jwt_extended import jwt_required
 
 
+CUSTOMER_FIELDS = ('id', 'name', 'email', 'phone', 'created_at', 'updated_at')
+
+
 @api_v1_bp.route('/customers', methods=['POST'])
 @jwt_required()
 def create_customer():
@@ -40,37 +48,139 @@ def create_customer():
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@api_v1_bp.route('/customers/import', methods=['POST'])
+@jwt_required()
+def import_customers():
+    """
+    Create many customers in one request
+    
+    Request body:
+        JSON array, NDJSON (Content-Type: application/x-ndjson) or CSV with
+        a header row (Content-Type: text/csv); columns: name, email, phone
+    
+    Response:
+        results: One entry per row, in order, with index and success plus
+                 id, or error
+        created, failed: Row counts
+    """
+    try:
+        rows = read_bulk_rows(request, current_app.config['IMPORT_MAX_ROWS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = customer_service.import_customers(rows)
+    created = sum(1 for result in results if result['success'])
+    
+    return jsonify({
+        'results': results,
+        'created': created,
+        'failed': len(results) - created
+    }), 200
+
+
 @api_v1_bp.route('/customers', methods=['GET'])
 @jwt_required()
-def get_customers():
+async def get_customers():
     """
     Get all customers with pagination
     Query params: page (default: 1), per_page (default: 20)
+    
+    Cursor mode: pass cursor (empty for the first page) instead of page,
+    and with_total=true to also get the total count
+    
+    count: exact, estimate or cached (defaults to PAGINATION_COUNT_STRATEGY);
+    total_exact in the response tells whether total is estimated
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned); other columns are not selected
+    
+    format=columnar (or Accept: application/vnd.wave.columnar+json)
+    returns {"columns": [...], "rows": [[...]]} instead of customers
+    
+    Async view: pages are read on the async session (cursor mode runs in
+    a thread); under asgi.py it runs on the event loop (see AsgiApp)
     """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count_strategy = request.args.get('count')
+    columnar = wants_columnar()
+    
+    try:
+        fieldset = parse_fieldset(request.args, CUSTOMER_FIELDS, columnar=columnar)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    customers, total = customer_service.get_all_customers(page, per_page)
+    if 'cursor' in request.args:
+        try:
+            customers, next_cursor, total = await run_sync(
+                customer_service.get_all_customers_cursor,
+                request.args.get('cursor') or None,
+                per_page,
+                with_total=request.args.get('with_total', '').lower() in ('1', 'true'),
+                count_strategy=count_strategy,
+                fieldset=fieldset,
+                columnar=columnar
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return list_response(
+            'customers', customers, (total, next_cursor, fieldset and fieldset.key),
+            total=total,
+            total_exact=total.exact if total is not None else None,
+            per_page=per_page,
+            next_cursor=next_cursor
+        )
     
-    return jsonify({
-        'customers': customers,
-        'total': total,
-        'page': page,
-        'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
-    }), 200
+    try:
+        customers, total = await customer_service.get_all_customers_async(
+            page, per_page, count_strategy, fieldset, columnar
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return list_response(
+        'customers', customers, (total, fieldset and fieldset.key),
+        total=total,
+        total_exact=total.exact,
+        page=page,
+        per_page=per_page,
+        total_pages=(total + per_page - 1) // per_page
+    )
 
 
 @api_v1_bp.route('/customers/<int:customer_id>', methods=['GET'])
 @jwt_required()
 def get_customer(customer_id):
-    """Get customer by ID"""
-    customer = customer_service.get_customer_by_id(customer_id)
+    """
+    Get customer by ID
     
+    Sends a strong ETag; a matching If-None-Match gets 304 after a single
+    version query, without building the payload
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned)
+    """
+    try:
+        fieldset = parse_fieldset(request.args, CUSTOMER_FIELDS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    version = customer_service.get_customer_version(customer_id)
+    if version is None:
+        return jsonify({'error': 'Customer not found'}), 404
+    
+    etag = compute_etag('customer', *version)
+    if fieldset:
+        etag = compute_etag(etag, fieldset.key)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    
+    customer = customer_service.get_customer_by_id(customer_id, fieldset)
     if not customer:
         return jsonify({'error': 'Customer not found'}), 404
     
-    return jsonify({'customer': customer}), 200
+    return etag_response({'customer': customer}, etag)
 
 
 @api_v1_bp.route('/customers/<int:customer_id>', methods=['PUT'])
@@ -108,17 +218,24 @@ def delete_customer(customer_id):
 @jwt_required()
 def search_customers():
     """
-    Search customers by name
-    Query params: name (required)
+    Search customers by name, best matches first
+    Query params: name (required), limit (default: 20), cursor (optional)
     """
     name_pattern = request.args.get('name', '')
+    limit = request.args.get('limit', 20, type=int)
     
     if not name_pattern:
         return jsonify({'error': 'Name search pattern is required'}), 400
     
-    customers = customer_service.search_customers(name_pattern)
+    try:
+        customers, next_cursor = customer_service.search_customers(
+            name_pattern, limit, request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'customers': customers,
-        'count': len(customers)
+        'count': len(customers),
+        'next_cursor': next_cursor
     }), 200
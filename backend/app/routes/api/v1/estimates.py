@@ -1,11 +1,23 @@
 """
 Estimate Routes
 """
-from flask import jsonify, request
+from flask import Response, current_app, jsonify, request, stream_with_context
 from app.routes.api.v1 import api_v1_bp
 from app.services.estimate_service import estimate_service
+from app.utils.asgi import run_sync
+from app.utils.bulk import read_bulk_rows
+from app.utils.columnar import list_response, wants_columnar
+from app.utils.etags import compute_etag, etag_response, is_not_modified, not_modified
+from app.utils.export import EXPORT_MIMETYPES, csv_chunks, ndjson_chunks
+from app.utils.fieldsets import parse_fieldset
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
+ESTIMATE_FIELDS = (
+    'id', 'estimate_number', 'customer_id', 'user_id', 'date', 'valid_until',
+    'footer_note', 'status', 'created_at', 'updated_at', 'total'
+)
+ESTIMATE_INCLUDES = ('customer', 'items')
+
 
 @api_v1_bp.route('/estimates', methods=['POST'])
 @jwt_required()
@@ -44,23 +56,137 @@ def create_estimate():
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@api_v1_bp.route('/estimates/bulk', methods=['POST'])
+@jwt_required()
+def create_estimates_bulk():
+    """
+    Create many estimates in one request
+    
+    Request body:
+        JSON array of estimates, or NDJSON (Content-Type:
+        application/x-ndjson) with one estimate per line; each estimate
+        takes the same fields as POST /estimates
+    
+    Response:
+        results: One entry per row, in order, with index and success plus
+                 estimate_id and estimate_number, or error
+        created, failed: Row counts
+    """
+    current_user_id = get_jwt_identity()
+    
+    try:
+        rows = read_bulk_rows(request, current_app.config['BULK_MAX_ROWS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = estimate_service.create_estimates_bulk(int(current_user_id), rows)
+    created = sum(1 for result in results if result['success'])
+    
+    return jsonify({
+        'results': results,
+        'created': created,
+        'failed': len(results) - created
+    }), 200
+
+
+ESTIMATE_CSV_FIELDS = [
+    'id', 'estimate_number', 'date', 'valid_until', 'status', 'customer_id',
+    'customer_name', 'item_count', 'total', 'footer_note', 'created_at', 'updated_at'
+]
+
+
+@api_v1_bp.route('/estimates/export', methods=['GET'])
+@jwt_required()
+def export_estimates():
+    """
+    Export every estimate of the current user as a streamed download
+    Query params: format (ndjson or csv, default: ndjson)
+    
+    NDJSON rows are full estimates with items and total; CSV has one row
+    per estimate with customer_name, item_count and total. Rows are read
+    through a server-side cursor and written chunk by chunk, so memory
+    does not grow with the number of estimates.
+    """
+    current_user_id = int(get_jwt_identity())
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_MIMETYPES:
+        return jsonify({'error': 'format must be ndjson or csv'}), 400
+    
+    chunks = estimate_service.export_user_estimates(current_user_id)
+    if export_format == 'csv':
+        body = csv_chunks((
+            [
+                dict(estimate,
+                     customer_name=estimate.get('customer', {}).get('name'),
+                     item_count=len(estimate['items']))
+                for estimate in estimates
+            ]
+            for estimates in chunks
+        ), ESTIMATE_CSV_FIELDS)
+    else:
+        body = ndjson_chunks(chunks)
+    
+    return Response(
+        stream_with_context(body),
+        mimetype=EXPORT_MIMETYPES[export_format],
+        headers={'Content-Disposition': f'attachment; filename=estimates.{export_format}'}
+    )
+
+
 @api_v1_bp.route('/estimates/<int:estimate_id>', methods=['GET'])
 @jwt_required()
 def get_estimate(estimate_id):
-    """Get estimate by ID"""
-    estimate = estimate_service.get_estimate_by_id(estimate_id)
+    """
+    Get estimate by ID
     
-    if not estimate:
+    Sends a strong ETag; a matching If-None-Match gets 304 after a single
+    version query, without building the payload
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned; total does not need the items); include: comma-separated
+    customer and/or items (default: both)
+    """
+    try:
+        fieldset = parse_fieldset(request.args, ESTIMATE_FIELDS, ESTIMATE_INCLUDES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    version = estimate_service.get_estimate_version(estimate_id)
+    if version is None:
         return jsonify({'error': 'Estimate not found'}), 404
     
-    return jsonify({'estimate': estimate}), 200
+    etag = compute_etag('estimate', *version)
+    if fieldset:
+        etag = compute_etag(etag, fieldset.key)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    
+    if fieldset:
+        estimate = estimate_service.get_estimate_by_id(estimate_id, version, fieldset)
+        if not estimate:
+            return jsonify({'error': 'Estimate not found'}), 404
+        return etag_response({'estimate': estimate}, etag)
+    
+    # The cached JSON is sent as is, without decoding and re-encoding it
+    data = estimate_service.get_estimate_json(estimate_id, version)
+    if data is None:
+        return jsonify({'error': 'Estimate not found'}), 404
+    return etag_response(b'{"estimate":' + data + b'}', etag)
 
 
 @api_v1_bp.route('/estimates/number/<estimate_number>', methods=['GET'])
 @jwt_required()
 def get_estimate_by_number(estimate_number):
-    """Get estimate by estimate number"""
-    estimate = estimate_service.get_estimate_by_number(estimate_number)
+    """
+    Get estimate by estimate number
+    Query params: fields and include, as for GET /estimates/<id>
+    """
+    try:
+        fieldset = parse_fieldset(request.args, ESTIMATE_FIELDS, ESTIMATE_INCLUDES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    estimate = estimate_service.get_estimate_by_number(estimate_number, fieldset)
     
     if not estimate:
         return jsonify({'error': 'Estimate not found'}), 404
@@ -70,24 +196,77 @@ def get_estimate_by_number(estimate_number):
 
 @api_v1_bp.route('/estimates', methods=['GET'])
 @jwt_required()
-def get_user_estimates():
+async def get_user_estimates():
     """
     Get all estimates for the current user (from JWT token)
     Query params: page (default: 1), per_page (default: 20)
+    
+    Cursor mode: pass cursor (empty for the first page) instead of page,
+    and with_total=true to also get the total count
+    
+    count: exact, estimate or cached (defaults to PAGINATION_COUNT_STRATEGY);
+    total_exact in the response tells whether total is estimated
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned; total does not need the items); include: comma-separated
+    customer and/or items (default: both)
+    
+    format=columnar (or Accept: application/vnd.wave.columnar+json)
+    returns {"columns": [...], "rows": [[...]]} instead of estimates,
+    read straight from the estimate rows; include is not supported
+    
+    Async view: pages are read on the async session (cursor mode runs in
+    a thread); under asgi.py it runs on the event loop (see AsgiApp)
     """
     current_user_id = get_jwt_identity()
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count_strategy = request.args.get('count')
+    columnar = wants_columnar()
     
-    estimates, total = estimate_service.get_user_estimates(int(current_user_id), page, per_page)
+    try:
+        fieldset = parse_fieldset(request.args, ESTIMATE_FIELDS, ESTIMATE_INCLUDES, columnar=columnar)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'estimates': estimates,
-        'total': total,
-        'page': page,
-        'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
-    }), 200
+    if 'cursor' in request.args:
+        try:
+            estimates, next_cursor, total = await run_sync(
+                estimate_service.get_user_estimates_cursor,
+                int(current_user_id),
+                request.args.get('cursor') or None,
+                per_page,
+                with_total=request.args.get('with_total', '').lower() in ('1', 'true'),
+                count_strategy=count_strategy,
+                fieldset=fieldset,
+                columnar=columnar
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return list_response(
+            'estimates', estimates, (total, next_cursor, fieldset and fieldset.key),
+            total=total,
+            total_exact=total.exact if total is not None else None,
+            per_page=per_page,
+            next_cursor=next_cursor
+        )
+    
+    try:
+        estimates, total = await estimate_service.get_user_estimates_async(
+            int(current_user_id), page, per_page, count_strategy, fieldset, columnar
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return list_response(
+        'estimates', estimates, (total, fieldset and fieldset.key),
+        total=total,
+        total_exact=total.exact,
+        page=page,
+        per_page=per_page,
+        total_pages=(total + per_page - 1) // per_page
+    )
 
 
 @api_v1_bp.route('/customers/<int:customer_id>/estimates', methods=['GET'])
@@ -95,17 +274,34 @@ def get_user_estimates():
 def get_customer_estimates(customer_id):
     """
     Get all estimates for a customer
-    Query params: page (default: 1), per_page (default: 20)
+    Query params: page (default: 1), per_page (default: 20),
+    count (exact, estimate or cached)
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned; total does not need the items); include: comma-separated
+    customer and/or items (default: neither)
+    
+    format: columnar, as for GET /estimates
     """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    columnar = wants_columnar()
     
-    estimates, total = estimate_service.get_customer_estimates(customer_id, page, per_page)
+    try:
+        fieldset = parse_fieldset(
+            request.args, ESTIMATE_FIELDS, ESTIMATE_INCLUDES, default_include=(), columnar=columnar
+        )
+        estimates, total = estimate_service.get_customer_estimates(
+            customer_id, page, per_page, request.args.get('count'), fieldset, columnar
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'estimates': estimates,
-        'total': total,
-        'page': page,
-        'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
-    }), 200
+    return list_response(
+        'estimates', estimates, (total, fieldset and fieldset.key),
+        total=total,
+        total_exact=total.exact,
+        page=page,
+        per_page=per_page,
+        total_pages=(total + per_page - 1) // per_page
+    )
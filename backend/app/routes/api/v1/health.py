@@ -4,14 +4,26 @@ Health Check Routes
 from flask import jsonify
 from app.routes.api.v1 import api_v1_bp
 from app.extensions import db
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.metrics import pool_status
+from app.utils.payload_cache import payload_cache
+
+# Pool saturation from which the status is reported as degraded
+POOL_SATURATION_DEGRADED = 0.9
 
 
 @api_v1_bp.route('/health', methods=['GET'])
 def health_check():
     """
     Health check endpoint
-    Returns the status of the API and database connection
+    Returns the status of the API and database connection, connection
+    pool usage, and cache hit/miss counters; status is degraded while the
+    pool is nearly exhausted
     """
+    # Measured before the check below takes a connection of its own
+    pool = pool_status(db.engine)
+    degraded = (pool.get('saturation') or 0) >= POOL_SATURATION_DEGRADED
+    
     try:
         # Check database connection
         db.session.execute(db.text('SELECT 1'))
@@ -20,8 +32,13 @@ def health_check():
         db_status = f'unhealthy: {str(e)}'
     
     return jsonify({
-        'status': 'healthy',
+        'status': 'degraded' if degraded else 'healthy',
         'database': db_status,
+        'pool': pool,
+        'caches': {
+            'tax_catalog': tax_catalog.stats(),
+            'payloads': payload_cache.stats()
+        },
         'service': 'wave-api',
         'version': '1.0.0'
     }), 200
@@ -1,11 +1,19 @@
 """
 Item Routes
 """
-from flask import jsonify, request
+from flask import current_app, jsonify, request
 from app.routes.api.v1 import api_v1_bp
 from app.services.item_service import item_service
+from app.utils.asgi import run_sync
+from app.utils.bulk import read_bulk_rows
+from app.utils.columnar import list_response, wants_columnar
+from app.utils.etags import compute_etag, etag_response, is_not_modified, not_modified
+from app.utils.fieldsets import parse_fieldset
 from flask_jwt_extended import jwt_required
 
+ITEM_FIELDS = ('id', 'name', 'description', 'price', 'created_at', 'updated_at')
+ITEM_INCLUDES = ('taxes',)
+
 
 @api_v1_bp.route('/items', methods=['POST'])
 @jwt_required()
@@ -41,37 +49,141 @@ def create_item():
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 
+@api_v1_bp.route('/items/import', methods=['POST'])
+@jwt_required()
+def import_items():
+    """
+    Create many items in one request
+    
+    Request body:
+        JSON array, NDJSON (Content-Type: application/x-ndjson) or CSV with
+        a header row (Content-Type: text/csv); columns: name, description,
+        price, tax_ids (separated by ';' in CSV)
+    
+    Response:
+        results: One entry per row, in order, with index and success plus
+                 id, or error
+        created, failed: Row counts
+    """
+    try:
+        rows = read_bulk_rows(request, current_app.config['IMPORT_MAX_ROWS'])
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    results = item_service.import_items(rows)
+    created = sum(1 for result in results if result['success'])
+    
+    return jsonify({
+        'results': results,
+        'created': created,
+        'failed': len(results) - created
+    }), 200
+
+
 @api_v1_bp.route('/items', methods=['GET'])
 @jwt_required()
-def get_items():
+async def get_items():
     """
     Get all items with pagination
     Query params: page (default: 1), per_page (default: 20)
+    
+    Cursor mode: pass cursor (empty for the first page) instead of page,
+    and with_total=true to also get the total count
+    
+    count: exact, estimate or cached (defaults to PAGINATION_COUNT_STRATEGY);
+    total_exact in the response tells whether total is estimated
+    
+    fields: comma-separated fields to return (id and updated_at are always
+    returned); include: taxes or nothing (default: taxes)
+    
+    format=columnar (or Accept: application/vnd.wave.columnar+json)
+    returns {"columns": [...], "rows": [[...]]} instead of items, read
+    straight from the item rows; taxes cannot be included
+    
+    Async view: pages are read on the async session (cursor mode runs in
+    a thread); under asgi.py it runs on the event loop (see AsgiApp)
     """
     page = request.args.get('page', 1, type=int)
     per_page = request.args.get('per_page', 20, type=int)
+    count_strategy = request.args.get('count')
+    columnar = wants_columnar()
     
-    items, total = item_service.get_all_items(page, per_page)
+    try:
+        fieldset = parse_fieldset(request.args, ITEM_FIELDS, ITEM_INCLUDES, columnar=columnar)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
-    return jsonify({
-        'items': items,
-        'total': total,
-        'page': page,
-        'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
-    }), 200
+    if 'cursor' in request.args:
+        try:
+            items, next_cursor, total = await run_sync(
+                item_service.get_all_items_cursor,
+                request.args.get('cursor') or None,
+                per_page,
+                with_total=request.args.get('with_total', '').lower() in ('1', 'true'),
+                count_strategy=count_strategy,
+                fieldset=fieldset,
+                columnar=columnar
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        return list_response(
+            'items', items, (total, next_cursor, fieldset and fieldset.key),
+            total=total,
+            total_exact=total.exact if total is not None else None,
+            per_page=per_page,
+            next_cursor=next_cursor
+        )
+    
+    try:
+        items, total = await item_service.get_all_items_async(
+            page, per_page, count_strategy, fieldset, columnar
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return list_response(
+        'items', items, (total, fieldset and fieldset.key),
+        total=total,
+        total_exact=total.exact,
+        page=page,
+        per_page=per_page,
+        total_pages=(total + per_page - 1) // per_page
+    )
 
 
 @api_v1_bp.route('/items/<int:item_id>', methods=['GET'])
 @jwt_required()
 def get_item(item_id):
-    """Get item by ID"""
-    item = item_service.get_item_by_id(item_id)
+    """
+    Get item by ID
+    
+    Sends a strong ETag; a matching If-None-Match gets 304 after a single
+    version query, without building the payload
     
+    fields: comma-separated fields to return (id and updated_at are always
+    returned); include: taxes or nothing (default: taxes)
+    """
+    try:
+        fieldset = parse_fieldset(request.args, ITEM_FIELDS, ITEM_INCLUDES)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    version = item_service.get_item_version(item_id)
+    if version is None:
+        return jsonify({'error': 'Item not found'}), 404
+    
+    etag = compute_etag('item', *version)
+    if fieldset:
+        etag = compute_etag(etag, fieldset.key)
+    if is_not_modified(etag):
+        return not_modified(etag)
+    
+    item = item_service.get_item_by_id(item_id, fieldset)
     if not item:
         return jsonify({'error': 'Item not found'}), 404
     
-    return jsonify({'item': item}), 200
+    return etag_response({'item': item}, etag)
 
 
 @api_v1_bp.route('/items/<int:item_id>', methods=['PUT'])
@@ -109,17 +221,24 @@ def delete_item(item_id):
 @jwt_required()
 def search_items():
     """
-    Search items by name
-    Query params: name (required)
+    Search items by name, best matches first
+    Query params: name (required), limit (default: 20), cursor (optional)
     """
     name_pattern = request.args.get('name', '')
+    limit = request.args.get('limit', 20, type=int)
     
     if not name_pattern:
         return jsonify({'error': 'Name search pattern is required'}), 400
     
-    items = item_service.search_items(name_pattern)
+    try:
+        items, next_cursor = item_service.search_items(
+            name_pattern, limit, request.args.get('cursor')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
         'items': items,
-        'count': len(items)
+        'count': len(items),
+        'next_cursor': next_cursor
     }), 200
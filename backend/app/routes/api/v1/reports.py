@@ -0,0 +1,38 @@
+"""
+Report Routes
+"""
+from flask import jsonify, request
+from app.routes.api.v1 import api_v1_bp
+from app.services.estimate_service import estimate_service
+from flask_jwt_extended import jwt_required, get_jwt_identity
+
+
+@api_v1_bp.route('/reports/estimates', methods=['GET'])
+@jwt_required()
+def get_estimate_report():
+    """
+    Get the current user's estimate value aggregated per group
+    Query params: group_by (status, month, customer or user; default:
+    status), date_from and date_to (YYYY-MM-DD, inclusive); user_id, if
+    given, must be the current user's (403 otherwise)
+    
+    Response:
+        groups: key, label, count, total, average, acceptance_rate, share
+                of the overall total and running_total, ordered by key
+        totals: count, total, average and acceptance_rate over all groups
+    """
+    current_user_id = int(get_jwt_identity())
+    if request.args.get('user_id', current_user_id, type=int) != current_user_id:
+        return jsonify({'error': "Reports on other users' estimates are not allowed"}), 403
+    
+    try:
+        report = estimate_service.get_estimate_report(
+            current_user_id,
+            request.args.get('group_by', 'status'),
+            request.args.get('date_from'),
+            request.args.get('date_to')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify(report), 200
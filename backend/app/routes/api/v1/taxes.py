@@ -3,7 +3,7 @@ Tax Routes
 """
 from flask import jsonify
 from app.routes.api.v1 import api_v1_bp
-from app.models.tax import Tax
+from app.repositories.tax_catalog import tax_catalog
 from flask_jwt_extended import jwt_required
 
 
@@ -12,10 +12,9 @@ from flask_jwt_extended import jwt_required
 def get_taxes():
     """
     Get all available taxes
-    No pagination needed as taxes are typically few in number
+    No pagination needed as taxes are typically few in number;
+    served from the tax catalog cache
     """
-    taxes = Tax.query.order_by(Tax.name).all()
-    
     return jsonify({
-        'taxes': [tax.to_dict() for tax in taxes]
+        'taxes': tax_catalog.all_taxes()
     }), 200
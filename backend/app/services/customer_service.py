@@ -3,7 +3,14 @@ Customer Service
 Business logic for customer operations
 """
 from typing import Optional, List, Dict, Any
+from flask import current_app
+from app.extensions import async_db
+from app.models.customer import Customer
+from app.repositories.async_base_repository import AsyncBaseRepository
 from app.repositories.customer_repository import CustomerRepository
+from app.utils.asgi import run_sync
+from app.utils.bulk import save_error, save_in_chunks
+from app.utils.fieldsets import Fieldset
 
 
 class CustomerService:
@@ -12,6 +19,7 @@ class CustomerService:
     def __init__(self):
         """Initialize service with repository"""
         self.customer_repository = CustomerRepository()
+        self.async_customer_repository = AsyncBaseRepository(Customer)
     
     def create_customer(self, data: Dict[str, Any]) -> Dict:
         """
@@ -51,20 +59,165 @@ class CustomerService:
         
         return customer.to_dict()
     
-    def get_customer_by_id(self, customer_id: int) -> Optional[Dict]:
-        """Get customer by ID"""
-        customer = self.customer_repository.get_by_id(customer_id)
-        return customer.to_dict() if customer else None
+    def import_customers(self, rows: List[Any], chunk_size: Optional[int] = None) -> List[Dict]:
+        """
+        Create many customers, reporting success or failure per row
+        
+        Email uniqueness is checked for all rows with one set query, and
+        an email repeated within the import is only accepted the first
+        time. Valid rows are loaded in transactions of chunk_size rows.
+        
+        Args:
+            rows: Customer data dicts with name, email, phone
+            chunk_size: Rows per transaction (defaults to IMPORT_CHUNK_SIZE)
+        
+        Returns:
+            One result dict per row, in input order, with index and success
+            plus id, or error
+        """
+        from app.utils.validators import validate_email
+        
+        chunk_size = chunk_size or current_app.config['IMPORT_CHUNK_SIZE']
+        results = [None] * len(rows)
+        
+        def fail(index, error):
+            results[index] = {'index': index, 'success': False, 'error': str(error)}
+        
+        parsed = []
+        for index, data in enumerate(rows):
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError('Customer must be a JSON object')
+                if not data.get('name'):
+                    raise ValueError('Customer name is required')
+                if not data.get('email'):
+                    raise ValueError('Customer email is required')
+                if not validate_email(data['email']):
+                    raise ValueError('Invalid email format')
+                parsed.append((index, {
+                    'name': data['name'],
+                    'email': data['email'],
+                    'phone': data.get('phone')
+                }))
+            except (TypeError, ValueError) as e:
+                fail(index, e)
+        
+        taken_emails = self.customer_repository.existing_emails(row['email'] for _, row in parsed)
+        ready = []
+        for index, row in parsed:
+            if row['email'] in taken_emails:
+                fail(index, 'Customer with this email already exists')
+            else:
+                taken_emails.add(row['email'])
+                ready.append((index, row))
+        
+        for index, outcome in save_in_chunks(ready, chunk_size, self.customer_repository.bulk_create):
+            if isinstance(outcome, Exception):
+                fail(index, save_error(outcome))
+            else:
+                results[index] = {'index': index, 'success': True, 'id': outcome}
+        
+        return results
     
-    def get_all_customers(self, page: int = 1, per_page: int = 20) -> tuple[List[Dict], int]:
-        """Get paginated list of customers"""
+    def get_customer_by_id(self, customer_id: int, fieldset: Optional[Fieldset] = None) -> Optional[Dict]:
+        """Get customer by ID (fieldset defaults to every field)"""
+        customer = self.customer_repository.get_by_id(customer_id, fieldset.columns() if fieldset else None)
+        return customer.to_dict(fields=fieldset.fields if fieldset else None) if customer else None
+    
+    def get_customer_version(self, customer_id: int) -> Optional[tuple]:
+        """Get the version values a customer ETag is computed from (None if not found)"""
+        return self.customer_repository.get_version(customer_id)
+    
+    def get_all_customers(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        Get paginated list of customers (fieldset defaults to every field)
+        
+        With columnar, the page is a Table of the fieldset's fields read
+        straight from the customer rows.
+        """
         customers, total = self.customer_repository.get_paginated(
             page=page,
             per_page=per_page,
             order_by='name',
-            desc=False
+            desc=False,
+            count_strategy=count_strategy,
+            columns=fieldset.columns() if fieldset else None,
+            as_rows=columnar
         )
-        return [customer.to_dict() for customer in customers], total
+        if columnar:
+            return customers, total
+        
+        fields = fieldset.fields if fieldset else None
+        return [customer.to_dict(fields=fields) for customer in customers], total
+    
+    async def get_all_customers_async(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        get_all_customers with its queries on the async session
+        
+        Without an async engine, runs get_all_customers in the request's
+        thread instead.
+        """
+        if not async_db.available:
+            return await run_sync(self.get_all_customers, page, per_page, count_strategy, fieldset, columnar)
+        
+        customers, total = await self.async_customer_repository.get_paginated(
+            page=page,
+            per_page=per_page,
+            order_by='name',
+            desc=False,
+            count_strategy=count_strategy,
+            columns=fieldset.columns() if fieldset else None,
+            as_rows=columnar
+        )
+        if columnar:
+            return customers, total
+        
+        fields = fieldset.fields if fieldset else None
+        return [customer.to_dict(fields=fields) for customer in customers], total
+    
+    def get_all_customers_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], Optional[str], Optional[int]]:
+        """
+        Get customers using cursor pagination
+        
+        fieldset defaults to every field; see get_all_customers for columnar.
+        """
+        customers, next_cursor, total = self.customer_repository.get_cursor_paginated(
+            cursor=cursor,
+            per_page=per_page,
+            order_by='name',
+            desc=False,
+            with_total=with_total,
+            count_strategy=count_strategy,
+            columns=fieldset.columns() if fieldset else None,
+            as_rows=columnar
+        )
+        if columnar:
+            return customers, next_cursor, total
+        
+        fields = fieldset.fields if fieldset else None
+        return [customer.to_dict(fields=fields) for customer in customers], next_cursor, total
     
     def update_customer(self, customer_id: int, data: Dict[str, Any]) -> Optional[Dict]:
         """Update customer information"""
@@ -94,10 +247,15 @@ class CustomerService:
         """Delete a customer"""
         return self.customer_repository.delete(customer_id)
     
-    def search_customers(self, name_pattern: str) -> List[Dict]:
-        """Search customers by name"""
-        customers = self.customer_repository.search_by_name(name_pattern)
-        return [customer.to_dict() for customer in customers]
+    def search_customers(
+        self,
+        name_pattern: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[List[Dict], Optional[str]]:
+        """Search customers by name, best matches first"""
+        customers, next_cursor = self.customer_repository.search_by_name(name_pattern, limit, cursor)
+        return [customer.to_dict() for customer in customers], next_cursor
 
 
 # Create singleton instance
@@ -2,12 +2,20 @@
 Estimate Service
 Business logic for estimate operations
 """
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from datetime import datetime, timedelta
-from app.repositories.estimate_repository import EstimateRepository
-from app.repositories.user_repository import UserRepository
-from app.models.customer import Customer
-from app.models.item import Item
+from flask import current_app
+from app.extensions import async_db
+from app.repositories.async_estimate_repository import AsyncEstimateRepository
+from app.repositories.estimate_repository import REPORT_GROUPS, EstimateRepository
+from app.repositories.customer_repository import CustomerRepository
+from app.repositories.item_repository import ItemRepository
+from app.utils.asgi import run_sync
+from app.utils.bulk import save_error, save_in_chunks
+from app.utils.columnar import Table
+from app.utils.etags import compute_etag
+from app.utils.fieldsets import Fieldset
+from app.utils.payload_cache import payload_cache
 
 
 class EstimateService:
@@ -16,6 +24,9 @@ class EstimateService:
     def __init__(self):
         """Initialize service with repositories"""
         self.estimate_repository = EstimateRepository()
+        self.async_estimate_repository = AsyncEstimateRepository()
+        self.customer_repository = CustomerRepository()
+        self.item_repository = ItemRepository()
     
     def create_estimate(self, user_id: int, data: Dict[str, Any]) -> Dict:
         """
@@ -39,42 +50,133 @@ class EstimateService:
             raise ValueError('At least one item is required')
         
         # Validate customer exists
-        customer = Customer.query.get(data['customer_id'])
+        customer = self.customer_repository.get_by_id(data['customer_id'])
         if not customer:
             raise ValueError('Customer not found')
         
-        # Validate items exist and prepare items data
-        items_data = []
-        for item_input in data['items']:
-            if 'item_id' not in item_input:
-                raise ValueError('Item ID is required for each item')
-            
-            item = Item.query.get(item_input['item_id'])
-            if not item:
-                raise ValueError(f'Item with ID {item_input["item_id"]} not found')
-            
-            # Use provided unit_price or item's current price
-            unit_price = item_input.get('unit_price', item.price)
-            quantity = item_input.get('quantity', 1)
-            
-            if quantity <= 0:
-                raise ValueError('Quantity must be greater than 0')
-            
-            items_data.append({
-                'item_id': item.id,
-                'quantity': quantity,
-                'unit_price': unit_price
-            })
+        # Validate all items with one query and prepare items data
+        lines = self._merge_item_lines(data['items'])
+        items_by_id = {item.id: item for item in self.item_repository.get_by_ids(lines)}
+        items_data = self._resolve_item_lines(lines, items_by_id)
         
-        # Generate estimate number if not provided
+        # Estimate number is allocated on insert if not provided
         estimate_number = data.get('estimate_number')
-        if not estimate_number:
-            estimate_number = self.estimate_repository.generate_estimate_number()
-        else:
+        if estimate_number:
             # Check if estimate number already exists
             if self.estimate_repository.estimate_number_exists(estimate_number):
                 raise ValueError('Estimate number already exists')
         
+        estimate_data = self._build_estimate_data(user_id, data)
+        
+        # Create estimate with items
+        estimate = self.estimate_repository.create_estimate_with_items(
+            estimate_data,
+            items_data
+        )
+        
+        return self._serialize([estimate])[0]
+    
+    def create_estimates_bulk(
+        self,
+        user_id: int,
+        rows: List[Any],
+        chunk_size: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Create many estimates, reporting success or failure per row
+        
+        Every customer, item and requested estimate number across all rows
+        is checked with one set query each. Valid rows are then inserted in
+        chunks of chunk_size, one transaction per chunk (see
+        save_in_chunks).
+        
+        Args:
+            user_id: ID of the user creating the estimates
+            rows: Estimate data dicts, as accepted by create_estimate
+            chunk_size: Rows per transaction (defaults to BULK_CHUNK_SIZE)
+        
+        Returns:
+            One result dict per row, in input order, with index and success
+            plus estimate_id and estimate_number, or error
+        """
+        chunk_size = chunk_size or current_app.config['BULK_CHUNK_SIZE']
+        results = [None] * len(rows)
+        
+        def fail(index, error):
+            results[index] = {'index': index, 'success': False, 'error': str(error)}
+        
+        # Validate each row's shape and merge its lines
+        parsed = []
+        for index, data in enumerate(rows):
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError('Estimate must be a JSON object')
+                if 'customer_id' not in data:
+                    raise ValueError('Customer ID is required')
+                if not data.get('items'):
+                    raise ValueError('At least one item is required')
+                try:
+                    customer_id = int(data['customer_id'])
+                except (TypeError, ValueError):
+                    raise ValueError(f'Invalid customer ID: {data["customer_id"]}')
+                parsed.append((index, dict(data, customer_id=customer_id),
+                               self._merge_item_lines(data['items'])))
+            except (TypeError, ValueError) as e:
+                fail(index, e)
+        
+        # Look up everything the rows reference with one query per kind
+        customer_ids = {
+            customer.id for customer in
+            self.customer_repository.get_by_ids(data['customer_id'] for _, data, _ in parsed)
+        }
+        items_by_id = {
+            item.id: item for item in
+            self.item_repository.get_by_ids(item_id for _, _, lines in parsed for item_id in lines)
+        }
+        taken_numbers = self.estimate_repository.existing_estimate_numbers(
+            data['estimate_number'] for _, data, _ in parsed if data.get('estimate_number')
+        )
+        
+        ready = []
+        for index, data, lines in parsed:
+            try:
+                if data['customer_id'] not in customer_ids:
+                    raise ValueError('Customer not found')
+                items_data = self._resolve_item_lines(lines, items_by_id)
+                estimate_number = data.get('estimate_number')
+                if estimate_number:
+                    if estimate_number in taken_numbers:
+                        raise ValueError('Estimate number already exists')
+                    taken_numbers.add(estimate_number)
+                ready.append((index, self._build_estimate_data(user_id, data), items_data))
+            except (TypeError, ValueError) as e:
+                fail(index, e)
+        
+        saved = save_in_chunks(
+            [(index, (estimate_data, items_data)) for index, estimate_data, items_data in ready],
+            chunk_size,
+            self.estimate_repository.create_estimates_with_items
+        )
+        for index, outcome in saved:
+            if isinstance(outcome, Exception):
+                fail(index, save_error(outcome))
+            else:
+                results[index] = {
+                    'index': index,
+                    'success': True,
+                    'estimate_id': outcome[0],
+                    'estimate_number': outcome[1]
+                }
+        
+        return results
+    
+    def _build_estimate_data(self, user_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build estimate column values from request data, applying date defaults
+        
+        Raises:
+            ValueError: If a date is not in ISO format
+        """
         # Set dates
         estimate_date = data.get('date')
         if estimate_date:
@@ -91,9 +193,8 @@ class EstimateService:
             # Default: valid for 30 days
             valid_until = (datetime.utcnow() + timedelta(days=30)).date()
         
-        # Prepare estimate data
-        estimate_data = {
-            'estimate_number': estimate_number,
+        return {
+            'estimate_number': data.get('estimate_number'),
             'customer_id': data['customer_id'],
             'user_id': user_id,
             'date': estimate_date,
@@ -101,34 +202,397 @@ class EstimateService:
             'footer_note': data.get('footer_note'),
             'status': data.get('status', 'draft')
         }
+    
+    def _merge_item_lines(self, items_input: List[Dict[str, Any]]) -> Dict[int, Dict[str, Any]]:
+        """
+        Validate requested lines and merge duplicate item IDs
         
-        # Create estimate with items
-        estimate = self.estimate_repository.create_estimate_with_items(
-            estimate_data,
-            items_data
+        Lines for the same item are merged by adding their quantities when
+        they agree on unit_price; conflicting prices are rejected up front.
+        
+        Returns:
+            Dict mapping item ID to {'quantity', 'unit_price'} (unit_price
+            is None when the item's current price should be used)
+        
+        Raises:
+            ValueError: If a line is invalid
+        """
+        lines = {}
+        for item_input in items_input:
+            if 'item_id' not in item_input:
+                raise ValueError('Item ID is required for each item')
+            
+            try:
+                item_id = int(item_input['item_id'])
+            except (TypeError, ValueError):
+                raise ValueError(f'Invalid item ID: {item_input["item_id"]}')
+            
+            quantity = item_input.get('quantity', 1)
+            if quantity <= 0:
+                raise ValueError('Quantity must be greater than 0')
+            
+            unit_price = item_input.get('unit_price')
+            if item_id in lines:
+                if lines[item_id]['unit_price'] != unit_price:
+                    raise ValueError(
+                        f'Item with ID {item_id} is listed more than once with different unit prices'
+                    )
+                lines[item_id]['quantity'] += quantity
+            else:
+                lines[item_id] = {'quantity': quantity, 'unit_price': unit_price}
+        
+        return lines
+    
+    def _resolve_item_lines(self, lines: Dict[int, Dict[str, Any]], items_by_id: Dict[int, Any]) -> List[Dict]:
+        """
+        Check merged lines against fetched items and fill default prices
+        
+        Raises:
+            ValueError: Listing every item ID that does not exist
+        """
+        missing = [item_id for item_id in lines if item_id not in items_by_id]
+        if missing:
+            raise ValueError(f'Items not found: {", ".join(str(item_id) for item_id in missing)}')
+        
+        return [
+            {
+                'item_id': item_id,
+                'quantity': line['quantity'],
+                # Use provided unit_price or item's current price
+                'unit_price': (
+                    line['unit_price'] if line['unit_price'] is not None else items_by_id[item_id].price
+                )
+            }
+            for item_id, line in lines.items()
+        ]
+    
+    def get_estimate_by_id(
+        self,
+        estimate_id: int,
+        version: Optional[tuple] = None,
+        fieldset: Optional[Fieldset] = None
+    ) -> Optional[Dict]:
+        """
+        Get estimate by ID
+        
+        The full estimate goes through the payload cache (see
+        get_estimate_json); a fieldset is read straight from the database,
+        loading only what it needs.
+        
+        Args:
+            estimate_id: ID of the estimate
+            version: Result of get_estimate_version, if the caller has it
+            fieldset: Fields and includes to return (everything if None)
+        
+        Returns:
+            Estimate data, or None if not found
+        """
+        if fieldset is not None:
+            columns, options = self._read_options(fieldset)
+            estimate = self.estimate_repository.get_by_id(estimate_id, columns)
+            return self._serialize([estimate], **options)[0] if estimate else None
+        
+        data = self.get_estimate_json(estimate_id, version)
+        return current_app.json.loads(data) if data is not None else None
+    
+    def get_estimate_json(self, estimate_id: int, version: Optional[tuple] = None) -> Optional[bytes]:
+        """
+        Get the full serialized estimate as JSON bytes
+        
+        Cached per version (see payload_cache), so a hit costs only the
+        version query and is neither decoded nor encoded again.
+        
+        Args:
+            estimate_id: ID of the estimate
+            version: Result of get_estimate_version, if the caller has it
+        
+        Returns:
+            JSON bytes of the estimate data, or None if not found
+        """
+        if version is None:
+            version = self.estimate_repository.get_version(estimate_id)
+            if version is None:
+                return None
+        
+        def build():
+            estimate = self.estimate_repository.get_by_id(estimate_id)
+            return self._serialize([estimate])[0] if estimate else None
+        
+        return payload_cache.get_or_build('estimates', estimate_id, compute_etag(*version), build)
+    
+    def get_estimate_version(self, estimate_id: int) -> Optional[tuple]:
+        """Get the version values an estimate ETag is computed from (None if not found)"""
+        return self.estimate_repository.get_version(estimate_id)
+    
+    def get_estimate_by_number(self, estimate_number: str, fieldset: Optional[Fieldset] = None) -> Optional[Dict]:
+        """Get estimate by estimate number, through the same paths as get_estimate_by_id"""
+        estimate_id = self.estimate_repository.get_id_by_number(estimate_number)
+        if estimate_id is None:
+            return None
+        return self.get_estimate_by_id(estimate_id, fieldset=fieldset)
+    
+    def get_customer_estimates(
+        self,
+        customer_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        Get all estimates for a customer (without customer and items unless a fieldset includes them)
+        
+        With columnar, the page is a Table of the fieldset's fields read
+        straight from the estimate rows.
+        """
+        if columnar:
+            table, total = self.estimate_repository.get_by_customer(
+                customer_id, page, per_page, count_strategy, fieldset.columns() if fieldset else None, as_rows=True
+            )
+            return self._fill_totals(table), total
+        
+        fieldset = fieldset or Fieldset()
+        columns, options = self._read_options(fieldset)
+        estimates, total = self.estimate_repository.get_by_customer(
+            customer_id, page, per_page, count_strategy, columns
         )
+        return self._serialize(estimates, **options), total
+    
+    def get_user_estimates(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """Get all estimates for a user (fieldset defaults to everything; see get_customer_estimates for columnar)"""
+        if columnar:
+            table, total = self.estimate_repository.get_by_user(
+                user_id, page, per_page, count_strategy, fieldset.columns() if fieldset else None, as_rows=True
+            )
+            return self._fill_totals(table), total
         
-        return estimate.to_dict(include_items=True, include_customer=True)
+        columns, options = self._read_options(fieldset)
+        estimates, total = self.estimate_repository.get_by_user(
+            user_id, page, per_page, count_strategy, columns
+        )
+        return self._serialize(estimates, **options), total
     
-    def get_estimate_by_id(self, estimate_id: int) -> Optional[Dict]:
-        """Get estimate by ID"""
-        estimate = self.estimate_repository.get_by_id(estimate_id)
-        return estimate.to_dict(include_items=True, include_customer=True) if estimate else None
+    async def get_user_estimates_async(
+        self,
+        user_id: int,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        get_user_estimates with its queries on the async session
+        
+        Without an async engine, runs get_user_estimates in the request's
+        thread instead.
+        """
+        if not async_db.available:
+            return await run_sync(
+                self.get_user_estimates, user_id, page, per_page, count_strategy, fieldset, columnar
+            )
+        
+        if columnar:
+            table, total = await self.async_estimate_repository.get_by_user(
+                user_id, page, per_page, count_strategy, fieldset.columns() if fieldset else None, as_rows=True
+            )
+            return await run_sync(self._fill_totals, table), total
+        
+        columns, options = self._read_options(fieldset)
+        estimates, total = await self.async_estimate_repository.get_by_user(
+            user_id, page, per_page, count_strategy, columns
+        )
+        include_items = options.get('include_items', True)
+        hydrated = await self.async_estimate_repository.hydrate(
+            estimates, include_items, options.get('include_customer', True),
+            self._needs_total(include_items, options.get('fields'))
+        )
+        return self._to_dicts(estimates, hydrated, **options), total
+    
+    def get_user_estimates_cursor(
+        self,
+        user_id: int,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], Optional[str], Optional[int]]:
+        """Get estimates for a user using cursor pagination (fieldset defaults to everything)"""
+        if columnar:
+            table, next_cursor, total = self.estimate_repository.get_by_user_cursor(
+                user_id, cursor, per_page, with_total, count_strategy,
+                fieldset.columns() if fieldset else None, as_rows=True
+            )
+            return self._fill_totals(table), next_cursor, total
+        
+        columns, options = self._read_options(fieldset)
+        estimates, next_cursor, total = self.estimate_repository.get_by_user_cursor(
+            user_id, cursor, per_page, with_total, count_strategy, columns
+        )
+        return self._serialize(estimates, **options), next_cursor, total
     
-    def get_estimate_by_number(self, estimate_number: str) -> Optional[Dict]:
-        """Get estimate by estimate number"""
-        estimate = self.estimate_repository.get_by_estimate_number(estimate_number)
-        return estimate.to_dict(include_items=True, include_customer=True) if estimate else None
+    def export_user_estimates(
+        self,
+        user_id: int,
+        include_items: bool = True,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[List[Dict]]:
+        """
+        Serialize every estimate of a user, one chunk at a time
+        
+        Args:
+            user_id: ID of the user
+            include_items: Include lines and total
+            chunk_size: Rows per chunk (defaults to EXPORT_CHUNK_SIZE)
+        
+        Yields:
+            Lists of estimate data dicts
+        """
+        chunk_size = chunk_size or current_app.config['EXPORT_CHUNK_SIZE']
+        for estimates in self.estimate_repository.iter_by_user(user_id, chunk_size):
+            yield self._serialize(estimates, include_items=include_items)
+    
+    def get_estimate_report(
+        self,
+        user_id: int,
+        group_by: str = 'status',
+        date_from: Optional[str] = None,
+        date_to: Optional[str] = None
+    ) -> Dict:
+        """
+        Get a user's estimate count, value and acceptance rate per group
+        
+        Acceptance rate is accepted estimates over estimates that left
+        draft (sent, accepted or rejected); it is None when none did.
+        
+        Args:
+            user_id: User whose estimates are reported
+            group_by: status, month, customer or user
+            date_from: Earliest estimate date, YYYY-MM-DD (optional)
+            date_to: Latest estimate date, YYYY-MM-DD (optional)
+        
+        Returns:
+            Dict with groups (key, label, count, total, average,
+            acceptance_rate, share, running_total) and overall totals
+        
+        Raises:
+            ValueError: If group_by or a date is invalid
+        """
+        if group_by not in REPORT_GROUPS:
+            raise ValueError(f'group_by must be one of: {", ".join(REPORT_GROUPS)}')
+        
+        dates = {}
+        for name, value in (('date_from', date_from), ('date_to', date_to)):
+            try:
+                dates[name] = datetime.strptime(value, '%Y-%m-%d').date() if value else None
+            except ValueError:
+                raise ValueError(f'{name} must be a date in YYYY-MM-DD format')
+        if dates['date_from'] and dates['date_to'] and dates['date_from'] > dates['date_to']:
+            raise ValueError('date_from must not be after date_to')
+        
+        rows = self.estimate_repository.report(group_by, user_id=user_id, **dates)
+        
+        def money(value):
+            return round(float(value or 0), 2)
+        
+        def rate(accepted, offered):
+            return round(float(accepted) / float(offered), 4) if offered else None
+        
+        groups = [
+            {
+                'key': row.key,
+                'label': row.label,
+                'count': row.count,
+                'total': money(row.total),
+                'average': money(row.average),
+                'acceptance_rate': rate(row.accepted, row.offered),
+                'share': round(float(row.share), 4) if row.share is not None else None,
+                'running_total': money(row.running_total)
+            }
+            for row in rows
+        ]
+        
+        first = rows[0] if rows else None
+        count = int(first.grand_count) if first else 0
+        return {
+            'group_by': group_by,
+            'date_from': date_from,
+            'date_to': date_to,
+            'groups': groups,
+            'totals': {
+                'count': count,
+                'total': money(first.grand_total if first else 0),
+                'average': money(first.grand_total / count) if count else 0.0,
+                'acceptance_rate': rate(first.grand_accepted, first.grand_offered) if first else None
+            }
+        }
+    
+    def _read_options(self, fieldset: Optional[Fieldset]) -> tuple:
+        """
+        Columns to load and _serialize arguments for a fieldset
+        
+        Returns:
+            Tuple of (columns or None for all, keyword arguments for _serialize)
+        """
+        if fieldset is None:
+            return None, {}
+        
+        required = []
+        if fieldset.includes('customer'):
+            required.append('customer_id')
+        if fieldset.includes('items') or fieldset.wants('total'):
+            required.append('total')
+        
+        return fieldset.columns(*required), {
+            'include_items': fieldset.includes('items'),
+            'include_customer': fieldset.includes('customer'),
+            'fields': fieldset.fields
+        }
+    
+    def _fill_totals(self, table: Table) -> Table:
+        """Compute the totals a Table lacks because they are not materialized yet"""
+        if 'total' not in table.columns:
+            return table
+        
+        id_index, total_index = table.columns.index('id'), table.columns.index('total')
+        missing = [row for row in table.rows if row[total_index] is None]
+        if missing:
+            totals = self.estimate_repository.calculate_totals([row[id_index] for row in missing])
+            for row in missing:
+                row[total_index] = totals[row[id_index]]
+        return table
+    
+    def _serialize(self, estimates, include_items=True, include_customer=True, fields=None) -> List[Dict]:
+        """Serialize estimates using one page-level hydration pass"""
+        hydrated = self.estimate_repository.hydrate(
+            estimates, include_items, include_customer, self._needs_total(include_items, fields)
+        )
+        return self._to_dicts(estimates, hydrated, include_items, include_customer, fields)
     
-    def get_customer_estimates(self, customer_id: int, page: int = 1, per_page: int = 20) -> tuple[List[Dict], int]:
-        """Get all estimates for a customer"""
-        estimates, total = self.estimate_repository.get_by_customer(customer_id, page, per_page)
-        return [est.to_dict(include_items=False, include_customer=False) for est in estimates], total
+    @staticmethod
+    def _needs_total(include_items: bool, fields) -> bool:
+        """Whether the totals are wanted without the lines"""
+        return not include_items and fields is not None and 'total' in fields
     
-    def get_user_estimates(self, user_id: int, page: int = 1, per_page: int = 20) -> tuple[List[Dict], int]:
-        """Get all estimates for a user"""
-        estimates, total = self.estimate_repository.get_by_user(user_id, page, per_page)
-        return [est.to_dict(include_items=True, include_customer=True) for est in estimates], total
+    @staticmethod
+    def _to_dicts(estimates, hydrated, include_items=True, include_customer=True, fields=None) -> List[Dict]:
+        """Serialize hydrated estimates (see EstimateRepository.hydrate)"""
+        return [
+            est.to_dict(include_items=include_items, include_customer=include_customer,
+                        preloaded=hydrated[est.id], fields=fields)
+            for est in estimates
+        ]
 
 
 # Create singleton instance
@@ -2,9 +2,20 @@
 Item Service
 Business logic for item operations
 """
+from decimal import InvalidOperation
 from typing import Optional, List, Dict, Any
+from flask import current_app
+from app.extensions import async_db
+from app.models.item import Item
+from app.repositories.async_base_repository import AsyncBaseRepository
 from app.repositories.item_repository import ItemRepository
+from app.repositories.estimate_repository import EstimateRepository
 from app.models.tax import Tax
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.asgi import run_sync
+from app.utils.bulk import save_error, save_in_chunks
+from app.utils.fieldsets import Fieldset
+from app.utils.money import to_decimal
 
 
 class ItemService:
@@ -13,6 +24,8 @@ class ItemService:
     def __init__(self):
         """Initialize service with repository"""
         self.item_repository = ItemRepository()
+        self.async_item_repository = AsyncBaseRepository(Item)
+        self.estimate_repository = EstimateRepository()
     
     def create_item(self, data: Dict[str, Any]) -> Dict:
         """
@@ -66,15 +79,163 @@ class ItemService:
         
         return item.to_dict(include_taxes=True)
     
-    def get_item_by_id(self, item_id: int) -> Optional[Dict]:
-        """Get item by ID"""
-        item = self.item_repository.get_by_id(item_id)
-        return item.to_dict(include_taxes=True) if item else None
+    def import_items(self, rows: List[Any], chunk_size: Optional[int] = None) -> List[Dict]:
+        """
+        Create many items, reporting success or failure per row
+        
+        Tax IDs referenced by all rows are resolved with one query. Valid
+        rows are loaded, with their tax links, in transactions of
+        chunk_size rows.
+        
+        Args:
+            rows: Item data dicts with name, description, price and tax_ids
+                  (a list, or a string separated by ';' as in CSV)
+            chunk_size: Rows per transaction (defaults to IMPORT_CHUNK_SIZE)
+        
+        Returns:
+            One result dict per row, in input order, with index and success
+            plus id, or error
+        """
+        chunk_size = chunk_size or current_app.config['IMPORT_CHUNK_SIZE']
+        results = [None] * len(rows)
+        
+        def fail(index, error):
+            results[index] = {'index': index, 'success': False, 'error': str(error)}
+        
+        parsed = []
+        for index, data in enumerate(rows):
+            try:
+                if not isinstance(data, dict):
+                    raise ValueError('Item must be a JSON object')
+                if not data.get('name'):
+                    raise ValueError('Item name is required')
+                if data.get('price') is None:
+                    raise ValueError('Item price is required')
+                try:
+                    price = to_decimal(data['price'])
+                except InvalidOperation:
+                    raise ValueError('Invalid price format')
+                if not price.is_finite():
+                    raise ValueError('Invalid price format')
+                if price < 0:
+                    raise ValueError('Price must be a positive number')
+                
+                tax_ids = data.get('tax_ids') or []
+                if isinstance(tax_ids, str):
+                    tax_ids = [tax_id for tax_id in tax_ids.split(';') if tax_id.strip()]
+                try:
+                    tax_ids = list(dict.fromkeys(int(tax_id) for tax_id in tax_ids))
+                except (TypeError, ValueError):
+                    raise ValueError('Invalid tax ID')
+                
+                parsed.append((index, {
+                    'name': data['name'],
+                    'description': data.get('description'),
+                    'price': price
+                }, tax_ids))
+            except ValueError as e:
+                fail(index, e)
+        
+        known_tax_ids = self.item_repository.existing_tax_ids(
+            tax_id for _, _, tax_ids in parsed for tax_id in tax_ids
+        )
+        ready = []
+        for index, item_data, tax_ids in parsed:
+            missing = [tax_id for tax_id in tax_ids if tax_id not in known_tax_ids]
+            if missing:
+                fail(index, f'Taxes not found: {", ".join(str(tax_id) for tax_id in missing)}')
+            else:
+                ready.append((index, (item_data, tax_ids)))
+        
+        for index, outcome in save_in_chunks(ready, chunk_size, self.item_repository.bulk_create_items):
+            if isinstance(outcome, Exception):
+                fail(index, save_error(outcome))
+            else:
+                results[index] = {'index': index, 'success': True, 'id': outcome}
+        
+        return results
+    
+    def get_item_by_id(self, item_id: int, fieldset: Optional[Fieldset] = None) -> Optional[Dict]:
+        """Get item by ID (fieldset defaults to everything, taxes included)"""
+        item = self.item_repository.get_by_id(item_id, fieldset.columns() if fieldset else None)
+        return self._serialize([item], fieldset)[0] if item else None
+    
+    def get_item_version(self, item_id: int) -> Optional[tuple]:
+        """Get the version values an item ETag is computed from (None if not found)"""
+        return self.item_repository.get_version(item_id)
     
-    def get_all_items(self, page: int = 1, per_page: int = 20) -> tuple[List[Dict], int]:
-        """Get paginated list of items"""
-        items, total = self.item_repository.get_active_items(page, per_page)
-        return [item.to_dict(include_taxes=True) for item in items], total
+    def get_all_items(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        Get paginated list of items (fieldset defaults to everything, taxes included)
+        
+        With columnar, the page is a Table of the fieldset's fields read
+        straight from the item rows (taxes are never included).
+        """
+        items, total = self.item_repository.get_active_items(
+            page, per_page, count_strategy, fieldset.columns() if fieldset else None, as_rows=columnar
+        )
+        if columnar:
+            return items, total
+        return self._serialize(items, fieldset), total
+    
+    async def get_all_items_async(
+        self,
+        page: int = 1,
+        per_page: int = 20,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], int]:
+        """
+        get_all_items with its queries on the async session
+        
+        Taxes still come from the tax catalog, in a thread (see run_sync);
+        without an async engine, the whole of get_all_items runs there.
+        """
+        if not async_db.available:
+            return await run_sync(self.get_all_items, page, per_page, count_strategy, fieldset, columnar)
+        
+        items, total = await self.async_item_repository.get_paginated(
+            page=page,
+            per_page=per_page,
+            order_by='name',
+            desc=False,
+            count_strategy=count_strategy,
+            columns=fieldset.columns() if fieldset else None,
+            as_rows=columnar
+        )
+        if columnar:
+            return items, total
+        return await run_sync(self._serialize, items, fieldset), total
+    
+    def get_all_items_cursor(
+        self,
+        cursor: Optional[str] = None,
+        per_page: int = 20,
+        with_total: bool = False,
+        count_strategy: Optional[str] = None,
+        fieldset: Optional[Fieldset] = None,
+        columnar: bool = False
+    ) -> tuple[List[Dict], Optional[str], Optional[int]]:
+        """
+        Get items using cursor pagination
+        
+        fieldset defaults to everything, taxes included; see get_all_items
+        for columnar.
+        """
+        items, next_cursor, total = self.item_repository.get_active_items_cursor(
+            cursor, per_page, with_total, count_strategy, fieldset.columns() if fieldset else None, as_rows=columnar
+        )
+        if columnar:
+            return items, next_cursor, total
+        return self._serialize(items, fieldset), next_cursor, total
     
     def update_item(self, item_id: int, data: Dict[str, Any]) -> Optional[Dict]:
         """Update item information"""
@@ -112,16 +273,34 @@ class ItemService:
                 item.taxes.append(tax)
         
         db.session.commit()
+        
+        # Draft estimates follow the item's new taxes; sent ones keep theirs
+        if 'tax_ids' in data:
+            self.estimate_repository.refresh_draft_tax_rates([item_id])
+        
         return item.to_dict(include_taxes=True)
     
     def delete_item(self, item_id: int) -> bool:
         """Delete an item"""
         return self.item_repository.delete(item_id)
     
-    def search_items(self, name_pattern: str) -> List[Dict]:
-        """Search items by name"""
-        items = self.item_repository.search_by_name(name_pattern)
-        return [item.to_dict(include_taxes=True) for item in items]
+    def search_items(
+        self,
+        name_pattern: str,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> tuple[List[Dict], Optional[str]]:
+        """Search items by name, best matches first"""
+        items, next_cursor = self.item_repository.search_by_name(name_pattern, limit, cursor)
+        return self._serialize(items), next_cursor
+    
+    def _serialize(self, items, fieldset: Optional[Fieldset] = None) -> List[Dict]:
+        """Serialize items, fetching taxes of uncached items in one query"""
+        include_taxes = fieldset is None or fieldset.includes('taxes')
+        if include_taxes:
+            tax_catalog.taxes_for_items(item.id for item in items)
+        fields = fieldset.fields if fieldset else None
+        return [item.to_dict(include_taxes=include_taxes, fields=fields) for item in items]
 
 
 # Create singleton instance
@@ -0,0 +1,158 @@
+"""
+ASGI Serving
+Serve the Flask app from an event loop, running its async views on the loop itself
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from asgiref.sync import ThreadSensitiveContext, sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+from flask import request_started
+from werkzeug.exceptions import HTTPException
+from app.extensions import async_db
+
+# Pool for the blocking calls of a request dispatched on the event loop (None otherwise)
+_loop_executor = contextvars.ContextVar('loop_executor', default=None)
+
+
+class AsgiApp:
+    """
+    ASGI application serving a Flask app
+    
+    GET and HEAD requests for async views (the estimate, item and customer
+    lists) are dispatched on the event loop: they await their queries on
+    the async engine without holding a thread, and their blocking calls
+    (see run_sync) share a pool of `threads` threads. Every other request
+    goes through asgiref's WsgiToAsgi in a thread of its own, at most
+    `threads` at a time.
+    
+    Without an async engine, async views take the WSGI path too.
+    """
+    
+    def __init__(self, flask_app, threads: int = 32):
+        self.flask_app = flask_app
+        self.wsgi_app = WsgiToAsgi(flask_app)
+        self.threads = asyncio.Semaphore(threads)
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix='asgi-sync')
+        self.loop_endpoints = {
+            endpoint for endpoint, view in flask_app.view_functions.items()
+            if inspect.iscoroutinefunction(inspect.unwrap(view))
+        } if flask_app.extensions.get('async_db') else set()
+        
+        # On the loop, async views (also behind jwt_required) are awaited
+        # as they are instead of going through async_to_sync
+        ensure_sync = flask_app.ensure_sync
+        
+        def loop_ensure_sync(func):
+            if _loop_executor.get() is not None and inspect.iscoroutinefunction(func):
+                return func
+            return ensure_sync(func)
+        
+        flask_app.ensure_sync = loop_ensure_sync
+    
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif self._runs_on_loop(scope):
+            await self._dispatch(scope, send)
+        else:
+            # WsgiToAsgi runs the request in the context's thread: give each
+            # request its own (asgiref otherwise runs every request in one
+            # shared thread)
+            async with self.threads, ThreadSensitiveContext():
+                await self.wsgi_app(scope, receive, send)
+    
+    def _runs_on_loop(self, scope) -> bool:
+        """Whether a request is for an async view, which is dispatched on the loop"""
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD') or not self.loop_endpoints:
+            return False
+        try:
+            endpoint, _ = self.flask_app.url_map.bind('localhost').match(scope['path'], scope['method'])
+        except HTTPException:
+            return False
+        return endpoint in self.loop_endpoints
+    
+    async def _dispatch(self, scope, send):
+        """Flask's wsgi_app, awaiting the view on the loop"""
+        app = self.flask_app
+        # The same environ WsgiToAsgi builds (GET/HEAD, so no body to read)
+        instance = WsgiToAsgiInstance(app)
+        instance.scope = scope
+        environ = instance.build_environ(scope, BytesIO())
+        token = _loop_executor.set(self.executor)
+        ctx = app.request_context(environ)
+        error = None
+        try:
+            try:
+                ctx.push()
+                response = await self._full_dispatch_request()
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            
+            await send({
+                'type': 'http.response.start',
+                'status': response.status_code,
+                'headers': [
+                    (name.lower().encode('latin-1'), value.encode('latin-1'))
+                    for name, value in response.headers.items()
+                ]
+            })
+            await send({
+                'type': 'http.response.body',
+                'body': b'' if scope['method'] == 'HEAD' else response.get_data()
+            })
+            response.close()
+        finally:
+            if error is not None and app.should_ignore_error(error):
+                error = None
+            ctx.pop(error)
+            _loop_executor.reset(token)
+    
+    async def _full_dispatch_request(self):
+        """Flask's full_dispatch_request, awaiting the view's coroutine"""
+        app = self.flask_app
+        try:
+            request_started.send(app, _async_wrapper=app.ensure_sync)
+            rv = app.preprocess_request()
+            if rv is None:
+                rv = app.dispatch_request()
+                if inspect.isawaitable(rv):
+                    rv = await rv
+        except Exception as e:
+            rv = app.handle_user_exception(e)
+        return app.finalize_request(rv)
+    
+    async def _lifespan(self, receive, send):
+        """Close the async engines' pooled connections and the thread pool on shutdown"""
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                with self.flask_app.app_context():
+                    await async_db.dispose()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+async def run_sync(func, *args, **kwargs):
+    """
+    Call blocking code (sync repositories, the tax catalog) from an async view
+    
+    When the view was dispatched on the event loop (see AsgiApp), the call
+    runs in the shared thread pool; under WSGI it runs in the request's
+    thread, like asgiref's sync_to_async.
+    """
+    executor = _loop_executor.get()
+    if executor is None:
+        return await sync_to_async(func)(*args, **kwargs)
+    
+    context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, functools.partial(context.run, func, *args, **kwargs)
+    )
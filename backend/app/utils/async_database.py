@@ -0,0 +1,112 @@
+"""
+Async Database
+AsyncSession factory for the app's database, used by the async repositories
+"""
+import importlib.util
+from typing import Optional
+from flask import current_app
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Async driver (URL drivername and module) per database backend
+ASYNC_DRIVERS = {
+    'postgresql': ('postgresql+asyncpg', 'asyncpg'),
+    'sqlite': ('sqlite+aiosqlite', 'aiosqlite'),
+}
+
+# SQLALCHEMY_ENGINE_OPTIONS that also apply to the async engine's pool
+POOL_OPTIONS = ('pool_size', 'max_overflow', 'pool_timeout', 'pool_recycle', 'pool_pre_ping')
+
+
+def async_url(database_uri: str):
+    """
+    URL of a database for its async driver
+    
+    Returns:
+        URL, or None if the backend has no async driver installed or the
+        database is in-memory SQLite (private to the sync engine)
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS or (backend == 'sqlite' and url.database in (None, '', ':memory:')):
+        return None
+    
+    drivername, module = ASYNC_DRIVERS[backend]
+    if importlib.util.find_spec(module) is None:
+        return None
+    return url.set(drivername=drivername)
+
+
+class AsyncDatabase:
+    """
+    AsyncSession factories for the app's database and its binds
+    
+    Each engine uses the async driver of its URL (asyncpg for PostgreSQL,
+    aiosqlite for SQLite) with the pool settings and statement timeout of
+    its sync engine options. The engines are only created with
+    ASYNC_DB_POOL, as under the ASGI entry point where one event loop
+    serves every request: WSGI servers run each async view on a new event
+    loop, which pooled connections must not outlive, so they keep using
+    the pooled sync session.
+    
+    Without ASYNC_DB_POOL or an async driver for the primary database,
+    available is False and callers use the sync session instead; a bind
+    without one (such as the read replica) falls back to the primary.
+    """
+    
+    def init_app(self, app):
+        """Create the app's async engines (with ASYNC_DB_POOL), for the databases that have an async driver"""
+        if not app.config.get('ASYNC_DB_POOL'):
+            app.extensions['async_db'] = None
+            return
+        
+        binds = {None: {'url': app.config['SQLALCHEMY_DATABASE_URI'],
+                        **(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})}}
+        for key, options in (app.config.get('SQLALCHEMY_BINDS') or {}).items():
+            binds[key] = dict(options) if isinstance(options, dict) else {'url': options}
+        
+        makers = {}
+        for key, sync_options in binds.items():
+            url = async_url(sync_options['url'])
+            if url is not None:
+                engine = create_async_engine(url, **self._engine_options(url, sync_options))
+                makers[key] = async_sessionmaker(engine, expire_on_commit=False)
+        app.extensions['async_db'] = makers if None in makers else None
+    
+    @property
+    def available(self) -> bool:
+        """Whether the current app has an async engine"""
+        return current_app.extensions.get('async_db') is not None
+    
+    @property
+    def engine(self):
+        """The current app's primary AsyncEngine"""
+        return current_app.extensions['async_db'][None].kw['bind']
+    
+    def session(self, bind_key: Optional[str] = None) -> AsyncSession:
+        """New AsyncSession on a bind (the primary by default), to use as an async context manager"""
+        makers = current_app.extensions['async_db']
+        return makers.get(bind_key, makers[None])()
+    
+    async def dispose(self):
+        """Close the pooled connections of the current app's engines"""
+        for maker in (current_app.extensions.get('async_db') or {}).values():
+            await maker.kw['bind'].dispose()
+    
+    @staticmethod
+    def _engine_options(url, sync_options: dict) -> dict:
+        """Async engine options matching a sync engine's"""
+        options = {name: sync_options[name] for name in POOL_OPTIONS if name in sync_options}
+        options['poolclass'] = AsyncAdaptedQueuePool
+        
+        settings = _server_settings(sync_options.get('connect_args', {}).get('options', ''))
+        if settings and url.get_backend_name() == 'postgresql':
+            options['connect_args'] = {'server_settings': settings}
+        return options
+
+
+def _server_settings(options: str) -> Optional[dict]:
+    """Turn libpq '-c name=value' options into asyncpg server settings"""
+    pairs = (part.strip().split('=', 1) for part in options.split('-c ') if '=' in part)
+    return {name: value for name, value in pairs} or None
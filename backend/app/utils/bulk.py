@@ -0,0 +1,125 @@
+"""
+Bulk Request Utilities
+Parsing of multi-row request bodies
+"""
+import csv
+import io
+import json
+from sqlalchemy.exc import SQLAlchemyError
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+CSV_MIMETYPES = ('text/csv',)
+
+
+def iter_ndjson(stream):
+    """
+    Decode newline-delimited JSON one line at a time
+    
+    Args:
+        stream: Binary file-like object (e.g. request.stream)
+    
+    Yields:
+        Decoded value of each non-blank line
+    
+    Raises:
+        ValueError: If a line is not valid JSON
+    """
+    for line_number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            raise ValueError(f'Invalid JSON on line {line_number}')
+
+
+def iter_csv(stream):
+    """
+    Decode CSV with a header row one record at a time
+    
+    Args:
+        stream: Binary file-like object (e.g. request.stream)
+    
+    Yields:
+        Dict per record; empty fields become None
+    """
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    for record in reader:
+        yield {key: value if value != '' else None for key, value in record.items()}
+
+
+def read_bulk_rows(request, max_rows):
+    """
+    Read the rows of a bulk request body
+    
+    Accepts a JSON array, NDJSON when the Content-Type is
+    application/x-ndjson, or CSV with a header row when it is text/csv.
+    NDJSON and CSV are decoded record by record from the request stream
+    rather than buffered whole.
+    
+    Args:
+        request: Flask request
+        max_rows: Maximum number of rows accepted
+    
+    Returns:
+        List of decoded rows
+    
+    Raises:
+        ValueError: If the body is malformed or has too many rows
+    """
+    if request.mimetype in NDJSON_MIMETYPES + CSV_MIMETYPES:
+        decode = iter_ndjson if request.mimetype in NDJSON_MIMETYPES else iter_csv
+        rows = []
+        for row in decode(request.stream):
+            rows.append(row)
+            if len(rows) > max_rows:
+                break
+    else:
+        rows = request.get_json(silent=True)
+        if not isinstance(rows, list):
+            raise ValueError('Request body must be a JSON array, NDJSON or CSV')
+    
+    if not rows:
+        raise ValueError('At least one row is required')
+    if len(rows) > max_rows:
+        raise ValueError(f'At most {max_rows} rows are allowed per request')
+    return rows
+
+
+def save_in_chunks(rows, chunk_size, save):
+    """
+    Save validated rows chunk by chunk, isolating rows that fail
+    
+    Each chunk is passed to save, which must write it in one transaction
+    and return one result per payload. If a chunk raises a database
+    error, its rows are retried one at a time so a single bad row does
+    not fail its neighbours.
+    
+    Args:
+        rows: List of (index, payload) pairs
+        chunk_size: Payloads per transaction
+        save: Callable taking a list of payloads
+    
+    Yields:
+        (index, result) pairs, where result is the SQLAlchemyError for
+        rows that could not be saved
+    """
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            results = save([payload for _, payload in chunk])
+        except SQLAlchemyError:
+            results = []
+            for _, payload in chunk:
+                try:
+                    results.extend(save([payload]))
+                except SQLAlchemyError as e:
+                    results.append(e)
+        
+        for (index, _), result in zip(chunk, results):
+            yield index, result
+
+
+def save_error(error):
+    """Describe a database error from save_in_chunks for a per-row result"""
+    return f'Could not save row: {getattr(error, "orig", error)}'
@@ -0,0 +1,146 @@
+"""
+Cache Utilities
+Process-local caches and model version counters used for invalidation
+"""
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+
+class ModelVersions:
+    """
+    Per-model version counters
+    
+    Caches include a model's version in their keys; bumping the version
+    after a write makes every entry derived from that model unreachable.
+    Versions are bumped automatically when a session commits writes to
+    a model (see the session listeners below).
+    """
+    
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+    
+    def get(self, model) -> int:
+        """Get the current version of a model (or table name)"""
+        return self._versions.get(self._key(model), 0)
+    
+    def bump(self, model) -> int:
+        """Increment and return the version of a model (or table name)"""
+        key = self._key(model)
+        with self._lock:
+            self._versions[key] = self._versions.get(key, 0) + 1
+            return self._versions[key]
+    
+    @staticmethod
+    def _key(model):
+        return model if isinstance(model, str) else model.__tablename__
+
+
+class TTLCache:
+    """
+    Small thread-safe cache whose entries expire after a fixed TTL
+    
+    The oldest entries are evicted once max_entries is reached.
+    """
+    
+    def __init__(self, ttl: float = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """Get a cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key, value, ttl: float = None):
+        """Store a value for ttl seconds (defaults to the cache TTL)"""
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self._entries.clear()
+    
+    def stats(self) -> dict:
+        """Get hit/miss counters and the current size"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+
+# Shared version registry for all process-local caches
+model_versions = ModelVersions()
+
+
+def mark_changed(session, model):
+    """
+    Record a write the session events cannot see (e.g. COPY or raw SQL)
+    
+    The model's version is bumped when the session's transaction commits.
+    
+    Args:
+        session: Session whose transaction performed the write
+        model: Model class, instance or table name
+    """
+    table = model if isinstance(model, str) else model.__tablename__
+    session.info.setdefault('changed_models', set()).add(table)
+
+
+@event.listens_for(Session, 'after_flush')
+def _record_flushed_models(session, flush_context):
+    """Remember which models a transaction wrote through the unit of work"""
+    changed = session.info.setdefault('changed_models', set())
+    deleted = set(session.deleted)
+    for instance in chain(session.new, session.dirty, deleted):
+        if hasattr(instance, '__tablename__'):
+            changed.add(instance.__tablename__)
+            
+            # Many-to-many collections write their association table
+            state = inspect(instance)
+            for relationship in state.mapper.relationships:
+                if relationship.secondary is not None and (
+                    instance in deleted or state.attrs[relationship.key].history.has_changes()
+                ):
+                    changed.add(relationship.secondary.name)
+
+
+@event.listens_for(Session, 'do_orm_execute')
+def _record_executed_models(orm_execute_state):
+    """Remember which models a transaction wrote through ORM DML statements"""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            orm_execute_state.session.info.setdefault('changed_models', set()).add(
+                mapper.class_.__tablename__
+            )
+
+
+@event.listens_for(Session, 'after_commit')
+def _bump_committed_models(session):
+    """Bump the version of every model written by the committed transaction"""
+    for table in session.info.pop('changed_models', ()):
+        model_versions.bump(table)
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_rolled_back_models(session):
+    """Forget writes that were rolled back"""
+    session.info.pop('changed_models', None)
@@ -0,0 +1,105 @@
+"""
+Columnar Utilities
+Compact list responses: column names once, then one array of values per row
+"""
+from typing import Iterable, List, Optional
+from flask import request
+from app.utils.etags import compute_etag, etag_response, page_etag
+
+# Accept type selecting the columnar representation (format=columnar also does)
+COLUMNAR_MIMETYPE = 'application/vnd.wave.columnar+json'
+
+
+class Table:
+    """
+    Rows of a list endpoint as column arrays
+    
+    Built straight from SQL result rows, without model instances or
+    per-record dicts; serialized as {"columns": [...], "rows": [[...]]}.
+    """
+    
+    def __init__(self, columns: Iterable[str], rows: Iterable = ()):
+        self.columns = list(columns)
+        self.rows = [list(row) for row in rows]
+    
+    def __len__(self) -> int:
+        return len(self.rows)
+    
+    def column(self, name: str) -> list:
+        """All values of a column, in row order"""
+        index = self.columns.index(name)
+        return [row[index] for row in self.rows]
+    
+    def to_dict(self) -> dict:
+        """JSON-serializable form"""
+        return {'columns': self.columns, 'rows': self.rows}
+
+
+def wants_columnar(req=None) -> bool:
+    """
+    Whether a list request asked for the columnar representation
+    
+    Either format=columnar or an Accept header preferring
+    COLUMNAR_MIMETYPE over JSON selects it.
+    """
+    req = req or request
+    if req.args.get('format') == 'columnar':
+        return True
+    return req.accept_mimetypes.best_match(['application/json', COLUMNAR_MIMETYPE]) == COLUMNAR_MIMETYPE
+
+
+def list_body(key: str, records, **meta) -> dict:
+    """
+    Body of a list response
+    
+    Args:
+        key: Name of the records array in the object representation
+        records: Serialized dicts, or a Table for the columnar one
+        **meta: Pagination fields (total, page, next_cursor...)
+    """
+    if isinstance(records, Table):
+        return {**records.to_dict(), **meta}
+    return {key: records, **meta}
+
+
+def list_response(key: str, records, etag_parts: Iterable = (), **meta):
+    """
+    List response in the representation the client negotiated
+    
+    Sent with a weak page ETag (see page_etag) that also tells the two
+    representations apart, and Vary: Accept since the Accept header can
+    select the columnar one.
+    
+    Args:
+        key: Name of the records array in the object representation
+        records: Serialized dicts, or a Table for the columnar one
+        etag_parts: Extra values describing the page (total, cursor,
+            fieldset key...)
+        **meta: Pagination fields
+    """
+    if isinstance(records, Table):
+        ids, updated = records.column('id'), records.column('updated_at')
+        etag = compute_etag(len(records), max((value for value in updated if value), default=''),
+                            ','.join(map(str, ids)), *etag_parts, 'columnar')
+        mimetype = COLUMNAR_MIMETYPE
+    else:
+        etag, mimetype = page_etag(records, *etag_parts), None
+    
+    response = etag_response(list_body(key, records, **meta), etag, weak=True, mimetype=mimetype)
+    response.vary.add('Accept')
+    return response
+
+
+def select_names(table_columns, columns: Optional[List[str]], *required: Optional[str]) -> List[str]:
+    """
+    Column names to select for a table, ID and updated_at first
+    
+    Args:
+        table_columns: The model table's column collection
+        columns: Requested names (every column if None); names that are
+            not columns are ignored
+        *required: Names always selected (e.g. a cursor's order column)
+    """
+    requested = table_columns.keys() if columns is None else columns
+    names = dict.fromkeys(['id', 'updated_at', *requested, *(name for name in required if name)])
+    return [name for name in names if name in table_columns]
@@ -0,0 +1,53 @@
+"""
+Compression Utilities
+gzip response compression negotiated through Accept-Encoding
+"""
+import gzip
+from flask import request
+from app.utils.columnar import COLUMNAR_MIMETYPE
+
+# Content types worth compressing (text formats served by the API)
+COMPRESSIBLE_MIMETYPES = frozenset({
+    'application/json',
+    COLUMNAR_MIMETYPE,
+    'application/x-ndjson',
+    'text/csv',
+})
+
+
+def register_compression(app):
+    """
+    Compress responses for clients that accept gzip
+    
+    Applies to complete (non-streamed) 200 responses of a compressible
+    type whose body is at least COMPRESS_MIN_SIZE bytes; streamed exports
+    are left alone so their chunks keep flowing. A strong ETag becomes
+    weak once the body is compressed, so If-None-Match still matches
+    across encodings.
+    """
+    
+    @app.after_request
+    def compress_response(response):
+        response.vary.add('Accept-Encoding')
+        
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or response.is_streamed
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+            or request.accept_encodings['gzip'] <= 0
+        ):
+            return response
+        
+        body = response.get_data()
+        if len(body) < app.config.get('COMPRESS_MIN_SIZE', 1024):
+            return response
+        
+        response.set_data(gzip.compress(body, compresslevel=app.config.get('COMPRESS_LEVEL', 6), mtime=0))
+        response.headers['Content-Encoding'] = 'gzip'
+        
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+        return response
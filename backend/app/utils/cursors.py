@@ -0,0 +1,61 @@
+"""
+Cursor Utilities
+Opaque tokens for keyset (cursor) pagination
+"""
+import base64
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+
+def encode_cursor(value, id):
+    """
+    Encode the last (order_by value, id) pair of a page as an opaque token
+    
+    Args:
+        value: Value of the ordering column for the last row (or None)
+        id: ID of the last row
+    
+    Returns:
+        str: URL-safe cursor token
+    """
+    if isinstance(value, (date, datetime, Decimal)):
+        value = value.isoformat() if not isinstance(value, Decimal) else str(value)
+    
+    payload = json.dumps([value, id], separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(token, python_type=None):
+    """
+    Decode a cursor token back into its (order_by value, id) pair
+    
+    Args:
+        token (str): Cursor token produced by encode_cursor
+        python_type: Python type of the ordering column, used to restore
+            dates, datetimes and decimals
+    
+    Returns:
+        tuple: (value, id)
+    
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        value, id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        
+        if value is not None and python_type is not None:
+            if python_type is datetime:
+                value = datetime.fromisoformat(value)
+            elif python_type is date:
+                value = date.fromisoformat(value)
+            elif python_type is Decimal:
+                value = Decimal(value)
+        
+        if not isinstance(id, int):
+            raise ValueError('Cursor id must be an integer')
+    except (TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+    
+    return value, id
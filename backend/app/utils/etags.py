@@ -0,0 +1,72 @@
+"""
+ETag Utilities
+Conditional GET support: ETag computation and If-None-Match handling
+"""
+import hashlib
+from flask import Response, jsonify, make_response, request
+
+
+def compute_etag(*parts):
+    """
+    Hash version parts into an (unquoted) ETag value
+    
+    Args:
+        *parts: Values identifying a representation, e.g. an ID and
+                updated_at timestamps; compared by their str() form
+    
+    Returns:
+        str: Hex digest
+    """
+    text = '\x1f'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+
+def page_etag(records, *parts):
+    """
+    ETag value for a page of serialized records
+    
+    Built from the page's size, its newest updated_at and its record IDs,
+    plus any extra parts (such as the total); meant to be sent as a weak
+    ETag since related rows are not taken into account.
+    
+    Args:
+        records: Serialized dicts with id and updated_at
+        *parts: Extra values describing the page
+    """
+    newest = max((record.get('updated_at') or '' for record in records), default='')
+    return compute_etag(len(records), newest, ','.join(str(record['id']) for record in records), *parts)
+
+
+def is_not_modified(etag):
+    """Check whether the request's If-None-Match already matches an ETag"""
+    return request.if_none_match.contains_weak(etag)
+
+
+def not_modified(etag, weak=False):
+    """Build an empty 304 response carrying the ETag"""
+    response = make_response('', 304)
+    response.set_etag(etag, weak=weak)
+    return response
+
+
+def etag_response(payload, etag, weak=False, status_code=200, mimetype=None):
+    """
+    JSON response with an ETag, or 304 if the client already has it
+    
+    Args:
+        payload: JSON-serializable body, or bytes already encoded as JSON
+        etag: Unquoted ETag value
+        weak: Send as a weak ETag (W/"...")
+        status_code: Status for a full response
+        mimetype: Content type of a full response (application/json if
+                  omitted)
+    """
+    if is_not_modified(etag):
+        return not_modified(etag, weak)
+    
+    body = Response(payload, mimetype='application/json') if isinstance(payload, bytes) else jsonify(payload)
+    response = make_response(body, status_code)
+    if mimetype:
+        response.mimetype = mimetype
+    response.set_etag(etag, weak=weak)
+    return response
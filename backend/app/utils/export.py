@@ -0,0 +1,59 @@
+"""
+Export Utilities
+Incremental serialization of chunked rows for streamed responses
+"""
+import csv
+import io
+from datetime import date, datetime
+from flask import current_app
+
+EXPORT_MIMETYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv'
+}
+
+
+def ndjson_chunks(chunks):
+    """
+    Serialize chunks of dicts as newline-delimited JSON
+    
+    Args:
+        chunks: Iterable of lists of dicts the app's JSON provider can encode
+    
+    Yields:
+        One string per chunk
+    """
+    for rows in chunks:
+        yield ''.join(current_app.json.dumps(row) + '\n' for row in rows)
+
+
+def csv_chunks(chunks, fields):
+    """
+    Serialize chunks of dicts as CSV with a header row
+    
+    Args:
+        chunks: Iterable of lists of dicts
+        fields: Column names; other keys are ignored
+    
+    Yields:
+        The header, then one string per chunk
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction='ignore')
+    writer.writeheader()
+    
+    for rows in chunks:
+        writer.writerows(
+            {key: _csv_value(value) for key, value in row.items()} for row in rows
+        )
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+def _csv_value(value):
+    """Write dates and datetimes as ISO 8601, like the JSON formats"""
+    return value.isoformat() if isinstance(value, (date, datetime)) else value
@@ -0,0 +1,107 @@
+"""
+Fieldset Utilities
+Sparse fieldsets (fields=) and relationship includes (include=) for API reads
+"""
+from typing import Iterable, Optional
+
+# Always returned and always selected: they identify and version a record
+# (list ETags are built from them)
+ALWAYS_FIELDS = ('id', 'updated_at')
+
+
+class Fieldset:
+    """
+    Fields and relationships a caller asked for
+    
+    fields is None when every field was requested; include holds the
+    relationships to embed.
+    """
+    
+    def __init__(self, fields: Optional[Iterable[str]] = None, include: Iterable[str] = ()):
+        self.fields = frozenset(fields).union(ALWAYS_FIELDS) if fields is not None else None
+        self.include = frozenset(include)
+    
+    def wants(self, field: str) -> bool:
+        """Whether a field is part of the representation"""
+        return self.fields is None or field in self.fields
+    
+    def includes(self, relationship: str) -> bool:
+        """Whether a relationship is embedded"""
+        return relationship in self.include
+    
+    def columns(self, *required: str) -> Optional[list]:
+        """
+        Attributes to load, or None to load every column
+        
+        Args:
+            *required: Extra attributes needed to build the representation
+                (e.g. foreign keys of included relationships)
+        """
+        if self.fields is None:
+            return None
+        return sorted(self.fields.union(required))
+    
+    @property
+    def key(self) -> str:
+        """Stable description of the fieldset, for cache keys and ETags"""
+        fields = ','.join(sorted(self.fields)) if self.fields is not None else '*'
+        return f'{fields};{",".join(sorted(self.include))}'
+
+
+def parse_fieldset(args, fields: Iterable[str], includes: Iterable[str] = (),
+                   default_include: Optional[Iterable[str]] = None,
+                   columnar: bool = False) -> Optional[Fieldset]:
+    """
+    Read fields= and include= from query parameters
+    
+    Both take comma-separated names. Without fields every field is
+    returned; without include the default relationships are embedded,
+    and an empty include= embeds none.
+    
+    Columnar responses are flat: every field is listed explicitly and no
+    relationship can be embedded.
+    
+    Args:
+        args: Request query parameters
+        fields: Names accepted in fields=
+        includes: Names accepted in include=
+        default_include: Relationships embedded when include= is absent
+            (defaults to all of them)
+        columnar: Parse for a columnar response
+    
+    Returns:
+        Fieldset, or None if neither parameter was given (never None
+        when columnar)
+    
+    Raises:
+        ValueError: If a name is not accepted
+    """
+    if 'fields' not in args and 'include' not in args and not columnar:
+        return None
+    
+    requested_fields = _names(args.get('fields'))
+    unknown = sorted(set(requested_fields or ()) - set(fields))
+    if unknown:
+        raise ValueError(f'Unknown fields: {", ".join(unknown)}')
+    
+    if columnar:
+        if _names(args.get('include')):
+            raise ValueError('include is not supported by the columnar format')
+        return Fieldset(fields if requested_fields is None else requested_fields)
+    
+    if 'include' in args:
+        include = _names(args.get('include')) or []
+        unknown = sorted(set(include) - set(includes))
+        if unknown:
+            raise ValueError(f'Unknown includes: {", ".join(unknown)}')
+    else:
+        include = includes if default_include is None else default_include
+    
+    return Fieldset(requested_fields, include)
+
+
+def _names(value: Optional[str]) -> Optional[list]:
+    """Split a comma-separated parameter, or None if it was not given"""
+    if value is None:
+        return None
+    return [name.strip() for name in value.split(',') if name.strip()]
@@ -0,0 +1,71 @@
+"""
+JSON Provider
+Flask JSON provider that encodes raw column values, using orjson when installed
+"""
+import json
+from datetime import date, datetime, time
+from decimal import Decimal
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    JSON provider for raw model values
+    
+    datetime, date and time encode as ISO 8601 and Decimal as a number,
+    so to_dict can return column values unconverted. Encoding goes
+    through orjson when it is installed (set use_orjson to False to
+    force the standard library) and json otherwise; both produce the
+    same documents, except that orjson writes non-ASCII characters as
+    UTF-8 instead of escaping them.
+    """
+    
+    use_orjson = orjson is not None
+    
+    @staticmethod
+    def default(o):
+        """Encode values the JSON types do not cover"""
+        if isinstance(o, (datetime, date, time)):
+            return o.isoformat()
+        if isinstance(o, Decimal):
+            return float(o)
+        return DefaultJSONProvider.default(o)
+    
+    def dumps(self, obj, **kwargs) -> str:
+        """Serialize data as JSON"""
+        if self.use_orjson and set(kwargs) <= {'indent', 'separators'}:
+            return self._orjson_dumps(obj, bool(kwargs.get('indent'))).decode()
+        
+        kwargs.setdefault('default', self.default)
+        kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+        kwargs.setdefault('sort_keys', self.sort_keys)
+        return json.dumps(obj, **kwargs)
+    
+    def loads(self, s, **kwargs):
+        """Deserialize data as JSON"""
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+    
+    def response(self, *args, **kwargs):
+        """Serialize data as a JSON response, skipping the str round trip with orjson"""
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+        
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(self._orjson_dumps(obj, indent) + b'\n', mimetype=self.mimetype)
+    
+    def _orjson_dumps(self, obj, indent: bool) -> bytes:
+        """Encode with orjson using the provider's key sorting"""
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
@@ -0,0 +1,352 @@
+"""
+Metrics
+Prometheus text-format metrics: request latency, sizes and statuses, in-flight
+requests and database pool usage, aggregated across worker processes
+"""
+import glob
+import json
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from flask import Response, g, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+WAIT_BUCKETS = (0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+# name: (type, help, histogram buckets)
+DEFINITIONS = {
+    'http_requests_total': ('counter', 'Requests handled, by endpoint, method and status code', None),
+    'http_request_duration_seconds': ('histogram', 'Request latency by endpoint', LATENCY_BUCKETS),
+    'http_response_size_bytes': ('histogram', 'Response body size by endpoint', SIZE_BUCKETS),
+    'http_requests_in_flight': ('gauge', 'Requests being handled', None),
+    'db_pool_checkout_wait_seconds': (
+        'histogram', 'Time to get a pooled connection, including opening a new one', WAIT_BUCKETS
+    ),
+    'db_pool_size': ('gauge', 'Configured pool size', None),
+    'db_pool_checked_out': ('gauge', 'Connections checked out of the pool', None),
+    'db_pool_overflow': ('gauge', 'Connections open beyond the pool size', None),
+    'db_pool_checkouts_total': ('counter', 'Connections checked out of the pool', None),
+    'db_pool_connects_total': ('counter', 'New database connections opened by the pool', None),
+    'db_pool_invalidations_total': (
+        'counter', 'Pooled connections invalidated (disconnects, failed pre-pings, soft invalidations)', None
+    ),
+}
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# (metric, sample name, sorted label pairs)
+SampleKey = Tuple[str, str, tuple]
+
+
+class Metrics:
+    """
+    Process-local metric values with file-backed multiprocess aggregation
+    
+    Updates take one short process-local lock and never touch the disk.
+    When a directory is configured, a background thread rewrites this
+    process's file (<pid>.json, atomically) at most every flush_interval
+    seconds, and collect() sums the files of every process, so scraping
+    any worker returns the aggregate. Histograms are stored as cumulative
+    bucket counters plus _sum and _count.
+    """
+    
+    def __init__(self, definitions: Dict[str, tuple] = DEFINITIONS):
+        self.definitions = definitions
+        self.directory: Optional[str] = None
+        self.flush_interval = 1.0
+        self._values: Dict[SampleKey, float] = {}
+        self._gauges = set()
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._flusher_pid = None
+    
+    def configure(self, directory: Optional[str], flush_interval: float = 1.0):
+        """Set the multiprocess directory (None for single-process) and flush interval"""
+        self.directory = directory or None
+        self.flush_interval = flush_interval
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+    
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increment a counter, or move a gauge up (or down with a negative amount)"""
+        self._add(((name, name, _label_key(labels)), amount))
+    
+    def set(self, name: str, value: float, **labels):
+        """Set a gauge"""
+        key = (name, name, _label_key(labels))
+        with self._lock:
+            self._values[key] = value
+            self._gauges.add(key)
+            self._dirty = True
+        self._ensure_flusher()
+    
+    def observe(self, name: str, value: float, **labels):
+        """Record a histogram observation"""
+        label_key = _label_key(labels)
+        updates = [((name, f'{name}_bucket', label_key + (('le', _format(bound)),)), int(value <= bound))
+                   for bound in self.definitions[name][2]]
+        updates.append(((name, f'{name}_bucket', label_key + (('le', '+Inf'),)), 1))
+        updates.append(((name, f'{name}_sum', label_key), value))
+        updates.append(((name, f'{name}_count', label_key), 1))
+        self._add(*updates)
+    
+    def _add(self, *updates):
+        with self._lock:
+            for key, amount in updates:
+                self._values[key] = self._values.get(key, 0) + amount
+                if self.definitions[key[0]][0] == 'gauge':
+                    self._gauges.add(key)
+            self._dirty = True
+        self._ensure_flusher()
+    
+    def collect(self) -> Dict[SampleKey, float]:
+        """Current values, summed over every process when a directory is configured"""
+        if not self.directory:
+            with self._lock:
+                return dict(self._values)
+        
+        self.flush()
+        totals: Dict[SampleKey, float] = {}
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            for metric, sample, labels, value, _ in _read(path):
+                key = (metric, sample, tuple(map(tuple, labels)))
+                totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def flush(self):
+        """Write this process's values to its file"""
+        if not self.directory:
+            return
+        
+        with self._lock:
+            samples = [[metric, sample, labels, value, (metric, sample, labels) in self._gauges]
+                       for (metric, sample, labels), value in self._values.items()]
+            self._dirty = False
+        _write(os.path.join(self.directory, f'{os.getpid()}.json'), samples)
+    
+    def mark_process_dead(self, pid: int):
+        """Drop a dead worker's gauges; its counters and histograms still count"""
+        if not self.directory:
+            return
+        
+        path = os.path.join(self.directory, f'{pid}.json')
+        if os.path.exists(path):
+            _write(path, [sample for sample in _read(path) if not sample[4]])
+    
+    def clear(self):
+        """Forget this process's values"""
+        with self._lock:
+            self._values.clear()
+            self._gauges.clear()
+            self._dirty = True
+    
+    def render(self) -> str:
+        """Prometheus text exposition of collect()"""
+        by_metric: Dict[str, list] = {}
+        for key, value in sorted(self.collect().items(), key=_sort_key):
+            by_metric.setdefault(key[0], []).append((key[1], key[2], value))
+        
+        lines = []
+        for name, (kind, help_text, _) in self.definitions.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for sample, labels, value in by_metric.get(name, ()):
+                label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in labels)
+                lines.append(f'{sample}{{{label_text}}} {_format(value)}' if labels else f'{sample} {_format(value)}')
+        return '\n'.join(lines) + '\n'
+    
+    def _ensure_flusher(self):
+        """Start the flush thread once per process (after a fork, too)"""
+        if not self.directory or self._flusher_pid == os.getpid():
+            return
+        
+        self._flusher_pid = os.getpid()
+        threading.Thread(target=self._flush_loop, name='metrics-flush', daemon=True).start()
+    
+    def _flush_loop(self):
+        pid = os.getpid()
+        while self._flusher_pid == pid:
+            time.sleep(self.flush_interval)
+            if self._dirty:
+                self.flush()
+
+
+class MeteredQueuePool(QueuePool):
+    """QueuePool recording how long each checkout waits (bind names the engine)"""
+    
+    bind = 'default'
+    
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe('db_pool_checkout_wait_seconds', time.perf_counter() - start, bind=self.bind)
+    
+    def recreate(self):
+        pool = super().recreate()
+        pool.bind = self.bind
+        return pool
+
+
+def use_metered_pool(config):
+    """
+    Make server databases use MeteredQueuePool
+    
+    Must run before the engines are created (db.init_app); SQLite keeps
+    its own pool choice. Applies to the primary and to binds configured
+    as option dicts (the read replica).
+    """
+    if not config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+        options = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+        options.setdefault('poolclass', MeteredQueuePool)
+        config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+    
+    binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+    for key, options in binds.items():
+        if isinstance(options, dict) and not options['url'].startswith('sqlite'):
+            binds[key] = {'poolclass': MeteredQueuePool, **options}
+    config['SQLALCHEMY_BINDS'] = binds
+
+
+def register_metrics(app):
+    """
+    Record request and pool metrics and serve them at /metrics
+    
+    Requests are labelled by endpoint (unmatched URLs as 'unmatched') so
+    label values stay bounded; error counts are the http_requests_total
+    series with a 4xx/5xx status. METRICS_MULTIPROC_DIR enables the
+    file-backed aggregation across worker processes.
+    """
+    from app.extensions import db
+    
+    metrics.configure(app.config.get('METRICS_MULTIPROC_DIR'), app.config.get('METRICS_FLUSH_INTERVAL', 1.0))
+    
+    with app.app_context():
+        for bind, engine in db.engines.items():
+            _watch_pool(engine, bind or 'default')
+    
+    @app.before_request
+    def start_request_metrics():
+        g.metrics_start = time.perf_counter()
+        metrics.inc('http_requests_in_flight')
+    
+    @app.after_request
+    def record_request_metrics(response):
+        if 'metrics_start' not in g:
+            return response
+        
+        endpoint = request.endpoint or 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - g.metrics_start, endpoint=endpoint)
+        metrics.inc('http_requests_total', endpoint=endpoint, method=request.method, status=str(response.status_code))
+        if response.content_length is not None:
+            metrics.observe('http_response_size_bytes', response.content_length, endpoint=endpoint)
+        return response
+    
+    @app.teardown_request
+    def finish_request_metrics(exc=None):
+        if g.pop('metrics_start', None) is not None:
+            metrics.inc('http_requests_in_flight', -1)
+    
+    @app.route('/metrics')
+    def metrics_endpoint():
+        return Response(metrics.render(), content_type=CONTENT_TYPE)
+
+
+def pool_status(engine) -> dict:
+    """
+    Usage of an engine's connection pool
+    
+    Returns:
+        dict: pool class, plus size, max_overflow, checked_out, overflow
+        and saturation (checked out / most connections the pool may open)
+        for queue pools; saturation is None when overflow is unlimited
+        (max_overflow -1)
+    """
+    pool = engine.pool
+    status = {'pool': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        capacity = pool.size() + pool._max_overflow if pool._max_overflow >= 0 else None
+        status.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+            'saturation': round(pool.checkedout() / capacity, 3) if capacity else None,
+        })
+    return status
+
+
+def _watch_pool(engine, bind: str):
+    """Count an engine's pool events and keep its pool gauges current"""
+    pool = engine.pool
+    if isinstance(pool, MeteredQueuePool):
+        pool.bind = bind
+    
+    def update_gauges():
+        if isinstance(engine.pool, QueuePool):
+            metrics.set('db_pool_size', engine.pool.size(), bind=bind)
+            metrics.set('db_pool_checked_out', engine.pool.checkedout(), bind=bind)
+            metrics.set('db_pool_overflow', max(engine.pool.overflow(), 0), bind=bind)
+    
+    @event.listens_for(engine, 'checkout')
+    def on_checkout(*args):
+        metrics.inc('db_pool_checkouts_total', bind=bind)
+        update_gauges()
+    
+    @event.listens_for(engine, 'checkin')
+    def on_checkin(*args):
+        update_gauges()
+    
+    @event.listens_for(engine, 'connect')
+    def on_connect(*args):
+        metrics.inc('db_pool_connects_total', bind=bind)
+    
+    @event.listens_for(engine, 'invalidate')
+    @event.listens_for(engine, 'soft_invalidate')
+    def on_invalidate(*args):
+        metrics.inc('db_pool_invalidations_total', bind=bind)
+
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _sort_key(item) -> tuple:
+    """Order samples by name and labels, histogram buckets by numeric bound"""
+    (metric, sample, labels), _ = item
+    bound = float(dict(labels).get('le', 0))
+    return metric, sample, tuple(pair for pair in labels if pair[0] != 'le'), bound
+
+
+def _format(value) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else f'{float(value):.1f}'
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _read(path: str) -> list:
+    try:
+        with open(path) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return []
+
+
+def _write(path: str, samples: list):
+    temporary = f'{path}.{threading.get_ident()}.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(samples, file)
+    os.replace(temporary, path)
+
+
+# Create singleton instance
+metrics = Metrics()
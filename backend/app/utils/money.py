@@ -0,0 +1,76 @@
+"""
+Money Utilities
+Decimal helpers for estimate line and total calculations
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+
+CENT = Decimal('0.01')
+HUNDRED = Decimal('100')
+ZERO = Decimal('0')
+
+
+def to_decimal(value) -> Decimal:
+    """
+    Convert a numeric value to Decimal without going through binary floats
+    
+    Args:
+        value: Decimal, int, float, str or None
+    
+    Returns:
+        Decimal: Converted value (0 for None)
+    """
+    if value is None:
+        return ZERO
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
+
+
+def line_total(quantity, unit_price, tax_rate=None) -> Decimal:
+    """
+    Calculate the exact (unrounded) total of an estimate line including taxes
+    
+    Args:
+        quantity: Line quantity
+        unit_price: Unit price at time of estimate
+        tax_rate: Sum of the tax percentages applied to the item (e.g. 23.00)
+    
+    Returns:
+        Decimal: quantity * unit_price plus taxes
+    """
+    subtotal = Decimal(quantity) * to_decimal(unit_price)
+    return subtotal + subtotal * to_decimal(tax_rate) / HUNDRED
+
+
+def round_money(amount) -> Decimal:
+    """
+    Round an amount to cents
+    
+    Uses banker's rounding (half to even), like the built-in round() of
+    the original float implementation; unlike it, exact half-cent ties
+    are rounded to even rather than by float representation error.
+    """
+    return to_decimal(amount).quantize(CENT, rounding=ROUND_HALF_EVEN)
+
+
+def estimate_totals(lines) -> tuple:
+    """
+    Calculate the rounded subtotal, tax total and total of an estimate
+    
+    The total is rounded once over the exact line totals, exactly like
+    EstimateRepository.calculate_totals; tax_total is the difference, so
+    subtotal + tax_total == total always holds.
+    
+    Args:
+        lines: Iterable of (quantity, unit_price, tax_rate)
+    
+    Returns:
+        tuple: (subtotal, tax_total, total) as Decimals
+    """
+    subtotal = total = ZERO
+    for quantity, unit_price, tax_rate in lines:
+        subtotal += Decimal(quantity) * to_decimal(unit_price)
+        total += line_total(quantity, unit_price, tax_rate)
+    
+    subtotal, total = round_money(subtotal), round_money(total)
+    return subtotal, total - subtotal, total
@@ -0,0 +1,186 @@
+"""
+Payload Cache
+Two-tier cache of serialized API payloads keyed by record ID and version
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Callable, Optional
+from flask import current_app
+
+
+class SharedCache(ABC):
+    """
+    Interface of the shared tier behind the in-process LRU
+    
+    Implementations store bytes under string keys and are expected to be
+    visible to every worker (e.g. a Redis or memcached adapter).
+    """
+    
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Get the value stored under a key (None if missing or expired)"""
+    
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float):
+        """Store a value under a key for ttl seconds"""
+    
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove a key"""
+
+
+class LocalSharedCache(SharedCache):
+    """Dict-backed stand-in for a shared cache, for tests and single-process use"""
+    
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                return None
+            return entry[1]
+    
+    def set(self, key: str, value: bytes, ttl: float):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+    
+    def delete(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class PayloadCache:
+    """
+    Cache of serialized payloads in front of an optional shared tier
+    
+    Each record has at most one entry, tagged with the version it was
+    built from; a lookup with any other version is a miss, so a stale
+    payload is never served even when an invalidation was missed.
+    Payloads are kept and returned as JSON bytes encoded by the app's
+    JSON provider, which makes the memory accounting exact and lets a
+    hit be sent without encoding it again.
+    
+    The LRU tier is bounded by PAYLOAD_CACHE_MAX_ENTRIES and
+    PAYLOAD_CACHE_MAX_BYTES; shared tier entries expire after
+    PAYLOAD_CACHE_TTL seconds.
+    """
+    
+    def __init__(self, shared: Optional[SharedCache] = None):
+        self.shared = shared
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+    
+    def get_or_build(
+        self, kind: str, record_id: int, version: str, build: Callable[[], Optional[dict]]
+    ) -> Optional[bytes]:
+        """
+        Get the payload of a record at a version, building it on a miss
+        
+        Args:
+            kind: Record type, e.g. a table name
+            record_id: Record ID
+            version: Version key the payload must match
+            build: Callable returning the payload (None is not cached)
+        
+        Returns:
+            The payload's JSON bytes, or None if build returned None
+        """
+        key = f'{kind}:{record_id}'
+        data = self._get_local(key, version)
+        if data is None and self.shared is not None:
+            data = self._get_shared(key, version)
+        
+        if data is None:
+            self.misses += 1
+            payload = build()
+            if payload is None:
+                return None
+            data = current_app.json.dumps(payload, separators=(',', ':')).encode()
+            self._set_local(key, version, data)
+            if self.shared is not None:
+                self.shared.set(key, version.encode() + b'\n' + data,
+                                current_app.config.get('PAYLOAD_CACHE_TTL', 3600))
+        
+        return data
+    
+    def invalidate(self, kind: str, *record_ids: int):
+        """Drop the cached payloads of records from both tiers"""
+        for record_id in record_ids:
+            key = f'{kind}:{record_id}'
+            with self._lock:
+                entry = self._entries.pop(key, None)
+                if entry is not None:
+                    self._bytes -= len(entry[1])
+            if self.shared is not None:
+                self.shared.delete(key)
+    
+    def clear(self):
+        """Drop every entry of the LRU tier"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+    
+    def stats(self) -> dict:
+        """Get hit counters, hit ratio and the LRU tier's size in entries and bytes"""
+        lookups = self.hits + self.shared_hits + self.misses
+        return {
+            'hits': self.hits,
+            'shared_hits': self.shared_hits,
+            'misses': self.misses,
+            'hit_ratio': round((self.hits + self.shared_hits) / lookups, 4) if lookups else None,
+            'entries': len(self._entries),
+            'bytes': self._bytes
+        }
+    
+    def _get_local(self, key, version) -> Optional[bytes]:
+        """Get a payload from the LRU tier, marking it most recently used"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def _get_shared(self, key, version) -> Optional[bytes]:
+        """Get a payload from the shared tier and promote it to the LRU tier"""
+        stored = self.shared.get(key)
+        if stored is None:
+            return None
+        stored_version, _, data = stored.partition(b'\n')
+        if stored_version.decode() != version:
+            return None
+        self.shared_hits += 1
+        self._set_local(key, version, data)
+        return data
+    
+    def _set_local(self, key, version, data):
+        """Store a payload in the LRU tier, evicting least recently used entries"""
+        max_entries = current_app.config.get('PAYLOAD_CACHE_MAX_ENTRIES', 10000)
+        max_bytes = current_app.config.get('PAYLOAD_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        if len(data) > max_bytes:
+            return
+        
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous[1])
+            self._entries[key] = (version, data)
+            self._bytes += len(data)
+            while len(self._entries) > max_entries or self._bytes > max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+
+
+# Shared payload cache used by services; the shared tier is set in create_app
+payload_cache = PayloadCache()
@@ -0,0 +1,182 @@
+"""
+Query Profiler
+Per-request SQL statement counts, database time and N+1 detection
+"""
+import json
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Profiles collecting statements outside requests (see profile_queries)
+_active_profiles: ContextVar[tuple] = ContextVar('active_query_profiles', default=())
+
+_PLACEHOLDER = r'(?:\?|%s|%\(\w+\)s|:\w+)'
+_PLACEHOLDER_LIST = re.compile(rf'\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)')
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_WHITESPACE = re.compile(r'\s+')
+
+
+def fingerprint(statement: str) -> str:
+    """
+    Normalize a statement so repeats with other values compare equal
+    
+    Literals become ?, IN lists of any length become (?) and whitespace
+    is collapsed.
+    """
+    statement = _LITERAL.sub('?', statement)
+    statement = _PLACEHOLDER_LIST.sub('(?)', statement)
+    return _WHITESPACE.sub(' ', statement).strip()
+
+
+class QueryProfile:
+    """SQL statements executed while a profile was active"""
+    
+    def __init__(self):
+        self.statements = []
+        self.db_time = 0.0
+        self.fingerprints = Counter()
+    
+    @property
+    def count(self) -> int:
+        """Number of statements executed"""
+        return len(self.statements)
+    
+    @property
+    def db_ms(self) -> float:
+        """Time spent executing statements, in milliseconds"""
+        return round(self.db_time * 1000, 2)
+    
+    def record(self, statement: str, duration: float):
+        """Add an executed statement and its duration in seconds"""
+        self.statements.append(statement)
+        self.db_time += duration
+        self.fingerprints[fingerprint(statement)] += 1
+    
+    def n_plus_one(self, threshold: int = 5) -> list:
+        """
+        SELECTs repeated often enough to suggest a per-row loop
+        
+        Args:
+            threshold: Repeats from which a fingerprint is reported
+        
+        Returns:
+            List of (fingerprint, count), most repeated first
+        """
+        return [
+            (statement, count) for statement, count in self.fingerprints.most_common()
+            if count >= threshold and statement.upper().startswith('SELECT')
+        ]
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_profile_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration = time.perf_counter() - context._query_profile_start
+    
+    profiles = _active_profiles.get()
+    if has_request_context() and 'query_profile' in g:
+        profiles += (g.query_profile,)
+    for profile in profiles:
+        profile.record(statement, duration)
+
+
+def _listen():
+    """Hook every engine's cursor events (once per process)"""
+    if not event.contains(Engine, 'before_cursor_execute', _before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+@contextmanager
+def profile_queries():
+    """
+    Profile the statements executed inside a block
+    
+    Yields:
+        QueryProfile, filled in as statements run
+    """
+    _listen()
+    profile = QueryProfile()
+    token = _active_profiles.set(_active_profiles.get() + (profile,))
+    try:
+        yield profile
+    finally:
+        _active_profiles.reset(token)
+
+
+@contextmanager
+def assert_max_queries(max_count: int):
+    """
+    Fail if the block executes more than max_count statements
+    
+    Meant for tests, e.g. around a test client request:
+        
+        with assert_max_queries(3):
+            client.get('/api/v1/estimates', headers=headers)
+    
+    Yields:
+        QueryProfile of the block
+    """
+    with profile_queries() as profile:
+        yield profile
+    
+    if profile.count > max_count:
+        listing = '\n'.join(f'  {statement}' for statement in profile.statements)
+        raise AssertionError(f'{profile.count} queries executed, expected at most {max_count}:\n{listing}')
+
+
+def register_query_profiler(app):
+    """
+    Profile the SQL statements of every request
+    
+    Adds a Server-Timing header (db: statement count and time; app: whole
+    request) and logs one JSON line per request. Requests repeating the
+    same SELECT QUERY_PROFILER_N_PLUS_ONE_THRESHOLD times or more are
+    logged as warnings with the repeated fingerprints.
+    """
+    if not app.config.get('QUERY_PROFILER', True):
+        return
+    
+    _listen()
+    
+    @app.before_request
+    def start_query_profile():
+        g.query_profile = QueryProfile()
+        g.query_profile_start = time.perf_counter()
+    
+    @app.after_request
+    def finish_query_profile(response):
+        profile = g.pop('query_profile', None)
+        if profile is None:
+            return response
+        
+        duration_ms = round((time.perf_counter() - g.pop('query_profile_start')) * 1000, 2)
+        suspects = profile.n_plus_one(app.config.get('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', 5))
+        
+        response.headers.add(
+            'Server-Timing', f'db;dur={profile.db_ms};desc="{profile.count} queries", app;dur={duration_ms}'
+        )
+        
+        record = {
+            'event': 'request_profile',
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': profile.count,
+            'db_ms': profile.db_ms,
+            'duration_ms': duration_ms,
+        }
+        if suspects:
+            record['n_plus_one'] = [{'statement': statement, 'count': count} for statement, count in suspects]
+            app.logger.warning(json.dumps(record))
+        else:
+            app.logger.info(json.dumps(record))
+        return response
@@ -53,31 +53,45 @@ def error_response(message, status_code=400, errors=None):
     return jsonify(response), status_code
 
 
-def paginated_response(items, total, page, per_page, status_code=200):
+def paginated_response(items, total, page, per_page, status_code=200, next_cursor=None):
     """
     Create a standardized paginated response
     
     Args:
         items (list): List of items
-        total (int): Total count
-        page (int): Current page
+        total (int): Total count (None in cursor mode when not requested)
+        page (int): Current page (None in cursor mode)
         per_page (int): Items per page
         status_code (int): HTTP status code
+        next_cursor (str): Cursor of the next page in cursor mode
     
     Returns:
         tuple: (response, status_code)
     """
-    response = {
-        'success': True,
-        'data': items,
-        'pagination': {
+    if page is None:
+        pagination = {
+            'total': total,
+            'total_exact': getattr(total, 'exact', True) if total is not None else None,
+            'per_page': per_page,
+            'next_cursor': next_cursor,
+            'has_next': next_cursor is not None
+        }
+    else:
+        pagination = {
             'total': total,
+            'total_exact': getattr(total, 'exact', True),
             'page': page,
             'per_page': per_page,
             'total_pages': (total + per_page - 1) // per_page,
             'has_next': page * per_page < total,
-            'has_prev': page > 1
+            'has_prev': page > 1,
+            'next_cursor': next_cursor
         }
+    
+    response = {
+        'success': True,
+        'data': items,
+        'pagination': pagination
     }
     
     return jsonify(response), status_code
@@ -0,0 +1,24 @@
+"""
+ASGI Entry Point
+Serves the app from an event loop, e.g.:
+
+    uvicorn asgi:app --workers 4
+    gunicorn -k uvicorn.workers.UvicornWorker --config gunicorn.conf.py asgi:app
+
+Async views (the estimate, item and customer lists) run on the server's
+event loop and await their queries there; the rest of the app runs in a
+thread per request, at most ASGI_THREADS at a time per process (see
+AsgiApp).
+"""
+import os
+from app import create_app
+from app.extensions import async_db
+from app.utils.asgi import AsgiApp
+
+flask_app = create_app(os.getenv('FLASK_ENV', 'development'))
+
+# One event loop serves every request, so the async views can use pooled async engines
+flask_app.config['ASYNC_DB_POOL'] = True
+async_db.init_app(flask_app)
+
+app = AsgiApp(flask_app, threads=int(os.getenv('ASGI_THREADS', 32)))
@@ -0,0 +1,4 @@
+"""
+Benchmarks Package
+Run from the backend directory, e.g. python -m benchmarks.search_latency
+"""
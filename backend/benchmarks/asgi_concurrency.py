@@ -0,0 +1,132 @@
+"""
+ASGI Concurrency Benchmark
+Opens CONNECTIONS simultaneous connections, each sending one
+GET /api/v1/estimates, against the current gunicorn setup (sync workers,
+2 threads each) and against the ASGI entry point on uvicorn workers, and
+reports completed requests, errors and latency percentiles.
+
+Both servers run WORKERS processes on a SQLite file seeded with ESTIMATES
+estimates.
+
+Usage: python -m benchmarks.asgi_concurrency [connections]
+"""
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from benchmarks.common import create_benchmark_app
+
+CONNECTIONS = 1000
+WORKERS = int(os.getenv('BENCHMARK_WORKERS', 2))
+ESTIMATES = 200
+TIMEOUT = 120.0
+PATH = '/api/v1/estimates?per_page=20'
+
+SERVERS = {
+    'gunicorn sync (2 threads)': ['gunicorn', '--workers', str(WORKERS), '--threads', '2', '--timeout', '120',
+                                  '--backlog', '2048', "app:create_app('testing')"],
+    'gunicorn uvicorn (asgi.py)': ['gunicorn', '-k', 'uvicorn.workers.UvicornWorker', '--workers', str(WORKERS),
+                                   '--timeout', '120', '--backlog', '2048', 'asgi:app'],
+}
+
+
+def seed():
+    """Create the benchmark data and return an access token for its user"""
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.user import User
+    from app.repositories.estimate_repository import EstimateRepository
+    from app.services.estimate_service import estimate_service
+    
+    app = create_benchmark_app()
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.add_all([Customer(name=f'Customer {i}', email=f'customer{i}@example.com') for i in range(20)])
+        db.session.add_all([Item(name=f'Item {i}', price=10 + i) for i in range(50)])
+        db.session.commit()
+        estimate_service.create_estimates_bulk(user.id, [
+            {'customer_id': 1 + i % 20, 'items': [{'item_id': 1 + (i + j) % 50, 'quantity': 1 + j} for j in range(5)]}
+            for i in range(ESTIMATES)
+        ])
+        EstimateRepository().backfill_totals()
+        return create_access_token(identity=str(user.id), expires_delta=False)
+
+
+async def request(port, token):
+    """Send one request on a new connection; return (status or error name, seconds)"""
+    start = time.perf_counter()
+    try:
+        reader, writer = await asyncio.open_connection('127.0.0.1', port)
+        writer.write(f'GET {PATH} HTTP/1.1\r\nHost: localhost\r\nAuthorization: Bearer {token}\r\n'
+                     f'Connection: close\r\n\r\n'.encode())
+        await writer.drain()
+        response = await asyncio.wait_for(reader.read(), TIMEOUT)
+        writer.close()
+        status = int(response.split(b' ', 2)[1]) if response else 'empty'
+    except (OSError, asyncio.TimeoutError, IndexError, ValueError) as e:
+        status = type(e).__name__
+    return status, time.perf_counter() - start
+
+
+async def burst(port, token, connections):
+    """Open every connection at once and wait for all responses"""
+    start = time.perf_counter()
+    results = await asyncio.gather(*(request(port, token) for _ in range(connections)))
+    return results, time.perf_counter() - start
+
+
+def serve(command, port):
+    """Start a server and wait until it accepts connections"""
+    environment = dict(os.environ, FLASK_ENV='testing', QUERY_PROFILER='false')
+    process = subprocess.Popen(command[:-1] + ['--bind', f'127.0.0.1:{port}', command[-1]], env=environment,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            time.sleep(1)  # let every worker boot
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.kill()
+    raise RuntimeError(f'{command[0]} did not start')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def main(connections=CONNECTIONS):
+    token = seed()
+    print(f'{connections} simultaneous connections, GET {PATH}, {WORKERS} workers, {os.cpu_count()} CPUs')
+    
+    for name, command in SERVERS.items():
+        port = free_port()
+        process = serve(command, port)
+        try:
+            asyncio.run(burst(port, token, 20))  # warm up
+            results, elapsed = asyncio.run(burst(port, token, connections))
+        finally:
+            process.terminate()
+            process.wait()
+        
+        statuses = Counter(status for status, _ in results)
+        latencies = sorted(seconds for status, seconds in results if status == 200)
+        percentiles = '  '.join(
+            f'p{p}={latencies[min(int(len(latencies) * p / 100), len(latencies) - 1)] * 1000:.0f}ms'
+            for p in (50, 95, 99)
+        ) if latencies else 'no successful requests'
+        print(f'{name}: {dict(statuses)} in {elapsed:.2f}s '
+              f'({len(latencies) / elapsed:.0f} req/s)  {percentiles}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else CONNECTIONS)
@@ -0,0 +1,61 @@
+"""
+Bulk Estimate Creation Benchmark
+Compares creating estimates one request at a time through
+POST /api/v1/estimates with a single POST /api/v1/estimates/bulk.
+
+Usage: python -m benchmarks.bulk_estimates [rows]
+"""
+import sys
+import time
+from benchmarks.common import create_benchmark_app
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = create_benchmark_app()
+    
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.user import User
+    
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.execute(Customer.__table__.insert(), [
+            {'name': f'Customer {i}', 'email': f'customer{i}@example.com'} for i in range(50)
+        ])
+        db.session.execute(Item.__table__.insert(), [
+            {'name': f'Item {i}', 'price': 10} for i in range(200)
+        ])
+        db.session.commit()
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+    
+    payload = [
+        {
+            'customer_id': 1 + i % 50,
+            'items': [{'item_id': 1 + (i * 7 + line) % 200, 'quantity': 1 + line} for line in range(5)]
+        }
+        for i in range(rows)
+    ]
+    client = app.test_client()
+    
+    start = time.perf_counter()
+    for row in payload:
+        assert client.post('/api/v1/estimates', json=row, headers=headers).status_code == 201
+    single = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    response = client.post('/api/v1/estimates/bulk', json=payload, headers=headers)
+    bulk = time.perf_counter() - start
+    assert response.get_json()['created'] == rows
+    
+    print(f'{rows} estimates x 5 lines')
+    print(f'  single endpoint: {single:.2f}s ({rows / single:,.0f} rows/s)')
+    print(f'  bulk endpoint:   {bulk:.2f}s ({rows / bulk:,.0f} rows/s)')
+    print(f'  speedup: {single / bulk:.1f}x')
+
+
+if __name__ == '__main__':
+    main()
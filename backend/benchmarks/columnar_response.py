@@ -0,0 +1,63 @@
+"""
+Columnar Response Benchmark
+Compares a 1000-estimate GET /estimates page as objects (with and without
+customer and items) and as columns, each plain and gzipped: bytes on the
+wire and server time per request through the test client.
+
+Usage: python -m benchmarks.columnar_response [estimates]
+"""
+import sys
+from benchmarks.common import create_benchmark_app, measure
+
+
+def main(count=1000):
+    app = create_benchmark_app()
+    
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.tax import Tax
+    from app.models.user import User
+    from app.services.estimate_service import estimate_service
+    from app.utils.columnar import COLUMNAR_MIMETYPE
+    
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.execute(Customer.__table__.insert(), [
+            {'name': f'Customer {i}', 'email': f'customer{i}@example.com'} for i in range(50)
+        ])
+        taxes = [Tax(name=f'Tax {i}', amount=5 + i) for i in range(3)]
+        items = [Item(name=f'Item {i}', price=10 + i, taxes=taxes[:i % 3]) for i in range(50)]
+        db.session.add_all(taxes + items)
+        db.session.commit()
+        
+        estimate_service.create_estimates_bulk(user.id, [
+            {'customer_id': 1 + i % 50, 'footer_note': 'Thank you for your business',
+             'items': [{'item_id': 1 + (i * 7 + line) % 50, 'quantity': 1 + line} for line in range(5)]}
+            for i in range(count)
+        ])
+        token = create_access_token(identity=str(user.id))
+    
+    client = app.test_client()
+    url = f'/api/v1/estimates?per_page={count}'
+    variants = [
+        ('objects, customer + items', url, {}),
+        ('objects, flat (include=)', url + '&include=', {}),
+        ('columnar', url, {'Accept': COLUMNAR_MIMETYPE}),
+    ]
+    
+    print(f'GET /estimates, {count} rows')
+    for label, variant_url, headers in variants:
+        headers = {'Authorization': f'Bearer {token}', **headers}
+        for encoding in ('identity', 'gzip'):
+            request_headers = {**headers, 'Accept-Encoding': encoding}
+            response = client.get(variant_url, headers=request_headers)
+            assert response.status_code == 200, response.data[:200]
+            timing = measure(lambda: client.get(variant_url, headers=request_headers), repeat=10)
+            print(f'  {label:<27} {encoding:<8} {len(response.data):>10,} bytes  {timing}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,49 @@
+"""
+Benchmark Helpers
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+# Benchmarks run against TEST_DATABASE_URL; default to a throwaway SQLite file
+os.environ.setdefault('TEST_DATABASE_URL', 'sqlite:////tmp/wave_benchmark.db')
+
+
+def create_benchmark_app():
+    """Create a testing app with a fresh schema"""
+    from app import create_app
+    from app.extensions import db
+    
+    app = create_app('testing')
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+    return app
+
+
+def measure(func, repeat=20):
+    """
+    Time a callable
+    
+    Returns:
+        dict: median and p95 latency in milliseconds
+    """
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        'median_ms': round(statistics.median(samples), 2),
+        'p95_ms': round(samples[int(len(samples) * 0.95) - 1], 2)
+    }
+
+
+@contextmanager
+def timer(label):
+    """Print how long a block took"""
+    start = time.perf_counter()
+    yield
+    print(f'{label}: {time.perf_counter() - start:.2f}s')
@@ -0,0 +1,136 @@
+"""
+Database Restart Load Test
+Threads keep calling GET /estimates while the database "restarts" twice,
+then the response statuses are counted. The restart is simulated on a
+SQLite file: every pooled connection starts failing like a closed
+database, idle ones at once and busy ones when they are checked back in,
+the way a server restart leaves a pool full of dead connections. Without
+pre-ping, each dead connection fails one request before the pool
+replaces it; with DB_POOL_PRE_PING (the default) it is replaced at
+checkout and no request fails.
+
+Usage: python -m benchmarks.db_restart [--no-pre-ping]
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import Counter
+from benchmarks.common import create_benchmark_app
+
+THREADS = 8
+DURATION = 3.0
+RESTARTS_AT = (1.0, 2.0)
+
+
+class SimulatedRestart:
+    """
+    Makes an engine's connections behave as if the server restarted
+    
+    Connections are opened through a proxy. A connection is busy from
+    its first use after a checkout (the pre-ping, when enabled) until it
+    is checked back in; restart() kills the idle ones at once and the
+    busy ones at checkin, so requests in progress finish. A dead
+    connection fails like a closed SQLite database.
+    """
+    
+    def __init__(self, engine):
+        from sqlalchemy import event
+        
+        self.lock = threading.Lock()
+        self.generation = 0
+        self.connections = weakref.WeakSet()
+        
+        @event.listens_for(engine, 'do_connect')
+        def connect(dialect, conn_rec, cargs, cparams):
+            connection = _RestartableConnection(dialect.dbapi.connect(*cargs, **cparams), self)
+            self.connections.add(connection)
+            return connection
+        
+        @event.listens_for(engine, 'checkin')
+        def checkin(dbapi_connection, record):
+            if isinstance(dbapi_connection, _RestartableConnection):
+                with self.lock:
+                    dbapi_connection.busy = False
+                    if dbapi_connection.generation != self.generation:
+                        dbapi_connection.dead = True
+        
+        # Reopen the idle connections through the proxy
+        engine.dispose()
+    
+    def restart(self):
+        with self.lock:
+            self.generation += 1
+            for connection in list(self.connections):
+                if not connection.busy:
+                    connection.dead = True
+
+
+class _RestartableConnection:
+    """DBAPI connection proxy that fails once a simulated restart killed it"""
+    
+    def __init__(self, connection, restarts):
+        self.__dict__.update(_connection=connection, _restarts=restarts, generation=restarts.generation,
+                             busy=False, dead=False)
+    
+    def __getattr__(self, name):
+        if name != 'close':
+            with self._restarts.lock:
+                if self.dead:
+                    raise sqlite3.ProgrammingError('Cannot operate on a closed database.')
+                self.busy = True
+        return getattr(self._connection, name)
+
+
+def main(pre_ping=True):
+    os.environ['DB_POOL_PRE_PING'] = 'true' if pre_ping else 'false'
+    app = create_benchmark_app()
+    # Let failures become 500 responses instead of propagating to the client
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+    
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.user import User
+    from app.services.estimate_service import estimate_service
+    
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        db.session.add_all([user, Customer(name='Customer', email='customer@example.com'),
+                            Item(name='Item', price=10)])
+        db.session.commit()
+        estimate_service.create_estimates_bulk(user.id, [
+            {'customer_id': 1, 'items': [{'item_id': 1, 'quantity': 1 + i}]} for i in range(20)
+        ])
+        token = create_access_token(identity=str(user.id))
+        simulated = SimulatedRestart(db.engine)
+        print(f'Pool: {db.engine.pool.status()}, pre_ping={pre_ping}')
+    
+    statuses = Counter()
+    stop = time.perf_counter() + DURATION
+    
+    def worker():
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        while time.perf_counter() < stop:
+            statuses[client.get('/api/v1/estimates?per_page=5', headers=headers).status_code] += 1
+    
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for at in RESTARTS_AT:
+        time.sleep(max(start + at - time.perf_counter(), 0))
+        simulated.restart()
+    for thread in threads:
+        thread.join()
+    
+    print(f'{sum(statuses.values())} requests over {DURATION:.0f}s with {len(RESTARTS_AT)} restarts: '
+          f'{dict(sorted(statuses.items()))}')
+
+
+if __name__ == '__main__':
+    main(pre_ping='--no-pre-ping' not in sys.argv[1:])
@@ -0,0 +1,72 @@
+"""
+Estimate Line Insert Benchmark
+Compares the original flush + per-line INSERT loop with the RETURNING +
+executemany path of EstimateRepository.create_estimate_with_items.
+
+Usage: python -m benchmarks.estimate_lines
+"""
+from datetime import date
+from benchmarks.common import create_benchmark_app, measure
+
+
+def legacy_create_estimate_with_items(estimate_data, items_data):
+    """Original implementation: flush for the ID, then one INSERT per line"""
+    from app.extensions import db
+    from app.models.estimate import Estimate, estimate_items
+    
+    estimate = Estimate(**estimate_data)
+    db.session.add(estimate)
+    db.session.flush()
+    for item_data in items_data:
+        db.session.execute(estimate_items.insert().values(
+            estimate_id=estimate.id,
+            item_id=item_data['item_id'],
+            quantity=item_data.get('quantity', 1),
+            unit_price=item_data['unit_price']
+        ))
+    db.session.commit()
+    return estimate
+
+
+def main():
+    app = create_benchmark_app()
+    
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.user import User
+    from app.repositories.estimate_repository import EstimateRepository
+    
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        customer = Customer(name='Bench', email='bench@example.com')
+        db.session.add_all([user, customer])
+        db.session.execute(Item.__table__.insert(), [
+            {'name': f'Item {i}', 'price': 10} for i in range(1000)
+        ])
+        db.session.commit()
+        
+        repo = EstimateRepository()
+        counter = iter(range(10 ** 6))
+        
+        def estimate_data():
+            return {
+                'estimate_number': f'BENCH-{next(counter)}',
+                'customer_id': customer.id,
+                'user_id': user.id,
+                'date': date(2026, 1, 1),
+                'valid_until': date(2026, 2, 1),
+                'status': 'draft'
+            }
+        
+        for lines in (10, 100, 1000):
+            items_data = [
+                {'item_id': i + 1, 'quantity': 2, 'unit_price': '9.99'} for i in range(lines)
+            ]
+            before = measure(lambda: legacy_create_estimate_with_items(estimate_data(), items_data), 10)
+            after = measure(lambda: repo.create_estimate_with_items(estimate_data(), items_data), 10)
+            print(f'{lines:5} lines  before: {before}  after: {after}')
+
+
+if __name__ == '__main__':
+    main()
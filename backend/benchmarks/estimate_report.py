@@ -0,0 +1,74 @@
+"""
+Estimate Report Benchmark
+Compares summing calculate_total over every estimate in Python with the
+SQL-side GET /api/v1/reports/estimates aggregation.
+
+Set TEST_DATABASE_URL to a PostgreSQL database to measure at 1M rows.
+
+Usage: python -m benchmarks.estimate_report [rows]
+"""
+import random
+import sys
+from datetime import date, timedelta
+from decimal import Decimal
+from benchmarks.common import create_benchmark_app, measure, timer
+
+STATUSES = ['draft', 'sent', 'accepted', 'rejected']
+
+
+def main(rows=100000):
+    app = create_benchmark_app()
+    
+    from flask_jwt_extended import create_access_token
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.estimate import Estimate
+    from app.models.user import User
+    
+    rng = random.Random(42)
+    with app.app_context():
+        with timer(f'insert {rows} estimates'):
+            user = User(email='bench@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.execute(Customer.__table__.insert(), [
+                {'name': f'Customer {i}', 'email': f'customer{i}@example.com'} for i in range(500)
+            ])
+            db.session.flush()
+            for start in range(0, rows, 10000):
+                batch = []
+                for i in range(start, min(start + 10000, rows)):
+                    subtotal = Decimal(rng.randint(100, 1000000)) / 100
+                    tax_total = (subtotal * Decimal('0.18')).quantize(Decimal('0.01'))
+                    batch.append({
+                        'estimate_number': f'EST-BENCH-{i:07d}',
+                        'customer_id': 1 + i % 500,
+                        'user_id': user.id,
+                        'date': date(2024, 1, 1) + timedelta(days=rng.randint(0, 730)),
+                        'valid_until': date(2026, 12, 31),
+                        'status': rng.choice(STATUSES),
+                        'subtotal': subtotal,
+                        'tax_total': tax_total,
+                        'total': subtotal + tax_total
+                    })
+                db.session.execute(Estimate.__table__.insert(), batch)
+            db.session.commit()
+            headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+        
+        client = app.test_client()
+        
+        def python_side():
+            totals = {}
+            for estimate in Estimate.query.yield_per(10000):
+                totals[estimate.status] = totals.get(estimate.status, 0) + estimate.calculate_total()
+            db.session.expunge_all()
+            return totals
+        
+        print(f'python (calculate_total per estimate): {measure(python_side, repeat=1)}')
+        for query in ['group_by=status', 'group_by=month', 'group_by=customer',
+                      'group_by=month&date_from=2025-01-01&date_to=2025-03-31']:
+            result = measure(lambda: client.get(f'/api/v1/reports/estimates?{query}', headers=headers), repeat=10)
+            print(f'sql ({query}): {result}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
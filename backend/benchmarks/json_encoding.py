@@ -0,0 +1,71 @@
+"""
+JSON Encoding Benchmark
+Compares encoding a 100-estimate page the original way (to_dict values
+pre-converted with isoformat()/float(), encoded by the json module) with
+raw values encoded by FastJSONProvider, with and without orjson.
+
+Usage: python -m benchmarks.json_encoding [estimates]
+"""
+import json
+import sys
+from benchmarks.common import create_benchmark_app, measure
+
+
+def legacy_values(value):
+    """Convert raw values the way to_dict used to, before encoding"""
+    if isinstance(value, dict):
+        return {key: legacy_values(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [legacy_values(item) for item in value]
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    if hasattr(value, 'as_integer_ratio') and not isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+def main(count=100):
+    app = create_benchmark_app()
+    
+    from app.extensions import db
+    from app.models.customer import Customer
+    from app.models.item import Item
+    from app.models.tax import Tax
+    from app.models.user import User
+    from app.services.estimate_service import estimate_service
+    from app.utils.json_provider import FastJSONProvider
+    
+    with app.app_context():
+        user = User(email='bench@example.com', password_hash='x')
+        db.session.add(user)
+        db.session.execute(Customer.__table__.insert(), [
+            {'name': f'Customer {i}', 'email': f'customer{i}@example.com'} for i in range(20)
+        ])
+        taxes = [Tax(name=f'Tax {i}', amount=5 + i) for i in range(3)]
+        items = [Item(name=f'Item {i}', price=10 + i, taxes=taxes[:i % 3]) for i in range(50)]
+        db.session.add_all(taxes + items)
+        db.session.commit()
+        
+        estimate_service.create_estimates_bulk(user.id, [
+            {'customer_id': 1 + i % 20,
+             'items': [{'item_id': 1 + (i * 7 + line) % 50, 'quantity': 1 + line} for line in range(8)]}
+            for i in range(count)
+        ])
+        page, _ = estimate_service.get_user_estimates(user.id, 1, count)
+        
+        # Encoder cost only: the legacy page is converted once up front
+        legacy_page = legacy_values(page)
+        fast = FastJSONProvider(app)
+        stdlib = FastJSONProvider(app)
+        stdlib.use_orjson = False
+        assert json.loads(json.dumps(legacy_page)) == json.loads(fast.dumps(page)) == json.loads(stdlib.dumps(page))
+        
+        print(f'{count} estimate page, {len(fast.dumps(page)):,} bytes')
+        print(f'  pre-converted + json (original): '
+              f'{measure(lambda: json.dumps(legacy_page, separators=(",", ":"), sort_keys=True), repeat=50)}')
+        print(f'  raw + provider (json):           {measure(lambda: stdlib.dumps(page), repeat=50)}')
+        print(f'  raw + provider (orjson):         {measure(lambda: fast.dumps(page), repeat=50)}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,48 @@
+"""
+Search Latency Benchmark
+Compares the original unbounded ILIKE search with the ranked trigram
+search over 100k items.
+
+Usage: python -m benchmarks.search_latency [rows]
+"""
+import random
+import sys
+from benchmarks.common import create_benchmark_app, measure, timer
+
+WORDS = ['web', 'design', 'hosting', 'logo', 'consulting', 'audit', 'cloud', 'backup',
+         'support', 'license', 'training', 'server', 'migration', 'security', 'report']
+
+
+def main(rows=100000):
+    app = create_benchmark_app()
+    
+    from app.extensions import db
+    from app.models.item import Item
+    from app.repositories.item_repository import ItemRepository
+    
+    rng = random.Random(42)
+    with app.app_context():
+        with timer(f'insert {rows} items'):
+            db.session.execute(Item.__table__.insert(), [
+                {'name': ' '.join(rng.sample(WORDS, 3)) + f' {i}', 'price': 10}
+                for i in range(rows)
+            ])
+            db.session.commit()
+        
+        repo = ItemRepository()
+        with timer('build in-process index'):
+            repo.search_by_name('warmup')
+        
+        for term in ['design', 'web hostng', 'securty audit']:
+            legacy = measure(lambda: [
+                item.to_dict() for item in
+                Item.query.filter(Item.name.ilike(f'%{term}%')).all()
+            ], repeat=5)
+            ranked = measure(lambda: [
+                item.to_dict() for item in repo.search_by_name(term, limit=20)[0]
+            ], repeat=5)
+            print(f'{term!r:18} ilike (all rows): {legacy}  trigram (limit 20): {ranked}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
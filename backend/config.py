@@ -9,6 +9,59 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def engine_options(database_uri, pool_size=5, max_overflow=10, pool_timeout=30,
+                   pool_recycle=1800, statement_timeout_ms=30000):
+    """
+    SQLAlchemy engine options for a database, overridable from the environment
+    
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT (seconds), DB_POOL_RECYCLE
+    (seconds), DB_POOL_PRE_PING and DB_STATEMENT_TIMEOUT_MS (PostgreSQL
+    only, 0 to disable) replace the given defaults. In-memory SQLite keeps
+    SQLAlchemy's single-connection pool and gets no options.
+    
+    Args:
+        database_uri: Database URL the options are for
+        pool_size, max_overflow, pool_timeout, pool_recycle,
+        statement_timeout_ms: Defaults for the configuration class
+    
+    Returns:
+        dict: Value for SQLALCHEMY_ENGINE_OPTIONS
+    """
+    if database_uri in ('sqlite://', 'sqlite:///:memory:'):
+        return {}
+    
+    options = {
+        'pool_size': int(os.getenv('DB_POOL_SIZE', pool_size)),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', max_overflow)),
+        'pool_timeout': float(os.getenv('DB_POOL_TIMEOUT', pool_timeout)),
+        'pool_recycle': int(os.getenv('DB_POOL_RECYCLE', pool_recycle)),
+        # Replace connections a database restart or failover closed
+        'pool_pre_ping': os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true'),
+    }
+    
+    statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT_MS', statement_timeout_ms))
+    if statement_timeout and database_uri.startswith('postgresql'):
+        options['connect_args'] = {'options': f'-c statement_timeout={statement_timeout}'}
+    
+    return options
+
+
+def replica_binds(replica_uri, **pool):
+    """
+    SQLALCHEMY_BINDS with the read replica, if a replica URL is set
+    
+    Args:
+        replica_uri: Replica database URL (empty for no replica)
+        pool: engine_options defaults for the replica
+    
+    Returns:
+        dict: Value for SQLALCHEMY_BINDS
+    """
+    if not replica_uri:
+        return {}
+    return {'replica': {'url': replica_uri, **engine_options(replica_uri, **pool)}}
+
+
 class Config:
     """Base configuration class with common settings"""
     
@@ -17,7 +70,21 @@ class Config:
     
     # Database configuration
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'postgresql://localhost/wave_db')
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI)
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    
+    # Read replica for GET reads (empty to read from the primary); a client
+    # reads from the primary for REPLICA_STICKY_SECONDS after its writes (a
+    # cookie, so on every worker), and a failing replica is skipped for
+    # REPLICA_RETRY_SECONDS
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('DATABASE_REPLICA_URL', ''))
+    REPLICA_STICKY_SECONDS = float(os.getenv('REPLICA_STICKY_SECONDS', 5))
+    REPLICA_RETRY_SECONDS = float(os.getenv('REPLICA_RETRY_SECONDS', 30))
+    
+    # Serve the async views on pooled async engines; only safe when one event
+    # loop serves every request, so the ASGI entry point (asgi.py) turns it on
+    # (WSGI workers keep the async views on the pooled sync session)
+    ASYNC_DB_POOL = os.getenv('ASYNC_DB_POOL', 'false').lower() in ('1', 'true')
     SQLALCHEMY_ECHO = False
     
     # JWT configuration
@@ -33,10 +100,52 @@ class Config:
     # CORS configuration
     CORS_HEADERS = 'Content-Type'
     CORS_SUPPORTS_CREDENTIALS = True
+    CORS_EXPOSE_HEADERS = ['ETag']
     
     # Pagination
     ITEMS_PER_PAGE = 20
     MAX_ITEMS_PER_PAGE = 100
+    
+    # Total count strategy for list endpoints: exact, estimate or cached
+    PAGINATION_COUNT_STRATEGY = os.getenv('PAGINATION_COUNT_STRATEGY', 'exact')
+    COUNT_CACHE_TTL = int(os.getenv('COUNT_CACHE_TTL', 60))
+    
+    # Maximum number of results per search call
+    SEARCH_MAX_LIMIT = 100
+    
+    # Bulk create: rows per transaction and per request
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 500))
+    BULK_MAX_ROWS = int(os.getenv('BULK_MAX_ROWS', 10000))
+    # Estimate numbers each worker reserves at once for bulk creates
+    ESTIMATE_NUMBER_BLOCK_SIZE = int(os.getenv('ESTIMATE_NUMBER_BLOCK_SIZE', 100))
+    
+    # Customer and item imports: rows per COPY / multi-row INSERT transaction
+    IMPORT_CHUNK_SIZE = int(os.getenv('IMPORT_CHUNK_SIZE', 5000))
+    IMPORT_MAX_ROWS = int(os.getenv('IMPORT_MAX_ROWS', 100000))
+    
+    # Rows fetched per server-side cursor round trip when exporting
+    EXPORT_CHUNK_SIZE = int(os.getenv('EXPORT_CHUNK_SIZE', 1000))
+    
+    # Serialized payload cache: in-process LRU bounds and the shared tier
+    # ('local' for the in-process stand-in, empty to disable)
+    PAYLOAD_CACHE_MAX_ENTRIES = int(os.getenv('PAYLOAD_CACHE_MAX_ENTRIES', 10000))
+    PAYLOAD_CACHE_MAX_BYTES = int(os.getenv('PAYLOAD_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    PAYLOAD_CACHE_SHARED = os.getenv('PAYLOAD_CACHE_SHARED', '')
+    PAYLOAD_CACHE_TTL = int(os.getenv('PAYLOAD_CACHE_TTL', 3600))
+    
+    # gzip responses of at least this many bytes when the client accepts it
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    
+    # Per-request SQL profiling (Server-Timing header and a JSON log line);
+    # a SELECT repeated this many times in one request is logged as an N+1
+    QUERY_PROFILER = os.getenv('QUERY_PROFILER', 'true').lower() in ('1', 'true')
+    QUERY_PROFILER_N_PLUS_ONE_THRESHOLD = int(os.getenv('QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', 5))
+    
+    # /metrics: directory shared by worker processes (empty for a single
+    # process) and how often each process writes its values there
+    METRICS_MULTIPROC_DIR = os.getenv('METRICS_MULTIPROC_DIR', '')
+    METRICS_FLUSH_INTERVAL = float(os.getenv('METRICS_FLUSH_INTERVAL', 1.0))
 
 
 class DevelopmentConfig(Config):
@@ -56,6 +165,8 @@ class TestingConfig(Config):
         'TEST_DATABASE_URL',
         'postgresql://localhost/wave_test_db'
     )
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(SQLALCHEMY_DATABASE_URI, pool_size=2, max_overflow=2)
+    SQLALCHEMY_BINDS = replica_binds(os.getenv('TEST_DATABASE_REPLICA_URL', ''), pool_size=2, max_overflow=2)
     # Disable CSRF for testing
     WTF_CSRF_ENABLED = False
 
@@ -69,6 +180,15 @@ class ProductionConfig(Config):
     # JWT Cookie configuration for production
     JWT_COOKIE_SECURE = True  # Require HTTPS in production
     
+    # Sized for gunicorn's 2 threads per worker, with room for streamed
+    # exports holding a connection; recycle below typical proxy idle limits
+    SQLALCHEMY_ENGINE_OPTIONS = engine_options(
+        Config.SQLALCHEMY_DATABASE_URI, pool_size=4, max_overflow=4, pool_timeout=10, pool_recycle=900
+    )
+    SQLALCHEMY_BINDS = replica_binds(
+        os.getenv('DATABASE_REPLICA_URL', ''), pool_size=4, max_overflow=4, pool_timeout=10, pool_recycle=900
+    )
+    
     # In production, these MUST be set via environment variables
     if not os.getenv('SECRET_KEY'):
         raise ValueError("SECRET_KEY environment variable must be set in production")
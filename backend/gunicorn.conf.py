@@ -0,0 +1,22 @@
+"""
+Gunicorn Configuration
+Keeps the multiprocess metrics directory consistent with the worker set
+"""
+import os
+import shutil
+
+
+def on_starting(server):
+    """Start from an empty metrics directory"""
+    directory = os.getenv('METRICS_MULTIPROC_DIR')
+    if directory:
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+
+
+def child_exit(server, worker):
+    """Drop the gauges of a worker that exited"""
+    from app.utils.metrics import metrics
+    
+    metrics.configure(os.getenv('METRICS_MULTIPROC_DIR'))
+    metrics.mark_process_dead(worker.pid)
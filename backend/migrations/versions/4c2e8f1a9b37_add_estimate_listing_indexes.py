@@ -0,0 +1,48 @@
+"""Add estimate listing and association reverse-key indexes
+
+Revision ID: 4c2e8f1a9b37
+Revises: 8a608c9bec9e
+Create Date: 2026-10-17 09:12:31.402118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4c2e8f1a9b37'
+down_revision = '8a608c9bec9e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_estimates_user_id_date_id',
+            ['user_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False
+        )
+        batch_op.create_index(
+            'ix_estimates_customer_id_date_id',
+            ['customer_id', sa.text('date DESC'), sa.text('id DESC')],
+            unique=False
+        )
+
+    with op.batch_alter_table('estimate_items', schema=None) as batch_op:
+        batch_op.create_index('ix_estimate_items_item_id', ['item_id'], unique=False)
+
+    with op.batch_alter_table('item_taxes', schema=None) as batch_op:
+        batch_op.create_index('ix_item_taxes_tax_id', ['tax_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('item_taxes', schema=None) as batch_op:
+        batch_op.drop_index('ix_item_taxes_tax_id')
+
+    with op.batch_alter_table('estimate_items', schema=None) as batch_op:
+        batch_op.drop_index('ix_estimate_items_item_id')
+
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.drop_index('ix_estimates_customer_id_date_id')
+        batch_op.drop_index('ix_estimates_user_id_date_id')
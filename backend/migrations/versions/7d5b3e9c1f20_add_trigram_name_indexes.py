@@ -0,0 +1,41 @@
+"""Add pg_trgm GIN indexes for item and customer name search
+
+Revision ID: 7d5b3e9c1f20
+Revises: 4c2e8f1a9b37
+Create Date: 2026-10-17 10:03:47.118532
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7d5b3e9c1f20'
+down_revision = '4c2e8f1a9b37'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Trigram indexes are PostgreSQL only; other databases fall back to
+    # the in-process index in app/repositories/search.py
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_items_name_trgm', 'items', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_customers_name_trgm', 'customers', ['name'],
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}
+    )
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+
+    op.drop_index('ix_customers_name_trgm', table_name='customers')
+    op.drop_index('ix_items_name_trgm', table_name='items')
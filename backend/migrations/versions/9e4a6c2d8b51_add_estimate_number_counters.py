@@ -0,0 +1,46 @@
+"""Add per-year estimate number counters
+
+Revision ID: 9e4a6c2d8b51
+Revises: 7d5b3e9c1f20
+Create Date: 2026-10-17 10:41:09.552870
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4a6c2d8b51'
+down_revision = '7d5b3e9c1f20'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    counters = op.create_table('estimate_number_counters',
+    sa.Column('year', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('year')
+    )
+
+    # Seed each year's counter with the highest number already issued
+    pattern = re.compile(r'^EST-(\d{4})-(\d+)$')
+    highest = {}
+    rows = op.get_bind().execute(
+        sa.text("SELECT estimate_number FROM estimates WHERE estimate_number LIKE 'EST-%'")
+    )
+    for (estimate_number,) in rows:
+        match = pattern.match(estimate_number)
+        if match:
+            year, value = int(match.group(1)), int(match.group(2))
+            highest[year] = max(highest.get(year, 0), value)
+
+    if highest:
+        op.bulk_insert(counters, [
+            {'year': year, 'last_value': value} for year, value in highest.items()
+        ])
+
+
+def downgrade():
+    op.drop_table('estimate_number_counters')
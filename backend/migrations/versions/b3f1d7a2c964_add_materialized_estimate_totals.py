@@ -0,0 +1,38 @@
+"""Add materialized estimate totals and line tax rates
+
+Revision ID: b3f1d7a2c964
+Revises: 9e4a6c2d8b51
+Create Date: 2026-10-17 14:02:37.118406
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f1d7a2c964'
+down_revision = '9e4a6c2d8b51'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Nullable so existing rows stay valid; fill them with
+    # `flask backfill-estimate-totals`
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('subtotal', sa.Numeric(precision=12, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('tax_total', sa.Numeric(precision=12, scale=2), nullable=True))
+        batch_op.add_column(sa.Column('total', sa.Numeric(precision=12, scale=2), nullable=True))
+
+    with op.batch_alter_table('estimate_items', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('tax_rate', sa.Numeric(precision=7, scale=2), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('estimate_items', schema=None) as batch_op:
+        batch_op.drop_column('tax_rate')
+
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.drop_column('total')
+        batch_op.drop_column('tax_total')
+        batch_op.drop_column('subtotal')
@@ -0,0 +1,31 @@
+"""Add covering date index for estimate reports
+
+Revision ID: c5a9e2f4b718
+Revises: b3f1d7a2c964
+Create Date: 2026-10-17 15:20:44.690231
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5a9e2f4b718'
+down_revision = 'b3f1d7a2c964'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_estimates_date_report',
+            ['date'],
+            unique=False,
+            postgresql_include=['status', 'total', 'customer_id', 'user_id']
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('estimates', schema=None) as batch_op:
+        batch_op.drop_index('ix_estimates_date_report')
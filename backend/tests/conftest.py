@@ -1,9 +1,17 @@
 """
 Test Configuration
 """
+import random
+from datetime import date
+from decimal import Decimal
 import pytest
+from flask_jwt_extended import create_access_token
 from app import create_app
 from app.extensions import db as _db
+from app.repositories.counting import count_cache
+from app.repositories.estimate_repository import estimate_number_block
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.payload_cache import payload_cache
 from config import TestingConfig
 
 
@@ -25,6 +33,10 @@ def db(app):
     
     _db.session.remove()
     _db.drop_all()
+    count_cache.clear()
+    estimate_number_block.clear()
+    tax_catalog.clear()
+    payload_cache.clear()
 
 
 @pytest.fixture(scope='function')
@@ -37,3 +49,78 @@ def client(app):
 def runner(app):
     """Create test CLI runner"""
     return app.test_cli_runner()
+
+
+@pytest.fixture(scope='function')
+def make_estimates(db):
+    """
+    Factory creating estimates with random lines over a small catalog
+    
+    The user, customer, taxes and items are created on first use and
+    shared by every later call within the test.
+    """
+    from app.models.user import User
+    from app.models.customer import Customer
+    from app.models.tax import Tax
+    from app.models.item import Item
+    from app.models.estimate import Estimate, estimate_items
+    
+    catalog = {}
+    
+    def _make(count, seed=7):
+        rng = random.Random(seed)
+        
+        if not catalog:
+            user = User(email='owner@example.com')
+            user.set_password('Password123')
+            customers = [Customer(name=f'Customer {i}', email=f'customer{i}@example.com')
+                         for i in range(5)]
+            taxes = [Tax(name=f'Tax {i}', amount=amount)
+                     for i, amount in enumerate(['18.00', '5.00', '12.00', '7.50', '2.25'])]
+            _db.session.add_all([user] + customers + taxes)
+            _db.session.flush()
+            
+            items = []
+            for i in range(20):
+                item = Item(name=f'Item {i}', price=Decimal(rng.randint(1, 100000)) / 100)
+                item.taxes = rng.sample(taxes, rng.randint(0, 3))
+                items.append(item)
+            _db.session.add_all(items)
+            _db.session.flush()
+            catalog.update(user=user, customers=customers, items=items)
+        
+        estimates = []
+        for _ in range(count):
+            estimate = Estimate(
+                estimate_number=f'EST-TEST-{len(catalog.setdefault("estimates", [])):05d}',
+                customer_id=rng.choice(catalog['customers']).id,
+                user_id=catalog['user'].id,
+                date=date(2026, 1, rng.randint(1, 28)),
+                valid_until=date(2026, 2, 28)
+            )
+            _db.session.add(estimate)
+            _db.session.flush()
+            for item in rng.sample(catalog['items'], rng.randint(1, 8)):
+                _db.session.execute(estimate_items.insert().values(
+                    estimate_id=estimate.id,
+                    item_id=item.id,
+                    quantity=rng.randint(1, 20),
+                    unit_price=Decimal(rng.randint(1, 100000)) / 100
+                ))
+            catalog['estimates'].append(estimate)
+            estimates.append(estimate)
+        
+        _db.session.commit()
+        return estimates
+    
+    return _make
+
+
+@pytest.fixture(scope='function')
+def auth_headers(app):
+    """Build Authorization headers carrying an access token for a user ID"""
+    def _headers(user_id):
+        token = create_access_token(identity=str(user_id))
+        return {'Authorization': f'Bearer {token}'}
+    
+    return _headers
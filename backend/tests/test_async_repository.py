@@ -0,0 +1,215 @@
+"""
+Test Async Repositories and Views
+"""
+import asyncio
+import json
+import threading
+import pytest
+from flask import request_started
+from sqlalchemy import event
+from app import create_app
+from app.extensions import async_db, db
+from app.models.item import Item
+from app.repositories.async_base_repository import AsyncBaseRepository
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.asgi import AsgiApp
+from config import TestingConfig
+
+
+def create_file_app(tmp_path, monkeypatch, async_db_pool: bool):
+    """App on a SQLite file, which the async engine opens too (unlike in-memory SQLite)"""
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "wave.db"}')
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+    monkeypatch.setattr(TestingConfig, 'ASYNC_DB_POOL', async_db_pool)
+    return create_app('testing')
+
+
+@pytest.fixture
+def file_app(tmp_path, monkeypatch):
+    """SQLite file app with async engines, as under asgi.py"""
+    app = create_file_app(tmp_path, monkeypatch, async_db_pool=True)
+    
+    with app.app_context():
+        yield app
+        db.session.remove()
+
+
+@pytest.fixture
+def wsgi_file_app(tmp_path, monkeypatch):
+    """SQLite file app as served by a WSGI server (app:create_app)"""
+    app = create_file_app(tmp_path, monkeypatch, async_db_pool=False)
+    
+    with app.app_context():
+        yield app
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def run(file_app):
+    """
+    Run coroutines on one event loop, as under asgi.py (pooled async
+    connections must not outlive their loop)
+    """
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(async_db.dispose())
+    loop.close()
+
+
+def call_asgi(run, app, path, headers, method='GET'):
+    """Send one HTTP request through an ASGI app; return (status, headers, body)"""
+    route, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': route,
+        'raw_path': route.encode(),
+        'query_string': query.encode(),
+        'root_path': '',
+        'headers': [(name.lower().encode(), value.encode()) for name, value in headers.items()],
+        'client': ('127.0.0.1', 12345),
+        'server': ('localhost', 80),
+    }
+    messages = []
+    
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+    
+    async def send(message):
+        messages.append(message)
+    
+    run(app(scope, receive, send))
+    start, *bodies = messages
+    return start['status'], dict(start['headers']), b''.join(body.get('body', b'') for body in bodies)
+
+
+def sync_get(app, monkeypatch, url, headers):
+    """GET a URL through the WSGI test client with the async views on the sync session"""
+    with monkeypatch.context() as patch:
+        patch.setitem(app.extensions, 'async_db', None)
+        return app.test_client().get(url, headers=headers).get_json()
+
+
+@pytest.mark.parametrize('url', [
+    '/api/v1/estimates?per_page=5&page=2',
+    '/api/v1/estimates?fields=estimate_number,total&include=',
+    '/api/v1/estimates?format=columnar&fields=estimate_number,total',
+    '/api/v1/items?per_page=7&page=3',
+    '/api/v1/customers?fields=name',
+])
+def test_async_views_match_sync(file_app, run, make_estimates, auth_headers, monkeypatch, url):
+    """Test the async list views read through the async engine and return what the sync path does"""
+    estimates = make_estimates(12)
+    headers = auth_headers(estimates[0].user_id)
+    asgi_app = AsgiApp(file_app, threads=4)
+    
+    statements = []
+    
+    def listener(conn, cursor, statement, *args):
+        statements.append(statement)
+    
+    event.listen(async_db.engine.sync_engine, 'before_cursor_execute', listener)
+    try:
+        status, _, body = call_asgi(run, asgi_app, url, headers)
+    finally:
+        event.remove(async_db.engine.sync_engine, 'before_cursor_execute', listener)
+    assert status == 200
+    assert statements
+    assert json.loads(body) == sync_get(file_app, monkeypatch, url, headers)
+
+
+def test_wsgi_app_keeps_async_views_on_the_sync_pool(wsgi_file_app, make_estimates, auth_headers):
+    """Test that without asgi.py there is no async engine, and list views reuse the sync pool's connections"""
+    assert wsgi_file_app.extensions['async_db'] is None
+    estimates = make_estimates(3)
+    headers = auth_headers(estimates[0].user_id)
+    client = wsgi_file_app.test_client()
+    client.get('/api/v1/estimates', headers=headers)
+    
+    connects = []
+    event.listen(db.engine, 'connect', lambda *args: connects.append(args))
+    for url in ('/api/v1/estimates', '/api/v1/items', '/api/v1/customers') * 3:
+        assert client.get(url, headers=headers).status_code == 200
+    assert connects == []
+    assert db.engine.pool.checkedout() <= 1
+
+
+def test_async_base_repository(file_app, run, make_estimates):
+    """Test get_by_id, get_all, count and get_paginated on the async session"""
+    make_estimates(1)
+    item = Item.query.order_by(Item.name).first()
+    repository = AsyncBaseRepository(Item)
+    
+    async def reads():
+        loaded = await repository.get_by_id(item.id, columns=['name'])
+        matching = await repository.get_all({'name': item.name})
+        total = await repository.count()
+        page, page_total = await repository.get_paginated(per_page=3, order_by='name', desc=False, as_rows=True)
+        return loaded, matching, total, page, page_total
+    
+    loaded, matching, total, page, page_total = run(reads())
+    assert loaded.name == item.name
+    assert [match.id for match in matching] == [item.id]
+    assert total == page_total == Item.query.count()
+    assert page.column('name')[0] == item.name and len(page) == 3
+    
+    with pytest.raises(ValueError, match='Invalid count strategy'):
+        run(repository.get_paginated(count_strategy='bogus'))
+
+
+def test_asgi_app_dispatches_async_views_on_the_loop(file_app, run, make_estimates, auth_headers, monkeypatch):
+    """
+    Test AsgiApp runs the list views on the event loop's thread, their
+    blocking calls in its pool, and other views in a request thread
+    """
+    estimates = make_estimates(6)
+    headers = auth_headers(estimates[0].user_id)
+    expected = sync_get(file_app, monkeypatch, '/api/v1/estimates?per_page=4', headers)
+    asgi_app = AsgiApp(file_app, threads=4)
+    
+    threads = []
+    sync_threads = []
+    tax_rates = tax_catalog.tax_rates
+    
+    def record_thread(sender, **extra):
+        threads.append(threading.current_thread())
+    
+    def record_sync_thread(item_ids):
+        sync_threads.append(threading.current_thread().name)
+        return tax_rates(item_ids)
+    
+    monkeypatch.setattr(tax_catalog, 'tax_rates', record_sync_thread)
+    request_started.connect(record_thread, file_app)
+    try:
+        status, _, body = call_asgi(run, asgi_app, '/api/v1/estimates?per_page=4', headers)
+        assert status == 200
+        assert json.loads(body) == expected
+        assert threads == [threading.main_thread()]
+        assert sync_threads and all(name.startswith('asgi-sync') for name in sync_threads)
+        
+        status, response_headers, body = call_asgi(run, asgi_app, '/api/v1/estimates?per_page=4', headers, 'HEAD')
+        assert status == 200 and body == b'' and b'etag' in response_headers
+        
+        status, _, body = call_asgi(run, asgi_app, f'/api/v1/estimates/{estimates[0].id}', headers)
+        assert status == 200
+        assert json.loads(body)['estimate']['id'] == estimates[0].id
+        assert threads[-1] is not threading.main_thread()
+    finally:
+        request_started.disconnect(record_thread, file_app)
+    
+    # Cursor pages run in the shared pool
+    status, _, body = call_asgi(run, asgi_app, '/api/v1/estimates?per_page=4&cursor=', headers)
+    assert status == 200 and len(json.loads(body)['estimates']) == 4
+
+
+def test_asgi_app_without_async_engine(file_app, monkeypatch):
+    """Test AsgiApp only dispatches async views on the loop when there is an async engine"""
+    assert 'api_v1.get_user_estimates' in AsgiApp(file_app).loop_endpoints
+    assert 'api_v1.get_estimate' not in AsgiApp(file_app).loop_endpoints
+    
+    monkeypatch.setitem(file_app.extensions, 'async_db', None)
+    assert not AsgiApp(file_app).loop_endpoints
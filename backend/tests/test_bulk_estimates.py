@@ -0,0 +1,87 @@
+"""
+Test Bulk Estimate Creation
+"""
+import json
+from datetime import datetime
+from app.models.estimate import Estimate
+from app.services.estimate_service import estimate_service
+from tests.test_estimate_hydration import count_queries
+
+
+def test_bulk_create_reports_each_row(client, auth_headers, make_estimates):
+    """Test valid rows are created and invalid rows get their own error"""
+    estimate = make_estimates(1)[0]
+    rows = [
+        {'customer_id': estimate.customer_id, 'items': [{'item_id': 1, 'quantity': 2}]},
+        {'customer_id': 999, 'items': [{'item_id': 1}]},
+        {'customer_id': estimate.customer_id, 'items': [{'item_id': 998}]},
+        {'customer_id': estimate.customer_id, 'items': [{'item_id': 2}],
+         'estimate_number': estimate.estimate_number},
+        'not an object',
+        {'customer_id': estimate.customer_id, 'items': [{'item_id': 3}]}
+    ]
+    
+    response = client.post('/api/v1/estimates/bulk', json=rows,
+                           headers=auth_headers(estimate.user_id))
+    
+    assert response.status_code == 200
+    body = response.get_json()
+    assert (body['created'], body['failed']) == (2, 4)
+    assert [result['success'] for result in body['results']] == [True, False, False, False, False, True]
+    assert body['results'][1]['error'] == 'Customer not found'
+    assert body['results'][2]['error'] == 'Items not found: 998'
+    assert body['results'][3]['error'] == 'Estimate number already exists'
+    
+    first, last = body['results'][0], body['results'][5]
+    assert first['estimate_number'] < last['estimate_number']
+    assert Estimate.query.filter_by(id=first['estimate_id']).one().to_dict()['items'][0]['quantity'] == 2
+
+
+def test_bulk_create_accepts_ndjson(client, auth_headers, make_estimates):
+    """Test NDJSON bodies are read line by line"""
+    estimate = make_estimates(1)[0]
+    row = {'customer_id': estimate.customer_id, 'items': [{'item_id': 1}]}
+    body = '\n'.join(json.dumps(row) for _ in range(3)) + '\n'
+    
+    response = client.post('/api/v1/estimates/bulk', data=body,
+                           content_type='application/x-ndjson',
+                           headers=auth_headers(estimate.user_id))
+    assert response.get_json()['created'] == 3
+    
+    response = client.post('/api/v1/estimates/bulk', data=body + '{oops\n',
+                           content_type='application/x-ndjson',
+                           headers=auth_headers(estimate.user_id))
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Invalid JSON on line 4'
+
+
+def test_bulk_create_rejects_duplicate_numbers_within_request(make_estimates):
+    """Test a number requested twice in one batch is only used once"""
+    estimate = make_estimates(1)[0]
+    number = f'EST-{datetime.now().year}-0500'
+    row = {'customer_id': estimate.customer_id, 'items': [{'item_id': 1}], 'estimate_number': number}
+    
+    results = estimate_service.create_estimates_bulk(estimate.user_id, [row, row])
+    
+    assert [result['success'] for result in results] == [True, False]
+    assert estimate_service.create_estimates_bulk(
+        estimate.user_id, [{'customer_id': estimate.customer_id, 'items': [{'item_id': 1}]}]
+    )[0]['estimate_number'] > number
+
+
+def test_bulk_create_query_count_is_per_chunk(make_estimates):
+    """Test the number of statements depends on chunks, not rows"""
+    estimate = make_estimates(1)[0]
+    
+    def create(count):
+        rows = [
+            {'customer_id': estimate.customer_id, 'items': [{'item_id': 1 + i % 20}, {'item_id': 2}]}
+            for i in range(count)
+        ]
+        with count_queries() as statements:
+            results = estimate_service.create_estimates_bulk(estimate.user_id, rows, chunk_size=50)
+        assert all(result['success'] for result in results)
+        return len(statements)
+    
+    create(1)  # Seeds this year's number counter
+    assert create(5) == create(50)
@@ -0,0 +1,28 @@
+"""
+Test CLI Commands
+"""
+from app.cli import capture_repository_queries, explain, plan_problems
+
+
+def test_estimate_listing_queries_use_indexes(make_estimates):
+    """Test estimate listing and lookups do not scan the tables"""
+    make_estimates(30)
+    
+    for name, statements in capture_repository_queries():
+        if not name.startswith('EstimateRepository.'):
+            continue
+        assert statements, name
+        for statement, parameters in statements:
+            assert plan_problems(explain(statement, parameters)) == [], (name, statement)
+
+
+def test_explain_queries_command(runner, make_estimates):
+    """Test the explain-queries command reports every repository query"""
+    make_estimates(5)
+    
+    result = runner.invoke(args=['explain-queries'])
+    
+    assert result.exit_code == 0
+    assert 'EstimateRepository.get_by_user' in result.output
+    assert 'ItemRepository.search_by_name' in result.output
+    assert 'flagged statement(s)' in result.output
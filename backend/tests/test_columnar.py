@@ -0,0 +1,103 @@
+"""
+Test Columnar List Responses and Compression
+"""
+import gzip
+import json
+from app.extensions import db
+from app.models.estimate import Estimate
+from app.repositories.estimate_repository import EstimateRepository
+from app.utils.columnar import COLUMNAR_MIMETYPE
+from tests.test_estimate_hydration import count_queries
+
+
+def rows_as_dicts(body):
+    """Expand a columnar body into one dict per row"""
+    return [dict(zip(body['columns'], row)) for row in body['rows']]
+
+
+def test_columnar_matches_object_representation(client, auth_headers, make_estimates):
+    """Test columnar pages carry the same values, read without per-row queries"""
+    estimates = make_estimates(15)
+    headers = auth_headers(estimates[0].user_id)
+    EstimateRepository().backfill_totals()
+    
+    fields = 'estimate_number,status,date,total'
+    full = client.get(f'/api/v1/estimates?per_page=10&fields={fields}&include=', headers=headers)
+    with count_queries() as statements:
+        response = client.get(f'/api/v1/estimates?per_page=10&fields={fields}&format=columnar', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == COLUMNAR_MIMETYPE
+    assert 'Accept' in response.vary
+    body = response.get_json()
+    assert body['columns'] == ['id', 'updated_at', 'date', 'estimate_number', 'status', 'total']
+    assert rows_as_dicts(body) == full.get_json()['estimates']
+    assert (body['total'], body['page'], body['total_pages']) == (15, 1, 2)
+    assert 'estimates' not in body
+    assert len(statements) == 2  # count and page
+    assert response.headers['ETag'] != full.headers['ETag']
+    
+    accepted = client.get(f'/api/v1/estimates?per_page=10&fields={fields}',
+                          headers={**headers, 'Accept': COLUMNAR_MIMETYPE})
+    assert accepted.get_json()['rows'] == body['rows']
+
+
+def test_columnar_cursor_and_unmaterialized_totals(client, auth_headers, make_estimates):
+    """Test cursor pages and totals computed for rows not backfilled yet"""
+    estimates = make_estimates(5)
+    headers = auth_headers(estimates[0].user_id)
+    expected = {estimate.id: estimate.calculate_total() for estimate in estimates}
+    db.session.execute(db.update(Estimate).where(Estimate.id == estimates[0].id).values(total=None))
+    db.session.commit()
+    
+    seen, cursor = {}, ''
+    while cursor is not None:
+        body = client.get(f'/api/v1/estimates?format=columnar&per_page=2&cursor={cursor}',
+                          headers=headers).get_json()
+        seen.update((row['id'], row['total']) for row in rows_as_dicts(body))
+        cursor = body['next_cursor']
+    
+    assert seen == expected
+
+
+def test_columnar_lists_and_include_rejected(client, auth_headers, make_estimates):
+    """Test item, customer and customer-estimate lists, and that include= is refused"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    
+    items = client.get('/api/v1/items?format=columnar&fields=name,price', headers=headers).get_json()
+    assert items['columns'] == ['id', 'updated_at', 'name', 'price']
+    customers = client.get('/api/v1/customers?format=columnar', headers=headers).get_json()
+    assert customers['columns'][:2] == ['id', 'updated_at'] and 'email' in customers['columns']
+    by_customer = client.get(f'/api/v1/customers/{estimate.customer_id}/estimates?format=columnar',
+                             headers=headers).get_json()
+    assert rows_as_dicts(by_customer)[0]['estimate_number'] == estimate.estimate_number
+    
+    response = client.get('/api/v1/items?format=columnar&include=taxes', headers=headers)
+    assert response.status_code == 400
+
+
+def test_gzip_negotiation(client, auth_headers, make_estimates):
+    """Test large bodies are gzipped for clients that accept it, with weak ETags"""
+    estimates = make_estimates(20)
+    headers = auth_headers(estimates[0].user_id)
+    
+    plain = client.get('/api/v1/estimates?per_page=20', headers=headers)
+    compressed = client.get('/api/v1/estimates?per_page=20', headers={**headers, 'Accept-Encoding': 'gzip'})
+    
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.vary
+    assert json.loads(gzip.decompress(compressed.data)) == plain.get_json()
+    assert len(compressed.data) < len(plain.data)
+    
+    refused = client.get('/api/v1/estimates?per_page=20', headers={**headers, 'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers
+    
+    # Strong ETags become weak once compressed and still revalidate
+    url = f'/api/v1/estimates/{estimates[0].id}'
+    detail = client.get(url, headers={**headers, 'Accept-Encoding': 'gzip'})
+    assert detail.headers['Content-Encoding'] == 'gzip'
+    assert detail.headers['ETag'].startswith('W/')
+    revalidated = client.get(url, headers={**headers, 'If-None-Match': detail.headers['ETag']})
+    assert revalidated.status_code == 304
@@ -0,0 +1,25 @@
+"""
+Test Database Engine Options
+"""
+from config import engine_options
+
+
+def test_engine_options_from_environment(monkeypatch):
+    """Test pool settings take class defaults, environment overrides and skip in-memory SQLite"""
+    assert engine_options('sqlite://') == {}
+    
+    options = engine_options('postgresql://db/wave', pool_size=4, pool_recycle=900)
+    assert options['pool_size'] == 4 and options['pool_recycle'] == 900
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=30000'}
+    
+    monkeypatch.setenv('DB_POOL_SIZE', '12')
+    monkeypatch.setenv('DB_POOL_PRE_PING', 'false')
+    monkeypatch.setenv('DB_STATEMENT_TIMEOUT_MS', '0')
+    options = engine_options('postgresql://db/wave', pool_size=4)
+    assert options['pool_size'] == 12
+    assert options['pool_pre_ping'] is False
+    assert 'connect_args' not in options
+    
+    # File SQLite pools connections too, without a statement timeout
+    assert 'connect_args' not in engine_options('sqlite:////tmp/wave.db', statement_timeout_ms=5)
@@ -0,0 +1,88 @@
+"""
+Test Estimate Export
+"""
+import csv
+import io
+import json
+import tracemalloc
+from app.services.estimate_service import estimate_service
+
+
+def add_estimates(template, count):
+    """Bulk-create count estimates like template, with three lines each"""
+    rows = [
+        {'customer_id': template.customer_id,
+         'items': [{'item_id': 1 + (i + line) % 20, 'quantity': 1 + line} for line in range(3)]}
+        for i in range(count)
+    ]
+    results = estimate_service.create_estimates_bulk(template.user_id, rows)
+    assert all(result['success'] for result in results)
+
+
+def test_export_ndjson_matches_detail_view(client, auth_headers, make_estimates):
+    """Test every estimate is exported once with the same data as GET /estimates/<id>"""
+    estimates = make_estimates(7)
+    headers = auth_headers(estimates[0].user_id)
+    
+    response = client.get('/api/v1/estimates/export?format=ndjson', headers=headers)
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    rows = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert sorted(row['id'] for row in rows) == sorted(estimate.id for estimate in estimates)
+    
+    detail = client.get(f'/api/v1/estimates/{rows[0]["id"]}', headers=headers).get_json()
+    assert rows[0] == detail['estimate']
+
+
+def test_export_csv(client, auth_headers, make_estimates):
+    """Test CSV export has a header and one row per estimate"""
+    estimates = make_estimates(3)
+    
+    response = client.get('/api/v1/estimates/export?format=csv',
+                          headers=auth_headers(estimates[0].user_id))
+    
+    assert response.mimetype == 'text/csv'
+    rows = list(csv.DictReader(io.StringIO(response.get_data(as_text=True))))
+    assert len(rows) == 3
+    assert rows[0]['customer_name'].startswith('Customer')
+    assert int(rows[0]['item_count']) >= 1
+
+
+def test_export_rejects_unknown_format(client, auth_headers, make_estimates):
+    """Test only ndjson and csv are accepted"""
+    estimates = make_estimates(1)
+    
+    response = client.get('/api/v1/estimates/export?format=xml',
+                          headers=auth_headers(estimates[0].user_id))
+    
+    assert response.status_code == 400
+
+
+def test_export_memory_is_flat(app, client, auth_headers, make_estimates):
+    """Test peak memory while streaming does not grow with the number of estimates"""
+    template = make_estimates(1)[0]
+    headers = auth_headers(template.user_id)
+    app.config['EXPORT_CHUNK_SIZE'] = 100
+    
+    def export_peak():
+        tracemalloc.start()
+        try:
+            response = client.get('/api/v1/estimates/export', headers=headers)
+            lines = sum(chunk.count(b'\n') for chunk in response.response)
+            return lines, tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    try:
+        add_estimates(template, 299)
+        export_peak()  # Warm up statement caches
+        small_lines, small_peak = export_peak()
+        
+        add_estimates(template, 2700)
+        large_lines, large_peak = export_peak()
+    finally:
+        app.config['EXPORT_CHUNK_SIZE'] = 1000
+    
+    assert (small_lines, large_lines) == (300, 3000)
+    assert large_peak < small_peak * 1.5
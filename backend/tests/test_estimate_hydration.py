@@ -0,0 +1,51 @@
+"""
+Test Estimate Page Hydration
+"""
+from contextlib import contextmanager
+from app.extensions import db as _db
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.query_profiler import profile_queries
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed inside the block"""
+    with profile_queries() as profile:
+        yield profile.statements
+
+
+def test_estimate_list_query_count_is_constant(client, make_estimates, auth_headers):
+    """Test GET /estimates issues the same number of queries as the page grows"""
+    estimates = make_estimates(5)
+    headers = auth_headers(estimates[0].user_id)
+    
+    tax_catalog.clear()
+    with count_queries() as small_page:
+        response = client.get('/api/v1/estimates?per_page=100', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['estimates']) == 5
+    
+    make_estimates(60, seed=11)
+    _db.session.expire_all()
+    
+    tax_catalog.clear()
+    with count_queries() as large_page:
+        response = client.get('/api/v1/estimates?per_page=100', headers=headers)
+    assert response.status_code == 200
+    assert len(response.get_json()['estimates']) == 65
+    
+    assert len(large_page) == len(small_page)
+
+
+def test_hydrated_payload_matches_unhydrated(make_estimates):
+    """Test hydrated to_dict output is identical to the lazy path"""
+    from app.repositories.estimate_repository import EstimateRepository
+    
+    estimates = make_estimates(10)
+    hydrated = EstimateRepository().hydrate(estimates)
+    
+    for estimate in estimates:
+        assert estimate.to_dict(preloaded=hydrated[estimate.id]) == estimate.to_dict()
+        assert hydrated[estimate.id]['total'] == EstimateRepository().calculate_totals(
+            [estimate.id]
+        )[estimate.id]
@@ -0,0 +1,60 @@
+"""
+Test Estimate Service
+"""
+import pytest
+from app.services.estimate_service import estimate_service
+from tests.test_estimate_hydration import count_queries
+
+
+def test_missing_items_reported_together(make_estimates):
+    """Test every unknown item ID is reported in one error"""
+    estimates = make_estimates(1)
+    data = {
+        'customer_id': estimates[0].customer_id,
+        'items': [{'item_id': 1}, {'item_id': 998}, {'item_id': 999}]
+    }
+    
+    with pytest.raises(ValueError, match='Items not found: 998, 999'):
+        estimate_service.create_estimate(estimates[0].user_id, data)
+
+
+def test_duplicate_items_are_merged(make_estimates):
+    """Test repeated item IDs with the same price become one line"""
+    estimates = make_estimates(1)
+    data = {
+        'customer_id': estimates[0].customer_id,
+        'items': [{'item_id': 3, 'quantity': 2}, {'item_id': 3, 'quantity': 5}]
+    }
+    
+    estimate = estimate_service.create_estimate(estimates[0].user_id, data)
+    
+    assert [(line['id'], line['quantity']) for line in estimate['items']] == [(3, 7)]
+
+
+def test_duplicate_items_with_conflicting_prices_rejected(make_estimates):
+    """Test repeated item IDs with different prices are rejected up front"""
+    estimates = make_estimates(1)
+    data = {
+        'customer_id': estimates[0].customer_id,
+        'items': [{'item_id': 3, 'unit_price': 5}, {'item_id': 3, 'unit_price': 6}]
+    }
+    
+    with pytest.raises(ValueError, match='more than once'):
+        estimate_service.create_estimate(estimates[0].user_id, data)
+
+
+def test_validation_query_count_is_constant(make_estimates):
+    """Test validating 2 or 15 lines costs the same number of queries"""
+    estimates = make_estimates(1)
+    
+    def create(count):
+        data = {
+            'customer_id': estimates[0].customer_id,
+            'items': [{'item_id': i} for i in range(1, count + 1)]
+        }
+        with count_queries() as statements:
+            estimate_service.create_estimate(estimates[0].user_id, data)
+        return len(statements)
+    
+    create(1)  # Seeds this year's number counter
+    assert create(2) == create(15)
@@ -0,0 +1,79 @@
+"""
+Test Estimate Totals
+"""
+from decimal import Decimal, ROUND_HALF_EVEN
+from app.extensions import db as _db
+from app.models.item import Item
+from app.models.estimate import estimate_items
+from app.models.tax import Tax
+from app.repositories.estimate_repository import EstimateRepository
+
+
+def legacy_float_total(estimate):
+    """Reference implementation of the original per-line float calculation"""
+    total = 0
+    for item_data in estimate.get_estimate_items():
+        item = _db.session.get(Item, item_data.item_id)
+        item_subtotal = item_data.quantity * float(item_data.unit_price)
+        tax_amount = 0
+        for tax in item.taxes:
+            tax_amount += item_subtotal * (float(tax.amount) / 100)
+        total += item_subtotal + tax_amount
+    return round(total, 2)
+
+
+def exact_total(estimate):
+    """Unrounded Decimal total of an estimate"""
+    total = Decimal('0')
+    for item_data in estimate.get_estimate_items():
+        item = _db.session.get(Item, item_data.item_id)
+        subtotal = item_data.quantity * Decimal(item_data.unit_price)
+        rate = sum((Decimal(tax.amount) for tax in item.taxes), Decimal('0'))
+        total += subtotal + subtotal * rate / 100
+    return total
+
+
+def test_calculate_totals_matches_float_path(make_estimates):
+    """Test the set-based totals match the float path, except at exact half-cent ties"""
+    estimates = make_estimates(200)
+    
+    totals = EstimateRepository().calculate_totals([e.id for e in estimates])
+    
+    assert set(totals) == {e.id for e in estimates}
+    for estimate in estimates:
+        exact = exact_total(estimate)
+        if (exact * 100) % 1 == Decimal('0.5'):
+            # The float path decided these by representation error; ties now go to even
+            assert totals[estimate.id] == exact.quantize(Decimal('0.01'), rounding=ROUND_HALF_EVEN)
+        else:
+            assert float(totals[estimate.id]) == legacy_float_total(estimate)
+
+
+def test_calculate_total_rounds_ties_to_even(make_estimates):
+    """Test an exact half-cent tie is rounded to even (the float path rounded it up)"""
+    estimate = make_estimates(1)[0]
+    item = Item(name='Half cent', price=Decimal('0.10'))
+    item.taxes = [Tax.query.filter_by(amount=Decimal('5.00')).one()]
+    _db.session.add(item)
+    _db.session.flush()
+    _db.session.execute(estimate_items.delete().where(estimate_items.c.estimate_id == estimate.id))
+    _db.session.execute(estimate_items.insert().values(
+        estimate_id=estimate.id, item_id=item.id, quantity=1, unit_price=Decimal('0.10')
+    ))
+    _db.session.commit()
+    
+    # 0.10 + 5% tax is exactly 0.105; floats see 0.10500000000000001 and round up
+    assert legacy_float_total(estimate) == 0.11
+    assert estimate.calculate_total() == 0.10
+
+
+def test_calculate_totals_empty_estimate(make_estimates):
+    """Test estimates without lines total to zero"""
+    estimates = make_estimates(1)
+    _db.session.execute(estimate_items.delete())
+    _db.session.commit()
+    
+    totals = EstimateRepository().calculate_totals([estimates[0].id])
+    
+    assert totals == {estimates[0].id: Decimal('0.00')}
+    assert EstimateRepository().calculate_totals([]) == {}
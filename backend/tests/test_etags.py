@@ -0,0 +1,89 @@
+"""
+Test ETags and Conditional GETs
+"""
+from app.extensions import db
+from app.models.customer import Customer
+from app.models.tax import Tax
+from app.services.item_service import item_service
+from tests.test_estimate_hydration import count_queries
+
+
+def test_estimate_not_modified_after_one_query(client, auth_headers, make_estimates):
+    """Test a matching If-None-Match gets 304 from a single version query"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    url = f'/api/v1/estimates/{estimate.id}'
+    
+    response = client.get(url, headers=headers)
+    etag = response.headers['ETag']
+    assert response.status_code == 200 and not etag.startswith('W/')
+    
+    with count_queries() as statements:
+        response = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+    
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.get_data() == b''
+    assert len(statements) == 1
+
+
+def test_estimate_etag_follows_related_rows(client, auth_headers, make_estimates):
+    """Test customer, item and tax changes all change the estimate ETag"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    url = f'/api/v1/estimates/{estimate.id}'
+    item_id = estimate.get_estimate_items()[0].item_id
+    
+    def etag():
+        return client.get(url, headers=headers).headers['ETag']
+    
+    seen = [etag()]
+    
+    Customer.query.filter_by(id=estimate.customer_id).one().phone = '555-0100'
+    db.session.commit()
+    seen.append(etag())
+    
+    tax = Tax(name='Extra', amount='3.00')
+    db.session.add(tax)
+    db.session.commit()
+    item_service.update_item(item_id, {'tax_ids': [tax.id]})
+    seen.append(etag())
+    
+    tax.amount = '4.00'
+    db.session.commit()
+    seen.append(etag())
+    
+    assert len(set(seen)) == len(seen)
+    response = client.get(url, headers=dict(headers, **{'If-None-Match': seen[0]}))
+    assert response.status_code == 200
+
+
+def test_item_and_customer_etags(client, auth_headers, make_estimates):
+    """Test item and customer detail routes honour If-None-Match"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    
+    for url in (f'/api/v1/items/{estimate.get_estimate_items()[0].item_id}',
+                f'/api/v1/customers/{estimate.customer_id}'):
+        etag = client.get(url, headers=headers).headers['ETag']
+        response = client.get(url, headers=dict(headers, **{'If-None-Match': etag}))
+        assert response.status_code == 304, url
+    
+    assert client.get('/api/v1/items/999', headers=headers).status_code == 404
+
+
+def test_list_weak_etag(client, auth_headers, make_estimates):
+    """Test list pages get a weak ETag that changes when the page does"""
+    estimate = make_estimates(3)[0]
+    headers = auth_headers(estimate.user_id)
+    
+    etag = client.get('/api/v1/estimates', headers=headers).headers['ETag']
+    assert etag.startswith('W/')
+    
+    response = client.get('/api/v1/estimates', headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 304
+    
+    make_estimates(1, seed=3)
+    response = client.get('/api/v1/estimates', headers=dict(headers, **{'If-None-Match': etag}))
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
@@ -0,0 +1,68 @@
+"""
+Test Sparse Fieldsets and Includes
+"""
+from tests.test_estimate_hydration import count_queries
+
+
+def get(client, headers, url):
+    """GET a URL, returning the JSON body and the SQL statements it ran"""
+    with count_queries() as statements:
+        response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), statements
+
+
+def test_estimate_list_fields_and_include(client, auth_headers, make_estimates):
+    """Test unrequested columns are not selected and relationships not loaded"""
+    estimates = make_estimates(20)
+    headers = auth_headers(estimates[0].user_id)
+    
+    full, full_statements = get(client, headers, '/api/v1/estimates?per_page=20')
+    sparse, sparse_statements = get(
+        client, headers, '/api/v1/estimates?per_page=20&fields=estimate_number,status&include='
+    )
+    
+    assert [set(estimate) for estimate in sparse['estimates']] == \
+        [{'id', 'updated_at', 'estimate_number', 'status'}] * 20
+    assert [e['id'] for e in sparse['estimates']] == [e['id'] for e in full['estimates']]
+    assert len(sparse_statements) < len(full_statements)
+    assert not any('estimate_items' in statement or 'customers' in statement
+                   for statement in sparse_statements)
+    page_query = next(statement for statement in sparse_statements if 'LIMIT' in statement)
+    assert 'footer_note' not in page_query and 'valid_until' not in page_query
+    
+    totals, statements = get(client, headers, '/api/v1/estimates?per_page=20&fields=total&include=customer')
+    assert [e['total'] for e in totals['estimates']] == [e['total'] for e in full['estimates']]
+    assert all(e['customer']['id'] == f['customer']['id']
+               for e, f in zip(totals['estimates'], full['estimates']))
+    assert 'items' not in totals['estimates'][0]
+
+
+def test_item_and_customer_fields(client, auth_headers, make_estimates):
+    """Test item taxes can be left out and customer columns trimmed"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    
+    items, statements = get(client, headers, '/api/v1/items?fields=name&include=')
+    assert set(items['items'][0]) == {'id', 'updated_at', 'name'}
+    assert not any('item_taxes' in statement or 'taxes' in statement for statement in statements)
+    
+    full = client.get(f'/api/v1/customers/{estimate.customer_id}', headers=headers)
+    sparse = client.get(f'/api/v1/customers/{estimate.customer_id}?fields=name', headers=headers)
+    assert sparse.get_json()['customer'] == {
+        key: full.get_json()['customer'][key] for key in ('id', 'updated_at', 'name')
+    }
+    assert sparse.headers['ETag'] != full.headers['ETag']
+    
+    detail, _ = get(client, headers, f'/api/v1/estimates/{estimate.id}?include=items&fields=status')
+    assert set(detail['estimate']) == {'id', 'updated_at', 'status', 'items', 'total'}
+
+
+def test_unknown_names_are_rejected(client, auth_headers, make_estimates):
+    """Test fields and includes outside the allowed sets get 400"""
+    headers = auth_headers(make_estimates(1)[0].user_id)
+    
+    response = client.get('/api/v1/estimates?fields=status,secret', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Unknown fields: secret'
+    assert client.get('/api/v1/items?include=estimates', headers=headers).status_code == 400
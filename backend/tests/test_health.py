@@ -1,6 +1,13 @@
 """
 Test Health Check Endpoints
 """
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.pool import QueuePool
+from app import create_app
+from app.extensions import db
+from app.utils.metrics import pool_status
+from config import TestingConfig
 
 
 def test_health_check(client):
@@ -12,6 +19,7 @@ def test_health_check(client):
     
     assert data['status'] == 'healthy'
     assert 'database' in data
+    assert data['pool']['pool'] == db.engine.pool.__class__.__name__
     assert data['service'] == 'wave-api'
 
 
@@ -23,3 +31,54 @@ def test_ping(client):
     data = response.get_json()
     
     assert data['message'] == 'pong'
+
+
+@pytest.fixture
+def pooled_app(tmp_path, monkeypatch):
+    """App on a SQLite file with a QueuePool of 5 + 5 connections"""
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "wave.db"}')
+    monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS',
+                        {'poolclass': QueuePool, 'pool_size': 5, 'max_overflow': 5})
+    app = create_app('testing')
+    
+    # No app context is kept open, so each request releases its session
+    yield app
+    with app.app_context():
+        db.engine.dispose()
+
+
+def test_health_reports_pool_saturation(pooled_app):
+    """Test pool usage is reported and the status degrades once 90% of the pool is checked out"""
+    client = pooled_app.test_client()
+    with pooled_app.app_context():
+        engine = db.engine
+    
+    pool = client.get('/api/v1/health').get_json()['pool']
+    assert pool == {'pool': 'QueuePool', 'size': 5, 'max_overflow': 5, 'checked_out': 0,
+                    'overflow': 0, 'saturation': 0.0}
+    
+    held = [engine.connect() for _ in range(6)]
+    data = client.get('/api/v1/health').get_json()
+    assert (data['status'], data['pool']['checked_out'], data['pool']['overflow']) == ('healthy', 6, 1)
+    assert data['pool']['saturation'] == 0.6
+    
+    held += [engine.connect() for _ in range(3)]
+    data = client.get('/api/v1/health').get_json()
+    assert (data['status'], data['pool']['saturation'], data['database']) == ('degraded', 0.9, 'healthy')
+    
+    for connection in held:
+        connection.close()
+    assert client.get('/api/v1/health').get_json()['status'] == 'healthy'
+
+
+def test_pool_saturation_needs_a_bounded_pool():
+    """Test saturation is not reported when overflow is unlimited"""
+    engine = create_engine('sqlite://', poolclass=QueuePool, pool_size=2, max_overflow=-1)
+    connections = [engine.connect() for _ in range(4)]
+    
+    status = pool_status(engine)
+    
+    assert (status['checked_out'], status['max_overflow'], status['saturation']) == (4, -1, None)
+    for connection in connections:
+        connection.close()
+    engine.dispose()
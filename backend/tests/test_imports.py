@@ -0,0 +1,148 @@
+"""
+Test Customer and Item Imports
+"""
+from decimal import Decimal
+from app.models.customer import Customer
+from app.models.item import Item
+from app.models.tax import Tax
+from app.services.customer_service import customer_service
+from app.services.item_service import item_service
+from tests.test_estimate_hydration import count_queries
+
+
+def test_customer_import_reports_conflicts(client, auth_headers, make_estimates):
+    """Test existing, repeated and invalid emails fail only their own rows"""
+    owner = make_estimates(1)[0].user_id
+    body = (
+        'name,email,phone\n'
+        'New One,new1@example.com,555\n'
+        'Taken,customer0@example.com,\n'
+        'New Two,new2@example.com,\n'
+        'Repeat,new1@example.com,\n'
+        'Bad,not-an-email,\n'
+    )
+    
+    response = client.post('/api/v1/customers/import', data=body, content_type='text/csv',
+                           headers=auth_headers(owner))
+    
+    assert response.status_code == 200
+    results = response.get_json()['results']
+    assert [result['success'] for result in results] == [True, False, True, False, False]
+    assert results[1]['error'] == 'Customer with this email already exists'
+    assert results[3]['error'] == 'Customer with this email already exists'
+    assert results[4]['error'] == 'Invalid email format'
+    
+    customer = Customer.query.filter_by(id=results[0]['id']).one()
+    assert (customer.email, customer.phone) == ('new1@example.com', '555')
+    assert Customer.query.filter_by(id=results[2]['id']).one().phone is None
+
+
+def test_item_import_resolves_taxes(client, auth_headers, make_estimates):
+    """Test tax links are created and unknown tax IDs fail their row"""
+    owner = make_estimates(1)[0].user_id
+    tax_ids = [tax.id for tax in Tax.query.order_by(Tax.id).limit(2)]
+    rows = [
+        {'name': 'Imported A', 'price': '12.50', 'tax_ids': tax_ids},
+        {'name': 'Imported B', 'price': 3, 'tax_ids': [998, 999]},
+        {'name': 'Imported C', 'price': 'free'},
+        {'name': 'Imported D', 'price': 7, 'tax_ids': f'{tax_ids[1]};'}
+    ]
+    
+    response = client.post('/api/v1/items/import', json=rows, headers=auth_headers(owner))
+    
+    results = response.get_json()['results']
+    assert [result['success'] for result in results] == [True, False, False, True]
+    assert results[1]['error'] == 'Taxes not found: 998, 999'
+    assert results[2]['error'] == 'Invalid price format'
+    
+    item = Item.query.filter_by(id=results[0]['id']).one()
+    assert item.name == 'Imported A'
+    assert sorted(tax.id for tax in item.taxes) == tax_ids
+    assert [tax.id for tax in Item.query.filter_by(id=results[3]['id']).one().taxes] == [tax_ids[1]]
+
+
+def test_item_import_parses_prices_as_decimal(make_estimates):
+    """Test imported prices are stored exactly and non-numeric or non-finite prices fail their row"""
+    make_estimates(1)
+    rows = [{'name': 'Exact', 'price': 0.1}, {'name': 'Text', 'price': '19.99'}]
+    rows += [{'name': f'Bad {price}', 'price': price} for price in ('NaN', 'Infinity', 'abc', [1])]
+    
+    results = item_service.import_items(rows)
+    
+    assert [result['success'] for result in results] == [True, True, False, False, False, False]
+    assert {result['error'] for result in results[2:]} == {'Invalid price format'}
+    prices = dict(Item.query.with_entities(Item.name, Item.price).filter(Item.name.in_(['Exact', 'Text'])))
+    assert prices == {'Exact': Decimal('0.10'), 'Text': Decimal('19.99')}
+
+
+def test_import_ids_follow_row_order(make_estimates):
+    """Test returned IDs match rows across several multi-row INSERT chunks"""
+    make_estimates(1)
+    rows = [{'name': f'Bulk {i}', 'price': i} for i in range(1200)]
+    
+    results = item_service.import_items(rows, chunk_size=700)
+    
+    names = dict(Item.query.with_entities(Item.id, Item.name).all())
+    assert [names[result['id']] for result in results] == [row['name'] for row in rows]
+
+
+def test_import_query_count_is_per_chunk(db, make_estimates):
+    """Test the number of statements depends on chunks, not rows"""
+    make_estimates(1)
+    
+    def create(count, offset):
+        rows = [{'name': f'C{i}', 'email': f'c{offset + i}@example.com'} for i in range(count)]
+        with count_queries() as statements:
+            results = customer_service.import_customers(rows, chunk_size=100)
+        assert all(result['success'] for result in results)
+        return len(statements)
+    
+    assert create(5, 0) == create(100, 1000)
+
+
+def test_failed_chunk_is_retried_row_by_row():
+    """Test one bad row in a chunk does not fail the rest of the chunk"""
+    from sqlalchemy.exc import IntegrityError
+    from app.utils.bulk import save_in_chunks
+    
+    def save(payloads):
+        if 'bad' in payloads:
+            raise IntegrityError('INSERT', {}, Exception('duplicate key'))
+        return [payload.upper() for payload in payloads]
+    
+    rows = list(enumerate(['a', 'bad', 'c', 'd']))
+    results = dict(save_in_chunks(rows, 2, save))
+    
+    assert (results[0], results[2], results[3]) == ('A', 'C', 'D')
+    assert isinstance(results[1], IntegrityError)
+
+
+def test_bulk_create_conflicts_fail_their_row(make_estimates):
+    """Test a unique violation inside bulk_load (COPY on PostgreSQL) fails only its row"""
+    from sqlalchemy.exc import IntegrityError
+    from app.repositories.customer_repository import CustomerRepository
+    from app.utils.bulk import save_in_chunks
+    make_estimates(1)
+    
+    rows = list(enumerate([
+        {'name': 'Fresh', 'email': 'fresh@example.com', 'phone': ''},
+        {'name': 'Taken', 'email': 'customer0@example.com', 'phone': None},
+        {'name': 'Blank', 'email': 'blank@example.com', 'phone': None},
+    ]))
+    results = dict(save_in_chunks(rows, 3, CustomerRepository().bulk_create))
+    
+    assert isinstance(results[1], IntegrityError)
+    assert Customer.query.filter_by(id=results[0]).one().phone == ''
+    assert Customer.query.filter_by(id=results[2]).one().phone is None
+
+
+def test_copy_csv_keeps_nulls_and_empty_strings():
+    """Test COPY input writes None as an unquoted empty field and quotes everything else"""
+    from app.repositories.bulk_load import _copy_csv
+    
+    rows = [{'name': 'Say "hi"', 'phone': None, 'notes': ''}, {'name': 'a,b', 'phone': 5, 'notes': 'x\ny'}]
+    
+    assert _copy_csv(['name', 'phone', 'notes'], rows).read() == (
+        '"Say ""hi""",,""\n'
+        '"a,b","5","x\ny"\n'
+    )
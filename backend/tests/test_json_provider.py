@@ -0,0 +1,44 @@
+"""
+Test JSON Provider
+"""
+from datetime import date, datetime
+from decimal import Decimal
+from app.utils.json_provider import FastJSONProvider
+
+
+def test_encodes_raw_values_identically_with_and_without_orjson(app):
+    """Test dates, datetimes and Decimals encode the same on both paths"""
+    payload = {
+        'date': date(2026, 1, 5),
+        'created_at': datetime(2026, 1, 5, 9, 30, 15, 120),
+        'total': Decimal('1234.50'),
+        'items': [{'unit_price': Decimal('0.10'), 'quantity': 3}],
+        'note': None
+    }
+    provider = FastJSONProvider(app)
+    fast = provider.dumps(payload, separators=(',', ':'))
+    
+    provider.use_orjson = False
+    assert provider.dumps(payload, separators=(',', ':')) == fast
+    assert provider.loads(fast) == {
+        'date': '2026-01-05',
+        'created_at': '2026-01-05T09:30:15.000120',
+        'total': 1234.5,
+        'items': [{'quantity': 3, 'unit_price': 0.1}],
+        'note': None
+    }
+
+
+def test_api_responses_keep_iso_dates_and_numbers(client, auth_headers, make_estimates):
+    """Test raw model values reach clients as ISO strings and numbers"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    
+    body = client.get(f'/api/v1/estimates/{estimate.id}', headers=headers).get_json()['estimate']
+    assert body['date'] == estimate.date.isoformat()
+    assert body['created_at'] == estimate.created_at.isoformat()
+    assert isinstance(body['total'], float)
+    assert isinstance(body['items'][0]['unit_price'], float)
+    
+    csv_body = client.get('/api/v1/estimates/export?format=csv', headers=headers).get_data(as_text=True)
+    assert estimate.created_at.isoformat() in csv_body
@@ -0,0 +1,70 @@
+"""
+Test Materialized Estimate Totals
+"""
+from decimal import Decimal
+from app.extensions import db
+from app.models.estimate import Estimate
+from app.models.tax import Tax
+from app.repositories.estimate_repository import EstimateRepository
+from app.services.estimate_service import estimate_service
+from app.services.item_service import item_service
+
+
+def create_estimate(template, item_id, status='draft'):
+    """Create an estimate through the service with a single line"""
+    return estimate_service.create_estimate(template.user_id, {
+        'customer_id': template.customer_id,
+        'items': [{'item_id': item_id, 'quantity': 3}],
+        'status': status
+    })
+
+
+def test_totals_are_written_on_create(make_estimates):
+    """Test single and bulk creation store totals matching the computed ones"""
+    estimate = make_estimates(1)[0]
+    created = create_estimate(estimate, 1)
+    results = estimate_service.create_estimates_bulk(estimate.user_id, [
+        {'customer_id': estimate.customer_id, 'items': [{'item_id': 1 + i}, {'item_id': 5, 'quantity': 2}]}
+        for i in range(10)
+    ])
+    
+    ids = [created['id']] + [result['estimate_id'] for result in results]
+    stored = Estimate.query.filter(Estimate.id.in_(ids)).all()
+    assert all(e.total is not None and e.subtotal + e.tax_total == e.total for e in stored)
+    
+    computed = EstimateRepository()._totals_from_lines(ids)
+    assert {e.id: e.total for e in stored} == {i: totals[2] for i, totals in computed.items()}
+    assert created['total'] == computed[created['id']][2]
+
+
+def test_item_tax_change_refreshes_drafts_only(make_estimates):
+    """Test drafts follow an item's new taxes while sent estimates keep theirs"""
+    estimate = make_estimates(1)[0]
+    item_id = estimate.get_estimate_items()[0].item_id
+    draft = create_estimate(estimate, item_id)
+    sent = create_estimate(estimate, item_id, status='sent')
+    assert draft['total'] == sent['total']
+    
+    tax = Tax(name='Surcharge', amount='50.00')
+    db.session.add(tax)
+    db.session.commit()
+    item_service.update_item(item_id, {'tax_ids': [tax.id]})
+    
+    assert estimate_service.get_estimate_by_id(sent['id'])['total'] == float(sent['total'])
+    refreshed = db.session.get(Estimate, draft['id'])
+    assert refreshed.total > sent['total']
+    assert abs(refreshed.tax_total - refreshed.subtotal / 2) <= Decimal('0.01')
+
+
+def test_backfill_command(runner, make_estimates):
+    """Test the backfill fills every estimate without totals, batch by batch"""
+    estimates = make_estimates(25)
+    expected = EstimateRepository().calculate_totals([e.id for e in estimates])
+    assert Estimate.query.filter(Estimate.total.is_(None)).count() == 25
+    
+    result = runner.invoke(args=['backfill-estimate-totals', '--batch-size', '10'])
+    
+    assert result.exit_code == 0
+    assert '3 batch(es) backfilled' in result.output
+    assert Estimate.query.filter(Estimate.total.is_(None)).count() == 0
+    assert EstimateRepository().calculate_totals(expected.keys()) == expected
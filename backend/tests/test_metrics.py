@@ -0,0 +1,109 @@
+"""
+Test Metrics Endpoint
+"""
+import json
+import os
+import re
+from sqlalchemy import create_engine, text
+from app.utils.metrics import MeteredQueuePool, Metrics, _watch_pool, metrics, pool_status
+
+
+def scrape(client):
+    """GET /metrics and parse it into {sample with labels: value}"""
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    return {
+        match.group(1): float(match.group(2))
+        for match in re.finditer(r'^([^#\s][^ ]*) (\S+)$', response.get_data(as_text=True), re.M)
+    }
+
+
+def test_request_metrics(client, db):
+    """Test latency histograms, status counters and the in-flight gauge"""
+    before = scrape(client)
+    for _ in range(3):
+        client.get('/api/v1/ping')
+    client.get('/api/v1/no-such-route')
+    after = scrape(client)
+    
+    def delta(sample):
+        return after.get(sample, 0) - before.get(sample, 0)
+    
+    assert delta('http_requests_total{endpoint="api_v1.ping",method="GET",status="200"}') == 3
+    assert delta('http_requests_total{endpoint="unmatched",method="GET",status="404"}') == 1
+    assert delta('http_request_duration_seconds_count{endpoint="api_v1.ping"}') == 3
+    assert delta('http_request_duration_seconds_bucket{endpoint="api_v1.ping",le="+Inf"}') == 3
+    assert delta('http_response_size_bytes_count{endpoint="api_v1.ping"}') == 3
+    # Only the scrape itself is in flight
+    assert after['http_requests_in_flight'] == 1
+
+
+def test_multiprocess_aggregation(tmp_path):
+    """Test every process's file is summed and dead workers keep only counters"""
+    worker = Metrics()
+    worker.configure(str(tmp_path))
+    worker.inc('http_requests_total', endpoint='api_v1.ping', method='GET', status='200')
+    worker.inc('http_requests_in_flight')
+    worker.observe('http_request_duration_seconds', 0.02, endpoint='api_v1.ping')
+    
+    other_pid = os.getpid() + 100000
+    (tmp_path / f'{other_pid}.json').write_text(json.dumps([
+        ['http_requests_total', 'http_requests_total',
+         [['endpoint', 'api_v1.ping'], ['method', 'GET'], ['status', '200']], 4, False],
+        ['http_requests_in_flight', 'http_requests_in_flight', [], 2, True],
+    ]))
+    
+    values = worker.collect()
+    assert values[('http_requests_total', 'http_requests_total',
+                   (('endpoint', 'api_v1.ping'), ('method', 'GET'), ('status', '200')))] == 5
+    assert values[('http_requests_in_flight', 'http_requests_in_flight', ())] == 3
+    assert values[('http_request_duration_seconds', 'http_request_duration_seconds_bucket',
+                   (('endpoint', 'api_v1.ping'), ('le', '0.01')))] == 0
+    assert values[('http_request_duration_seconds', 'http_request_duration_seconds_bucket',
+                   (('endpoint', 'api_v1.ping'), ('le', '0.025')))] == 1
+    
+    worker.mark_process_dead(other_pid)
+    values = worker.collect()
+    assert values[('http_requests_in_flight', 'http_requests_in_flight', ())] == 1
+    assert values[('http_requests_total', 'http_requests_total',
+                   (('endpoint', 'api_v1.ping'), ('method', 'GET'), ('status', '200')))] == 5
+    assert 'http_requests_in_flight 1.0' in worker.render()
+
+
+def test_pool_checkout_wait(tmp_path):
+    """Test MeteredQueuePool records each checkout"""
+    engine = create_engine(f'sqlite:///{tmp_path / "pool.db"}', poolclass=MeteredQueuePool)
+    engine.pool.bind = 'test'
+    sample = ('db_pool_checkout_wait_seconds', 'db_pool_checkout_wait_seconds_count', (('bind', 'test'),))
+    before = metrics.collect().get(sample, 0)
+    
+    for _ in range(2):
+        with engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+    
+    assert metrics.collect()[sample] - before == 2
+    engine.dispose()
+
+
+def test_pool_events_and_saturation(tmp_path):
+    """Test checkouts and invalidations are counted and saturation reported"""
+    engine = create_engine(f'sqlite:///{tmp_path / "pool.db"}', poolclass=MeteredQueuePool,
+                           pool_size=1, max_overflow=1)
+    _watch_pool(engine, 'saturation')
+    
+    def count(name):
+        return metrics.collect().get((name, name, (('bind', 'saturation'),)), 0)
+    
+    before = count('db_pool_checkouts_total'), count('db_pool_invalidations_total')
+    first, second = engine.connect(), engine.connect()
+    status = pool_status(engine)
+    assert (status['size'], status['checked_out'], status['overflow'], status['saturation']) == (1, 2, 1, 1.0)
+    
+    first.invalidate()
+    first.close()
+    second.close()
+    assert pool_status(engine)['saturation'] == 0
+    assert count('db_pool_checkouts_total') - before[0] == 2
+    assert count('db_pool_invalidations_total') - before[1] == 1
+    engine.dispose()
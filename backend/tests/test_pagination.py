@@ -0,0 +1,113 @@
+"""
+Test Cursor Pagination
+"""
+from app.repositories.customer_repository import CustomerRepository
+from app.models.customer import Customer
+
+
+def walk_pages(client, url, key, headers):
+    """Follow next_cursor until the last page and collect IDs"""
+    ids, cursor = [], ''
+    while cursor is not None:
+        response = client.get(f'{url}&cursor={cursor}', headers=headers)
+        assert response.status_code == 200
+        data = response.get_json()
+        ids.extend(row['id'] for row in data[key])
+        cursor = data['next_cursor']
+    return ids
+
+
+def test_estimate_cursor_pages_cover_all_rows(client, make_estimates, auth_headers):
+    """Test cursor pages follow (date DESC, id DESC) without gaps or repeats"""
+    estimates = make_estimates(37)
+    headers = auth_headers(estimates[0].user_id)
+    
+    ids = walk_pages(client, '/api/v1/estimates?per_page=5', 'estimates', headers)
+    
+    expected = [e.id for e in sorted(estimates, key=lambda e: (e.date, e.id), reverse=True)]
+    assert ids == expected
+
+
+def test_item_and_customer_cursor_pages(client, make_estimates, auth_headers):
+    """Test items and customers can be walked with cursors"""
+    estimates = make_estimates(1)
+    headers = auth_headers(estimates[0].user_id)
+    
+    assert len(set(walk_pages(client, '/api/v1/items?per_page=3', 'items', headers))) == 20
+    assert len(set(walk_pages(client, '/api/v1/customers?per_page=2', 'customers', headers))) == 5
+
+
+def test_cursor_total_is_opt_in(client, make_estimates, auth_headers):
+    """Test the total count is only computed when requested"""
+    estimates = make_estimates(3)
+    headers = auth_headers(estimates[0].user_id)
+    
+    data = client.get('/api/v1/estimates?cursor=', headers=headers).get_json()
+    assert data['total'] is None
+    assert data['next_cursor'] is None
+    
+    data = client.get('/api/v1/estimates?cursor=&with_total=true', headers=headers).get_json()
+    assert data['total'] == 3
+
+
+def test_invalid_cursor(client, make_estimates, auth_headers):
+    """Test malformed cursors are rejected"""
+    estimates = make_estimates(1)
+    headers = auth_headers(estimates[0].user_id)
+    
+    response = client.get('/api/v1/customers?cursor=not-a-cursor', headers=headers)
+    
+    assert response.status_code == 400
+
+
+def test_cursor_paginated_repository(db):
+    """Test repository cursor pages with duplicate ordering values"""
+    repo = CustomerRepository()
+    for i in range(7):
+        repo.create(name='Same Name', email=f'same{i}@example.com')
+    
+    first, cursor, total = repo.get_cursor_paginated(per_page=4, order_by='name', desc=False)
+    second, last_cursor, _ = repo.get_cursor_paginated(cursor, per_page=4, order_by='name', desc=False)
+    
+    assert total is None
+    assert [c.id for c in first + second] == [c.id for c in Customer.query.order_by(Customer.id)]
+    assert last_cursor is None
+
+
+def test_count_strategies(client, make_estimates, auth_headers):
+    """Test exact, cached and estimated totals are flagged accordingly"""
+    estimates = make_estimates(4)
+    headers = auth_headers(estimates[0].user_id)
+    
+    data = client.get('/api/v1/customers?count=exact', headers=headers).get_json()
+    assert data['total'] == 5
+    assert data['total_exact'] is True
+    
+    # The first cached count is computed exactly, later ones come from the cache
+    assert client.get('/api/v1/estimates?count=cached', headers=headers).get_json()['total_exact'] is True
+    data = client.get('/api/v1/estimates?count=cached', headers=headers).get_json()
+    assert data['total'] == 4
+    assert data['total_exact'] is False
+    
+    # Planner estimates are PostgreSQL only; SQLite falls back to the cache
+    data = client.get('/api/v1/items?count=estimate', headers=headers).get_json()
+    assert data['total'] == 20
+    
+    response = client.get('/api/v1/items?count=bogus', headers=headers)
+    assert response.status_code == 400
+
+
+def test_cached_count_invalidated_by_create(make_estimates):
+    """Test creating a record invalidates cached counts for its model"""
+    make_estimates(1)
+    repo = CustomerRepository()
+    
+    _, total = repo.get_paginated(count_strategy='cached')
+    _, cached = repo.get_paginated(count_strategy='cached')
+    assert (total, cached.exact) == (5, False)
+    
+    repo.create(name='New', email='new@example.com')
+    _, total = repo.get_paginated(count_strategy='cached')
+    
+    assert total == 6
+    assert total.exact is True
@@ -0,0 +1,84 @@
+"""
+Test Serialized Payload Cache
+"""
+from app.repositories.estimate_repository import EstimateRepository
+from app.services.estimate_service import estimate_service
+from app.utils.payload_cache import LocalSharedCache, payload_cache
+from tests.test_estimate_hydration import count_queries
+
+
+def test_repeat_reads_only_query_the_version(make_estimates):
+    """Test a cached estimate costs one query and matches the built payload"""
+    estimate = make_estimates(1)[0]
+    first = estimate_service.get_estimate_by_id(estimate.id)
+    hits = payload_cache.stats()['hits']
+    
+    with count_queries() as statements:
+        second = estimate_service.get_estimate_by_id(estimate.id)
+    
+    assert len(statements) == 1
+    assert second == first
+    assert estimate_service.get_estimate_by_number(estimate.estimate_number) == first
+    assert payload_cache.stats()['hits'] == hits + 2
+    assert payload_cache.stats()['bytes'] > 0
+
+
+def test_writes_invalidate(make_estimates):
+    """Test updates through the repository and backfilled totals are never served stale"""
+    estimate = make_estimates(1)[0]
+    repository = EstimateRepository()
+    assert estimate_service.get_estimate_by_id(estimate.id)['status'] == 'draft'
+    
+    repository.update(estimate.id, status='sent')
+    assert payload_cache.stats()['entries'] == 0
+    assert estimate_service.get_estimate_by_id(estimate.id)['status'] == 'sent'
+    
+    repository.backfill_totals()
+    assert payload_cache.stats()['entries'] == 0
+    assert estimate_service.get_estimate_by_id(estimate.id)['status'] == 'sent'
+
+
+def test_shared_tier_and_memory_bound(app, make_estimates):
+    """Test payloads are promoted from the shared tier and the LRU stays within its byte budget"""
+    estimates = make_estimates(10)
+    payload_cache.shared = LocalSharedCache()
+    try:
+        first = estimate_service.get_estimate_by_id(estimates[0].id)
+        payload_cache.clear()
+        shared_hits = payload_cache.stats()['shared_hits']
+        assert estimate_service.get_estimate_by_id(estimates[0].id) == first
+        assert payload_cache.stats()['shared_hits'] == shared_hits + 1
+        assert payload_cache.stats()['entries'] == 1
+    finally:
+        payload_cache.shared = None
+    
+    app.config['PAYLOAD_CACHE_MAX_BYTES'] = payload_cache.stats()['bytes'] * 3
+    try:
+        for estimate in estimates:
+            estimate_service.get_estimate_by_id(estimate.id)
+        stats = payload_cache.stats()
+        assert 0 < stats['entries'] < 10
+        assert stats['bytes'] <= app.config['PAYLOAD_CACHE_MAX_BYTES']
+        assert 0 < stats['hit_ratio'] < 1
+    finally:
+        app.config['PAYLOAD_CACHE_MAX_BYTES'] = 64 * 1024 * 1024
+
+
+def test_detail_route_sends_cached_json_as_is(app, client, auth_headers, make_estimates, monkeypatch):
+    """Test a cache hit is served from the stored bytes, without decoding or encoding JSON"""
+    estimate = make_estimates(1)[0]
+    headers = auth_headers(estimate.user_id)
+    first = client.get(f'/api/v1/estimates/{estimate.id}', headers=headers)
+    
+    encoded, decoded = [], []
+    dumps, loads = app.json.dumps, app.json.loads
+    monkeypatch.setattr(app.json, 'dumps', lambda obj, **kwargs: encoded.append(obj) or dumps(obj, **kwargs))
+    monkeypatch.setattr(app.json, 'loads', lambda data, **kwargs: decoded.append(data) or loads(data, **kwargs))
+    second = client.get(f'/api/v1/estimates/{estimate.id}', headers=headers)
+    assert not [obj for obj in encoded if 'estimate_number' in str(obj)]
+    assert not [data for data in decoded if 'estimate_number' in str(data)]
+    
+    assert second.status_code == 200 and second.mimetype == 'application/json'
+    assert second.get_json() == first.get_json()
+    assert second.get_json()['estimate']['id'] == estimate.id
+    assert second.headers['ETag'] == first.headers['ETag']
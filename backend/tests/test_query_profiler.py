@@ -0,0 +1,87 @@
+"""
+Test Query Profiler
+"""
+import json
+import logging
+import pytest
+from app.extensions import db
+from app.models.item import Item
+from app.repositories.tax_catalog import tax_catalog
+from app.utils.payload_cache import payload_cache
+from app.utils.query_profiler import assert_max_queries, fingerprint, profile_queries
+
+
+def test_fingerprint_normalizes_values():
+    """Test statements differing only in values share a fingerprint"""
+    assert fingerprint("SELECT * FROM items WHERE id = 5 AND name = 'a''b'") == \
+        fingerprint('SELECT * FROM items\n WHERE id = 12 AND name = \'x\'')
+    assert fingerprint('SELECT id FROM items WHERE id IN (?, ?, ?)') == \
+        fingerprint('SELECT id FROM items WHERE id IN (?)') == 'SELECT id FROM items WHERE id IN (?)'
+    assert fingerprint('SELECT count_1 FROM t WHERE x = %(x_1)s') == 'SELECT count_1 FROM t WHERE x = %(x_1)s'
+
+
+def test_request_server_timing_and_log(client, auth_headers, make_estimates, app, monkeypatch, caplog):
+    """Test requests get a Server-Timing header and a JSON log line flagging repeats"""
+    estimates = make_estimates(3)
+    headers = auth_headers(estimates[0].user_id)
+    monkeypatch.setitem(app.config, 'QUERY_PROFILER_N_PLUS_ONE_THRESHOLD', 1)
+    
+    with caplog.at_level(logging.INFO, logger=app.logger.name), profile_queries() as profile:
+        response = client.get('/api/v1/estimates', headers=headers)
+    
+    assert response.status_code == 200
+    assert f'desc="{profile.count} queries"' in response.headers['Server-Timing']
+    assert 'app;dur=' in response.headers['Server-Timing']
+    
+    record = json.loads(caplog.records[-1].getMessage())
+    assert caplog.records[-1].levelno == logging.WARNING
+    assert (record['path'], record['status'], record['queries']) == ('/api/v1/estimates', 200, profile.count)
+    assert record['n_plus_one'][0]['count'] >= 1
+
+
+def test_repeated_selects_are_flagged(make_estimates):
+    """Test a per-row loop of identical SELECTs is reported as an N+1"""
+    make_estimates(1)
+    ids = [item_id for (item_id,) in db.session.query(Item.id).limit(6)]
+    db.session.expire_all()
+    
+    with profile_queries() as profile:
+        for item_id in ids:
+            db.session.query(Item).filter(Item.id == item_id).one()
+    
+    [(statement, count)] = profile.n_plus_one(threshold=5)
+    assert count == 6 and statement.startswith('SELECT')
+    assert profile.db_ms >= 0
+
+
+def test_assert_max_queries(client, auth_headers, make_estimates):
+    """Test the helper passes under the limit and lists statements above it"""
+    estimates = make_estimates(5)
+    headers = auth_headers(estimates[0].user_id)
+    
+    with assert_max_queries(10):
+        client.get('/api/v1/estimates', headers=headers)
+    
+    with pytest.raises(AssertionError, match='expected at most 1'):
+        with assert_max_queries(1):
+            client.get('/api/v1/estimates', headers=headers)
+
+
+@pytest.mark.parametrize('url, budget', [
+    ('/api/v1/estimates', 7),
+    ('/api/v1/estimates/{estimate.id}', 6),
+    ('/api/v1/estimates?format=columnar', 6),
+    ('/api/v1/customers/{estimate.customer_id}/estimates', 2),
+    ('/api/v1/items', 4),
+    ('/api/v1/customers', 2),
+])
+def test_endpoint_query_budgets(client, auth_headers, make_estimates, url, budget):
+    """Test v1 reads stay within their query budget (cold caches) regardless of page size"""
+    estimates = make_estimates(20)
+    headers = auth_headers(estimates[0].user_id)
+    tax_catalog.clear()
+    payload_cache.clear()
+    
+    with assert_max_queries(budget):
+        response = client.get(url.format(estimate=estimates[0]), headers=headers)
+    assert response.status_code == 200
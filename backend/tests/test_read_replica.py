@@ -0,0 +1,83 @@
+"""
+Test Read Replica Routing
+"""
+import time
+import pytest
+from sqlalchemy.orm import Session
+from app import create_app
+from app.extensions import db
+from app.models.customer import Customer
+from app.repositories.routing import REPLICA, STICKY_COOKIE, unavailable_binds
+from config import TestingConfig
+
+
+@pytest.fixture
+def replica_app(tmp_path, monkeypatch):
+    """App whose primary and replica are two SQLite files with different customers"""
+    def make(replica_url=f'sqlite:///{tmp_path / "replica.db"}', reachable=True):
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_DATABASE_URI', f'sqlite:///{tmp_path / "primary.db"}')
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_ENGINE_OPTIONS', {})
+        monkeypatch.setattr(TestingConfig, 'SQLALCHEMY_BINDS', {REPLICA: replica_url})
+        app = create_app('testing')
+        
+        with app.app_context():
+            engines = [db.engines[None]] + ([db.engines[REPLICA]] if reachable else [])
+            for engine, name in zip(engines, ('Primary', 'Replica')):
+                db.metadata.create_all(engine)
+                with Session(engine) as session:
+                    session.add(Customer(name=f'{name} Co', email=f'{name.lower()}@example.com'))
+                    session.commit()
+        return app
+    
+    unavailable_binds.clear()
+    yield make
+    unavailable_binds.clear()
+    # init_app registered an (empty) metadata for the bind on the shared extension
+    db.metadatas.pop(REPLICA, None)
+
+
+def customer_names(client, headers):
+    response = client.get('/api/v1/customers', headers=headers)
+    assert response.status_code == 200
+    return sorted(customer['name'] for customer in response.get_json()['customers'])
+
+
+def test_reads_go_to_replica_and_writes_to_primary(replica_app, auth_headers):
+    """Test GET lists read the replica, and a writer reads the primary until its window ends"""
+    app = replica_app()
+    client = app.test_client()
+    
+    with app.app_context():
+        headers = auth_headers(1)
+        assert customer_names(client, headers) == ['Replica Co']
+        
+        response = client.post('/api/v1/customers', headers=headers,
+                               json={'name': 'New Co', 'email': 'new@example.com'})
+        assert response.status_code == 201
+        cookie = client.get_cookie(STICKY_COOKIE)
+        assert cookie is not None and cookie.http_only
+        
+        # The writer reads its own write, on any worker its cookie reaches;
+        # other clients still read the replica
+        assert customer_names(client, headers) == ['New Co', 'Primary Co']
+        other_worker = create_app('testing').test_client()
+        other_worker.set_cookie(STICKY_COOKIE, cookie.value)
+        assert customer_names(other_worker, headers) == ['New Co', 'Primary Co']
+        assert customer_names(app.test_client(), auth_headers(2)) == ['Replica Co']
+        
+        client.set_cookie(STICKY_COOKIE, f'{time.time() - 1:.3f}')
+        assert customer_names(client, headers) == ['Replica Co']
+        db.session.remove()
+
+
+def test_unavailable_replica_falls_back_to_primary(replica_app, auth_headers, tmp_path):
+    """Test reads use the primary, and skip the replica, when it cannot be reached"""
+    app = replica_app(f'sqlite:///{tmp_path / "missing" / "replica.db"}', reachable=False)
+    client = app.test_client()
+    
+    with app.app_context():
+        headers = auth_headers(1)
+        assert customer_names(client, headers) == ['Primary Co']
+        assert unavailable_binds.get(REPLICA) is True
+        assert customer_names(client, headers) == ['Primary Co']
+        db.session.remove()
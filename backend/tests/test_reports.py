@@ -0,0 +1,98 @@
+"""
+Test Estimate Reports
+"""
+from collections import defaultdict
+from datetime import date
+from app.extensions import db
+from app.repositories.estimate_repository import EstimateRepository
+from tests.test_estimate_hydration import count_queries
+
+
+def prepare(make_estimates):
+    """Create estimates over two months and four statuses, half of them backfilled"""
+    estimates = make_estimates(40)
+    statuses = ['draft', 'sent', 'accepted', 'rejected']
+    for i, estimate in enumerate(estimates):
+        estimate.status = statuses[i % 4]
+        if i % 3 == 0:
+            estimate.date = date(2026, 2, 1 + i % 28)
+    db.session.commit()
+    EstimateRepository().backfill_totals(batch_size=20)
+    
+    totals = EstimateRepository().calculate_totals([e.id for e in estimates])
+    return estimates, {e.id: float(totals[e.id]) for e in estimates}
+
+
+def test_report_groups_match_python_aggregates(client, auth_headers, make_estimates):
+    """Test grouped counts, sums and acceptance rates against a Python reference"""
+    estimates, totals = prepare(make_estimates)
+    headers = auth_headers(estimates[0].user_id)
+    
+    for group_by, key in [('status', lambda e: e.status),
+                          ('month', lambda e: e.date.strftime('%Y-%m')),
+                          ('customer', lambda e: e.customer_id)]:
+        expected = defaultdict(list)
+        for estimate in estimates:
+            expected[key(estimate)].append(estimate)
+        
+        with count_queries() as statements:
+            response = client.get(f'/api/v1/reports/estimates?group_by={group_by}', headers=headers)
+        assert response.status_code == 200
+        assert len(statements) == 1
+        
+        body = response.get_json()
+        assert [group['key'] for group in body['groups']] == sorted(expected)
+        for group in body['groups']:
+            members = expected[group['key']]
+            offered = [e for e in members if e.status != 'draft']
+            assert group['count'] == len(members)
+            assert abs(group['total'] - sum(totals[e.id] for e in members)) < 0.01 * len(members)
+            assert group['acceptance_rate'] == (
+                round(sum(e.status == 'accepted' for e in offered) / len(offered), 4) if offered else None
+            )
+        
+        assert body['totals']['count'] == 40
+        assert body['totals']['acceptance_rate'] == round(10 / 30, 4)
+        assert abs(sum(group['share'] for group in body['groups']) - 1) < 0.001
+        assert body['groups'][-1]['running_total'] == body['totals']['total']
+
+
+def test_report_date_range_and_validation(client, auth_headers, make_estimates):
+    """Test the date range filter and parameter errors"""
+    estimates, _ = prepare(make_estimates)
+    headers = auth_headers(estimates[0].user_id)
+    
+    body = client.get('/api/v1/reports/estimates?group_by=user&date_from=2026-02-01',
+                      headers=headers).get_json()
+    assert body['groups'][0]['label'] == 'owner@example.com'
+    assert body['totals']['count'] == sum(1 for e in estimates if e.date >= date(2026, 2, 1))
+    
+    for query in ['group_by=week', 'date_from=yesterday', 'date_from=2026-03-01&date_to=2026-02-01']:
+        response = client.get(f'/api/v1/reports/estimates?{query}', headers=headers)
+        assert response.status_code == 400
+    
+    empty = client.get('/api/v1/reports/estimates?date_from=2030-01-01', headers=headers).get_json()
+    assert empty['groups'] == [] and empty['totals']['count'] == 0
+
+
+def test_report_is_scoped_to_current_user(client, auth_headers, make_estimates):
+    """Test other users' estimates are never counted and their user_id is rejected"""
+    from app.models.estimate import Estimate
+    from app.models.user import User
+    estimates, _ = prepare(make_estimates)
+    other = User(email='other@example.com', password_hash='x')
+    db.session.add(other)
+    db.session.flush()
+    db.session.add(Estimate(estimate_number='EST-OTHER-0001', customer_id=estimates[0].customer_id,
+                            user_id=other.id, date=date(2026, 1, 5), valid_until=date(2026, 2, 5)))
+    db.session.commit()
+    headers = auth_headers(estimates[0].user_id)
+    
+    body = client.get('/api/v1/reports/estimates?group_by=user', headers=headers).get_json()
+    assert [group['label'] for group in body['groups']] == ['owner@example.com']
+    assert body['totals']['count'] == 40
+    
+    own = client.get(f'/api/v1/reports/estimates?user_id={estimates[0].user_id}', headers=headers)
+    assert own.status_code == 200
+    response = client.get(f'/api/v1/reports/estimates?user_id={other.id}', headers=headers)
+    assert response.status_code == 403
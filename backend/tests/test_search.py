@@ -0,0 +1,56 @@
+"""
+Test Fuzzy Search
+"""
+from app.repositories.item_repository import ItemRepository
+from app.repositories.search import trigrams, similarity
+
+
+def test_trigrams_match_pg_trgm():
+    """Test trigram extraction follows pg_trgm padding rules"""
+    assert trigrams('Cat') == {'  c', ' ca', 'cat', 'at '}
+    assert similarity(trigrams('word'), trigrams('word')) == 1.0
+    assert similarity(trigrams('word'), trigrams('xyz')) == 0.0
+
+
+def test_search_ranks_by_similarity(db):
+    """Test closer names rank first and typos still match"""
+    repo = ItemRepository()
+    for name in ['Web Design', 'Website Hosting', 'Logo Design', 'Consulting']:
+        repo.create(name=name, price=10)
+    
+    items, next_cursor = repo.search_by_name('web desing')
+    
+    assert items[0].name == 'Web Design'
+    assert 'Consulting' not in [item.name for item in items]
+    assert next_cursor is None
+
+
+def test_search_limit_and_cursor(client, make_estimates, auth_headers):
+    """Test search results are capped and can be paged with a cursor"""
+    estimates = make_estimates(1)
+    headers = auth_headers(estimates[0].user_id)
+    
+    response = client.get('/api/v1/items/search?name=item&limit=8', headers=headers)
+    data = response.get_json()
+    assert data['count'] == 8
+    assert data['next_cursor']
+    
+    names = [item['name'] for item in data['items']]
+    while data['next_cursor']:
+        data = client.get(
+            f'/api/v1/items/search?name=item&limit=8&cursor={data["next_cursor"]}',
+            headers=headers
+        ).get_json()
+        names.extend(item['name'] for item in data['items'])
+    
+    assert sorted(names) == sorted(f'Item {i}' for i in range(20))
+
+
+def test_search_sees_new_rows(db):
+    """Test the in-process index is rebuilt after writes"""
+    repo = ItemRepository()
+    repo.create(name='Alpha', price=1)
+    assert [item.name for item in repo.search_by_name('alpha')[0]] == ['Alpha']
+    
+    repo.create(name='Alphabet', price=1)
+    assert [item.name for item in repo.search_by_name('alpha')[0]] == ['Alpha', 'Alphabet']
@@ -0,0 +1,67 @@
+"""
+Test Tax Catalog Cache
+"""
+from app.extensions import db
+from app.models.tax import Tax
+from app.repositories.tax_catalog import tax_catalog
+from app.services.item_service import item_service
+from tests.test_estimate_hydration import count_queries
+
+
+def test_taxes_endpoint_is_cached(client, auth_headers, make_estimates):
+    """Test GET /taxes only queries the database once"""
+    headers = auth_headers(make_estimates(1)[0].user_id)
+    
+    first = client.get('/api/v1/taxes', headers=headers).get_json()
+    with count_queries() as statements:
+        second = client.get('/api/v1/taxes', headers=headers).get_json()
+    
+    assert statements == []
+    assert first == second
+    assert [tax['name'] for tax in first['taxes']] == sorted(tax['name'] for tax in first['taxes'])
+
+
+def test_update_item_taxes_invalidates(make_estimates):
+    """Test changing an item's taxes is visible in items and estimate totals"""
+    estimate = make_estimates(1)[0]
+    tax = Tax(name='Luxury', amount='50.00')
+    db.session.add(tax)
+    db.session.commit()
+    
+    item_id = estimate.get_estimate_items()[0].item_id
+    before_total = estimate.calculate_total()
+    before_taxes = item_service.get_item_by_id(item_id)['taxes']
+    
+    item_service.update_item(item_id, {'tax_ids': [tax.id]})
+    
+    assert [t['id'] for t in item_service.get_item_by_id(item_id)['taxes']] == [tax.id]
+    assert item_service.get_item_by_id(item_id)['taxes'] != before_taxes
+    assert estimate.calculate_total() > before_total
+
+
+def test_tax_write_invalidates(make_estimates):
+    """Test changing a tax rate is visible in cached item tax rates"""
+    estimate = make_estimates(1)[0]
+    tax = Tax(name='Variable', amount='10.00')
+    db.session.add(tax)
+    db.session.commit()
+    item_id = estimate.get_estimate_items()[0].item_id
+    item_service.update_item(item_id, {'tax_ids': [tax.id]})
+    assert tax_catalog.tax_rates([item_id])[item_id] == 10
+    
+    tax.amount = '20.00'
+    db.session.commit()
+    
+    assert tax_catalog.tax_rates([item_id])[item_id] == 20
+
+
+def test_health_reports_cache_counters(client, make_estimates):
+    """Test the health endpoint exposes hit/miss counters"""
+    make_estimates(1)
+    tax_catalog.all_taxes()
+    tax_catalog.all_taxes()
+    
+    stats = client.get('/api/v1/health').get_json()['caches']['tax_catalog']
+    
+    assert stats['hits'] >= 1 and stats['misses'] >= 1
+    assert stats['taxes'] == 5